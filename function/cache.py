@@ -0,0 +1,214 @@
+"""메모리 LRU + SQLite 영구 저장소로 구성된 2단 캐시 모듈.
+
+외부 API(카카오, 네이버, open-meteo 등)의 응답 중 자주 반복되고 잘 변하지 않는
+값을 저장하기 위해 사용합니다.
+
+- 1단: 프로세스 내 OrderedDict 기반 LRU (마이크로초 단위 조회)
+- 2단: SQLite(WAL 모드) 영구 저장소 (프로세스 재시작 후에도 유지)
+- 음수 캐싱: 결과가 없는 조회(None)도 별도의 짧은 TTL로 저장하여
+  같은 실패 조회가 반복해서 외부 API를 호출하지 않도록 합니다.
+- stale-while-revalidate: 만료 후 stale_ttl 동안은 get_stale로 이전 값을
+  조회할 수 있어, 호출 측에서 갱신 중에도 이전 값을 응답할 수 있습니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+CACHE_DIR: str = os.getenv("CACHE_DIR", ".cache")
+CACHE_DB_PATH: str = os.path.join(CACHE_DIR, "function_agent.sqlite3")
+
+# 조회 결과가 캐시에 없음을 나타내는 값 (None은 음수 캐싱 값으로 사용되므로 구분)
+MISSING = object()
+
+
+def normalize_key(text: str) -> str:
+    """캐시 키로 사용할 문자열을 정규화합니다.
+
+    유니코드 NFC 정규화, 대소문자 통일, 공백 제거를 수행하여
+    '강남역', ' 강남 역 ', '강남역\\n'이 같은 키가 되도록 합니다.
+
+    Args:
+        text (str): 원본 문자열
+    Returns:
+        str: 정규화된 캐시 키
+    """
+    text = unicodedata.normalize("NFC", text or "")
+    return "".join(text.casefold().split())
+
+
+class PersistentCache:
+    """메모리 LRU 앞단에 SQLite 영구 저장소를 둔 TTL 캐시.
+
+    여러 스레드/프로세스가 동시에 쓰더라도 안전하도록 SQLite는 WAL 모드와
+    busy_timeout을 사용하고, 스레드마다 별도의 커넥션을 사용합니다.
+
+    Attributes:
+        namespace (str): 같은 DB 파일 안에서 캐시를 구분하는 이름
+        maxsize (int): 메모리 LRU에 유지할 최대 항목 수
+        ttl (Optional[float]): 일반 값의 유효 시간(초). None이면 만료되지 않음
+        negative_ttl (float): None 값(조회 실패)의 유효 시간(초)
+        stale_ttl (float): 만료 후에도 get_stale로 조회 가능한 추가 시간(초)
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        negative_ttl: float = 60 * 60,
+        db_path: Optional[str] = CACHE_DB_PATH,
+        stale_ttl: float = 0,
+    ) -> None:
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.db_path = db_path
+        self.stale_ttl = stale_ttl
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0,
+        }
+        if db_path:
+            self._init_db()
+
+    # --- SQLite 저장소 ---
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self) -> None:
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+            (self.namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        return json.loads(value), expires_at
+
+    def _disk_set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO cache (namespace, key, value, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (namespace, key)
+                DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at
+                """,
+                (self.namespace, key, json.dumps(value, ensure_ascii=False), expires_at),
+            )
+
+    # --- 메모리 LRU ---
+
+    def _memory_put(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key: str, now: float) -> Tuple[Optional[tuple], str]:
+        """stale 구간까지 포함하여 (값, 만료 시각)과 조회 위치를 찾습니다."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] + self.stale_ttl > now:
+                    self._memory.move_to_end(key)
+                    return entry, "memory"
+                del self._memory[key]
+
+        if self.db_path:
+            entry = self._disk_get(key)
+            if entry is not None and (entry[1] is None or entry[1] + self.stale_ttl > now):
+                with self._lock:
+                    self._memory_put(key, entry)
+                return entry, "disk"
+        return None, ""
+
+    # --- 공개 API ---
+
+    # 시간복잡도: 메모리 적중 시 O(1), 디스크 조회 시 O(log n) (PK 인덱스)
+    def get(self, key: str) -> Any:
+        """캐시에서 값을 조회합니다.
+
+        Args:
+            key (str): 캐시 키 (normalize_key로 정규화된 값 권장)
+        Returns:
+            Any: 저장된 값. 음수 캐싱된 경우 None, 없거나 만료된 경우 MISSING
+        """
+        value, fresh = self.get_stale(key)
+        return value if fresh else MISSING
+
+    def get_stale(self, key: str) -> Tuple[Any, bool]:
+        """만료되었더라도 stale 구간 안의 값이면 함께 반환합니다.
+
+        Args:
+            key (str): 캐시 키
+        Returns:
+            Tuple[Any, bool]: (값, 유효 여부). 값이 없으면 (MISSING, False)
+        """
+        now = time.time()
+        entry, source = self._lookup(key, now)
+        fresh = entry is not None and (entry[1] is None or entry[1] > now)
+        with self._lock:
+            if fresh:
+                self.stats[f"{source}_hits"] += 1
+            else:
+                self.stats["misses"] += 1
+        if entry is None:
+            return MISSING, False
+        return entry[0], fresh
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """캐시에 값을 저장합니다.
+
+        Args:
+            key (str): 캐시 키
+            value (Any): JSON 직렬화 가능한 값. None이면 음수 캐싱으로 처리
+            ttl (Optional[float]): 이 항목에만 적용할 유효 시간(초)
+        """
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._memory_put(key, (value, expires_at))
+            self.stats["writes"] += 1
+        if self.db_path:
+            self._disk_set(key, value, expires_at)
+
+    def hit_rate(self) -> float:
+        """현재까지의 캐시 적중률(0.0~1.0)을 반환합니다."""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
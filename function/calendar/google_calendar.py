@@ -9,12 +9,10 @@ import os.path
 import json
 from typing import Optional, List, Dict, Any, Union
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from ..google_service import get_google_service
+
 import openai
 # OpenAI API 키 설정 (환경 변수 또는 직접 입력)
 # 실제 배포 시에는 환경 변수를 사용하는 것이 보안상 권장됩니다.
@@ -41,58 +39,24 @@ def get_calendar_service():
     Google Calendar API 서비스 객체를 반환합니다.
     OAuth2 인증 흐름을 처리하여 Credential을 얻습니다.
 
-    이 함수는 사용자의 Google 계정 인증을 처리합니다.
     최초 실행 시 웹 브라우저를 통해 인증을 요청하며,
     인증이 완료되면 'tokens.json' 파일에 인증 정보를 저장하여
     이후 호출 시에는 재인증 없이 사용합니다.
+    인증 정보와 서비스 객체는 프로세스에서 한 번만 만들어 재사용하고,
+    액세스 토큰은 만료되기 전에 미리 갱신합니다. (function/google_service.py 참고)
 
     Returns:
         googleapiclient.discovery.Resource: Google Calendar API 서비스 객체.
 
     Raises:
         FileNotFoundError: 'credentials.json' 파일이 없을 경우 발생.
-        HttpError: Google API 호출 중 오류가 발생할 경우 발생.
+        google.auth.exceptions.RefreshError: 토큰 갱신에 실패할 경우 발생.
     """
-    creds = None
-    # 1. 기존 인증 정보 확인:
-    # 'tokens.json' 파일이 존재하면 이전에 저장된 인증 정보를 로드합니다.
-    # 이를 통해 애플리케이션을 다시 실행할 때마다 사용자에게 재인증을 요청할 필요가 없습니다.
-    if os.path.exists('tokens.json'):
-        creds = Credentials.from_authorized_user_file('tokens.json', SCOPES)
-
-    # 2. 인증 정보 유효성 검사 및 새로고침:
-    # 인증 정보가 없거나, 유효하지 않거나 (예: 만료된 경우), 새로고침이 필요한 경우
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            # 토큰이 만료되었지만 새로고침 토큰이 있는 경우, 토큰을 새로고침합니다.
-            # 이 과정은 백그라운드에서 자동으로 진행될 수 있습니다.
-            creds.refresh(Request())
-        else:
-            # 3. 새로운 인증 흐름 시작:
-            # 'credentials.json' 파일에서 클라이언트 ID와 시크릿을 로드하여
-            # OAuth 2.0 인증 흐름을 시작합니다.
-            # `InstalledAppFlow.from_client_secrets_file`은 로컬에 설치된
-            # 애플리케이션을 위한 인증 흐름을 생성합니다.
-            # `run_local_server(port=0)`는 사용자가 인증을 완료할 때 Google로부터
-            # 리디렉션될 로컬 웹 서버를 동적으로 할당된 포트에 띄웁니다.
-            try:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    CREDENTIALS_FILE_PATH, SCOPES)
-                creds = flow.run_local_server(port=0)
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Error: '{CREDENTIALS_FILE_PATH}' 파일이 없습니다. "
-                                        "Google Cloud Console에서 다운로드하여 프로젝트 루트에 배치해주세요.")
-
-        # 4. 새로 얻은 인증 정보 저장:
-        # 새로 얻거나 새로고침된 인증 정보를 'tokens.json' 파일에 저장합니다.
-        # 다음 실행부터 이 파일을 사용하여 재인증을 피할 수 있습니다.
-        with open('tokens.json', 'w') as token:
-            token.write(creds.to_json())
-
-    # 5. Calendar API 서비스 객체 빌드 및 반환:
-    # 얻은 인증 정보를 사용하여 Google Calendar API 서비스 객체를 빌드합니다.
-    # 이 객체를 통해 실제 캘린더 API 호출을 수행할 수 있습니다.
-    return build('calendar', 'v3', credentials=creds)
+    return get_google_service(
+        'calendar', 'v3', SCOPES,
+        token_path=os.path.join(TOKENS_DIRECTORY_PATH, 'tokens.json'),
+        credentials_path=CREDENTIALS_FILE_PATH,
+    )
 
 
 def create_calendar_event(
@@ -1,15 +1,12 @@
 import datetime
-import os.path
 from typing import Optional, List, Dict, Any, Union
 
 from langchain_core.tools import tool
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from ..google_service import get_google_service
+
 
 SCOPES = ["https://www.googleapis.com/auth/calendar.events"]
 CREDENTIALS_FILE_PATH = "credentials.json"
@@ -17,26 +14,10 @@ TOKENS_FILE_PATH = "token.json"
 
 
 def get_calendar_service():
-    """Google Calendar API 서비스 객체를 인증하고 반환하는 헬퍼 함수"""
-    creds = None
-    if os.path.exists(TOKENS_FILE_PATH):
-        creds = Credentials.from_authorized_user_file(TOKENS_FILE_PATH, SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            try:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    CREDENTIALS_FILE_PATH, SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-            except FileNotFoundError:
-                raise FileNotFoundError(
-                    f"Error: '{CREDENTIALS_FILE_PATH}' 파일이 없습니다. Google Cloud Console에서 다운로드하여 프로젝트 루트에 배치해주세요."
-                )
-        with open(TOKENS_FILE_PATH, "w") as token:
-            token.write(creds.to_json())
-    return build("calendar", "v3", credentials=creds)
+    """Google Calendar API 서비스 객체를 반환하는 헬퍼 함수 (인증 정보와 서비스 객체는 재사용)"""
+    return get_google_service(
+        "calendar", "v3", SCOPES, token_path=TOKENS_FILE_PATH, credentials_path=CREDENTIALS_FILE_PATH
+    )
 
 
 @tool
@@ -1,10 +1,18 @@
 import os
+import sys
 import json
 import asyncio
 import openai
 from dotenv import load_dotenv
 from Binance_test import get_crypto_analysis, get_pi_cycle_analysis
-from symbol_map_crypto import find_symbol_by_name
+from symbol_map_crypto import crypto_code_map
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from function.entity_matcher import EntityMatcher
+
+# 코인명/심볼 → 거래 심볼 매칭기 (임포트 시 한 번만 생성, 'btc'처럼 소문자도 인식)
+# 'SOL', 'ETH' 같은 영문 심볼은 단어 단위로만 찾습니다. ('console', 'method'에서 찾지 않도록)
+CRYPTO_NAME_MATCHER = EntityMatcher(crypto_code_map, ignore_case=True, latin_word_boundary=True)
 
 load_dotenv()
 client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -27,12 +35,8 @@ get_crypto_analysis_schema = {
 async def main():
     user_prompt = "비트코인 1시간 변동성, 거래량, 시가총액 알려줘. 그리고 pi cycle top 신호도 분석해줘."
 
-    # 코인명 추출 및 심볼 매핑 (간단 예시)
-    symbol = None
-    for name in ["비트코인", "BTC", "이더리움", "ETH", "리플", "XRP", "솔라나", "SOL"]:
-        if name in user_prompt:
-            symbol = find_symbol_by_name(name)
-            break
+    # 코인명 추출 및 심볼 매핑
+    symbol = CRYPTO_NAME_MATCHER.find_first(user_prompt)
     if not symbol:
         print("❌ 코인명을 찾을 수 없습니다.")
         return
@@ -0,0 +1,116 @@
+"""사용자 질문에서 지역명, 행사 분야, 종목명 같은 엔티티를 찾는 다중 패턴 매칭 모듈.
+
+사전의 키마다 `if name in query`를 반복하면 사전이 커질수록 호출마다 비용이 늘어나므로,
+모듈 임포트 시점에 모든 키를 Aho-Corasick 오토마톤으로 한 번 컴파일해 두고
+질문 문자열을 한 번만 훑어 일치하는 키를 모두 찾습니다.
+
+- EntityMatcher(mapping): 키 → 값 사전으로 오토마톤을 생성
+- find_all(text): 겹치지 않는 일치 목록 (왼쪽에서부터, 같은 위치면 가장 긴 키 우선)
+- find_first(text): 가장 먼저 나오는 키의 값
+"""
+import re
+from collections import deque
+from typing import Dict, Generic, Iterator, List, Mapping, NamedTuple, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_LATIN_WORD_CHAR = re.compile(r"[A-Za-z0-9]")
+
+
+class EntityMatch(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    value: object
+
+
+class EntityMatcher(Generic[V]):
+    """키워드 사전을 Aho-Corasick 오토마톤으로 컴파일한 다중 패턴 매처.
+
+    Args:
+        mapping (Mapping[str, V]): 찾을 키워드 → 반환할 값 (예: {'서울': '1', '경기도': '31'})
+        ignore_case (bool): 영문 대소문자를 구분하지 않을지 여부 (예: 'btc'도 'BTC'로 인식)
+        latin_word_boundary (bool): 영문/숫자로 시작하거나 끝나는 키는 앞뒤에 영문/숫자가 붙지 않은 경우에만 인정
+            (예: 'SOL'은 'sol 시세'에서는 찾지만 'console'에서는 찾지 않음. 한글은 붙어 있어도 됨: 'sol가격')
+    """
+
+    def __init__(self, mapping: Mapping[str, V], ignore_case: bool = False, latin_word_boundary: bool = False) -> None:
+        self.ignore_case = ignore_case
+        self.latin_word_boundary = latin_word_boundary
+        # 노드별 자식 전이, 실패 링크, 그 노드에서 끝나는 (키 길이, 키, 값) 목록
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, str, V]]] = [[]]
+        for keyword, value in mapping.items():
+            if keyword:
+                self._add(keyword, value)
+        self._build_failure_links()
+
+    def _normalize(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def _add(self, keyword: str, value: V) -> None:
+        node = 0
+        for char in self._normalize(keyword):
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = child
+        self._outputs[node].append((len(keyword), keyword, value))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # 실패 링크가 가리키는 노드의 출력(더 짧은 접미사 키)을 미리 합쳐 둡니다.
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    # 시간복잡도: O(n + z) (n: 텍스트 길이, z: 일치 건수). 사전 크기와 무관합니다.
+    def iter_matches(self, text: str) -> Iterator[EntityMatch]:
+        """텍스트에 나오는 모든 키를 (겹치는 것까지) 끝 위치 순서로 반환합니다."""
+        node = 0
+        text = self._normalize(text)
+        for i, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length, keyword, value in self._outputs[node]:
+                start = i + 1 - length
+                if self.latin_word_boundary and not self._on_latin_boundary(text, start, i + 1):
+                    continue
+                yield EntityMatch(start, i + 1, keyword, value)
+
+    @staticmethod
+    def _on_latin_boundary(text: str, start: int, end: int) -> bool:
+        def is_latin(index: int) -> bool:
+            return 0 <= index < len(text) and bool(_LATIN_WORD_CHAR.match(text[index]))
+
+        return not (is_latin(start) and is_latin(start - 1)) and not (is_latin(end - 1) and is_latin(end))
+
+    def find_all(self, text: str) -> List[EntityMatch]:
+        """겹치지 않는 일치 목록을 반환합니다. 같은 위치에서 시작하면 가장 긴 키를 고릅니다.
+
+        예: '경기도 광주' → ['경기도'(31), '광주'(5)], '경기' 단독 일치는 '경기도'에 포함되어 제외
+        """
+        matches = sorted(self.iter_matches(text), key=lambda m: (m.start, -(m.end - m.start)))
+        selected, last_end = [], 0
+        for match in matches:
+            if match.start >= last_end:
+                selected.append(match)
+                last_end = match.end
+        return selected
+
+    def find_first(self, text: str, default: Optional[V] = None) -> Optional[V]:
+        """텍스트에서 가장 먼저 나오는 키의 값을 반환합니다. 없으면 default."""
+        matches = self.find_all(text)
+        return matches[0].value if matches else default
@@ -0,0 +1,133 @@
+"""Google API(Gmail, Calendar) 인증 정보와 서비스 객체 공유 모듈.
+
+도구를 호출할 때마다 토큰 파일을 다시 읽고 build()로 디스커버리 문서를 받아 파싱하면
+호출마다 수백 ms가 더 걸리므로, 인증 정보와 서비스 객체를 만들어 두고 재사용합니다.
+
+- 인증 정보: (토큰 파일, 스코프)마다 프로세스에서 하나를 공유하고, 만료 TOKEN_REFRESH_MARGIN 전에 미리 갱신
+- 서비스 객체: googleapiclient가 쓰는 httplib2가 스레드 안전하지 않으므로 스레드마다 한 번만 build하고,
+  디스커버리 문서는 라이브러리에 포함된 문서(static_discovery)를 사용
+- 토큰 파일: 임시 파일에 쓴 뒤 os.replace로 바꿔, 여러 스레드/프로세스가 동시에 쓰거나 읽어도 깨진 파일이 보이지 않음
+"""
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Sequence, Tuple
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
+
+DEFAULT_TOKEN_FILE_PATH = "token.json"
+DEFAULT_CREDENTIALS_FILE_PATH = "credentials.json"
+# 액세스 토큰의 남은 유효 시간이 이보다 짧으면 API를 호출하기 전에 미리 갱신합니다.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+_credentials: Dict[Tuple[str, Tuple[str, ...]], Credentials] = {}
+# 갱신/로그인과 토큰 파일 쓰기가 동시에 두 번 일어나지 않도록 직렬화합니다.
+_credentials_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def save_token(creds: Credentials, token_path: str) -> None:
+    """인증 정보를 토큰 파일에 원자적으로 저장합니다. (같은 디렉터리의 임시 파일에 쓴 뒤 교체)"""
+    directory = os.path.dirname(os.path.abspath(token_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".token-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, token_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _needs_refresh(creds: Credentials) -> bool:
+    if not creds.token:
+        return True
+    if creds.expiry is None:
+        return False
+    # Credentials.expiry는 naive UTC 시각입니다.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return creds.expiry - now < TOKEN_REFRESH_MARGIN
+
+
+def get_google_credentials(
+    scopes: Sequence[str],
+    token_path: str = DEFAULT_TOKEN_FILE_PATH,
+    credentials_path: str = DEFAULT_CREDENTIALS_FILE_PATH,
+) -> Credentials:
+    """프로세스에서 공유하는 Google 인증 정보를 반환합니다. (스레드 안전)
+
+    토큰 파일은 처음 한 번만 읽고, 만료가 가까우면 리프레시 토큰으로 미리 갱신하여 저장합니다.
+    유효한 토큰이 없으면 브라우저 로그인 흐름을 시작합니다.
+
+    Args:
+        scopes (Sequence[str]): 요청할 OAuth 스코프
+        token_path (str): 액세스/리프레시 토큰을 저장하는 파일 경로
+        credentials_path (str): Google Cloud Console에서 받은 클라이언트 정보 파일 경로
+    Returns:
+        Credentials: 유효한 인증 정보
+    Raises:
+        FileNotFoundError: 로그인이 필요한데 credentials_path 파일이 없는 경우
+        google.auth.exceptions.RefreshError: 토큰 갱신에 실패한 경우
+    """
+    key = (os.path.abspath(token_path), tuple(scopes))
+    with _credentials_lock:
+        creds = _credentials.get(key)
+        if creds is None and os.path.exists(token_path):
+            creds = Credentials.from_authorized_user_file(token_path, list(scopes))
+
+        if creds and creds.refresh_token and _needs_refresh(creds):
+            creds.refresh(Request())
+            save_token(creds, token_path)
+        elif not creds or not creds.valid:
+            try:
+                flow = InstalledAppFlow.from_client_secrets_file(credentials_path, list(scopes))
+            except FileNotFoundError:
+                raise FileNotFoundError(
+                    f"Error: '{credentials_path}' 파일이 없습니다. Google Cloud Console에서 다운로드하여 프로젝트 루트에 배치해주세요."
+                )
+            creds = flow.run_local_server(port=0)
+            save_token(creds, token_path)
+
+        _credentials[key] = creds
+        return creds
+
+
+def get_google_service(
+    api: str,
+    version: str,
+    scopes: Sequence[str],
+    token_path: str = DEFAULT_TOKEN_FILE_PATH,
+    credentials_path: str = DEFAULT_CREDENTIALS_FILE_PATH,
+) -> Any:
+    """Google API 서비스 객체를 반환합니다. 현재 스레드에서 이미 만든 객체가 있으면 그대로 재사용합니다.
+
+    서비스 객체는 공유 인증 정보를 참조하므로, 토큰이 갱신되어도 다시 build하지 않습니다.
+
+    Args:
+        api (str): API 이름 (예: 'gmail', 'calendar')
+        version (str): API 버전 (예: 'v1', 'v3')
+        scopes (Sequence[str]): 요청할 OAuth 스코프
+        token_path (str): 토큰 파일 경로
+        credentials_path (str): 클라이언트 정보 파일 경로
+    Returns:
+        googleapiclient.discovery.Resource: API 서비스 객체
+    Raises:
+        FileNotFoundError: 로그인이 필요한데 credentials_path 파일이 없는 경우
+        google.auth.exceptions.RefreshError: 토큰 갱신에 실패한 경우
+    """
+    creds = get_google_credentials(scopes, token_path, credentials_path)
+    services = getattr(_thread_local, "services", None)
+    if services is None:
+        services = _thread_local.services = {}
+    key = (api, version, os.path.abspath(token_path), tuple(scopes))
+    cached = services.get(key)
+    # 다시 로그인하여 인증 정보 객체가 바뀐 경우에만 새로 build합니다.
+    if cached is None or cached[0] is not creds:
+        service = build(api, version, credentials=creds, static_discovery=True, cache_discovery=False)
+        cached = services[key] = (creds, service)
+    return cached[1]
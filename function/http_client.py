@@ -0,0 +1,78 @@
+"""외부 API 호출에 공유하는 httpx 클라이언트 모듈.
+
+요청마다 클라이언트를 새로 만들면 매번 TCP/TLS 연결을 다시 맺어야 하므로,
+프로세스 전체에서 keep-alive 커넥션 풀을 가진 클라이언트를 공유합니다.
+
+- get_client(): 스레드 간 공유하는 동기 httpx.Client
+- get_async_client(): 이벤트 루프별로 공유하는 httpx.AsyncClient
+- single_flight(): 같은 키의 비동기 작업이 진행 중이면 그 작업의 결과를 함께 기다림
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+# 커넥션 풀은 이벤트 루프에 묶여 있으므로 루프마다 클라이언트와 진행 중 작업을 따로 관리합니다.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.Client:
+    """프로세스에서 공유하는 동기 httpx.Client를 반환합니다. (스레드 안전)"""
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 공유하는 httpx.AsyncClient를 반환합니다."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """현재 이벤트 루프의 공유 클라이언트를 닫습니다. 애플리케이션 종료 시 호출합니다."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def single_flight(key: str, factory: Callable[[], Awaitable[Any]]) -> "asyncio.Task":
+    """같은 key의 작업이 진행 중이면 그 Task를, 아니면 새 Task를 반환합니다.
+
+    호출자는 asyncio.shield(task)로 기다려야, 한 호출자가 취소되어도
+    같은 작업을 기다리는 다른 호출자에게 영향을 주지 않습니다.
+
+    Args:
+        key (str): 작업을 구분하는 키 (예: 'forecast:37.4,127.1')
+        factory (Callable[[], Awaitable[Any]]): 진행 중인 작업이 없을 때 실행할 코루틴 생성 함수
+    Returns:
+        asyncio.Task: 진행 중이거나 새로 시작한 작업
+    """
+    inflight = _inflight.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        inflight[key] = task
+        task.add_done_callback(lambda done: _finish_flight(inflight, key, done))
+    return task
+
+
+def _finish_flight(inflight: Dict[str, "asyncio.Task"], key: str, task: "asyncio.Task") -> None:
+    inflight.pop(key, None)
+    # 기다리던 호출자가 모두 먼저 응답한 경우에도 예외가 소비되도록 합니다.
+    if not task.cancelled():
+        task.exception()
@@ -3,6 +3,7 @@ import polars as pl
 from langchain_openai import ChatOpenAI
 import dotenv
 import os 
+import sys
 dotenv.load_dotenv()
 
 import os
@@ -17,42 +18,70 @@ from dateutil.parser import parse as parse_datetime  # <--- 이 줄을 추가!
 
 
 # Google API 관련 라이브러리
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from bs4 import BeautifulSoup
 import base64
 from email.mime.text import MIMEText
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from function.google_service import get_google_service
+
 # Gmail API의 권한 범위를 지정합니다. 'readonly'는 읽기 전용 권한입니다.
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+# 배치 요청 하나에 담을 최대 요청 수 (Gmail API 한도는 100이지만 50 이하를 권장합니다)
+GMAIL_BATCH_SIZE = 50
+# 메시지를 가공할 때 쓰는 필드만 받도록 응답을 줄이는 fields 마스크
+MESSAGE_FIELDS = "id,snippet,payload(headers,body/data,parts(mimeType,body/data))"
+MESSAGE_METADATA_FIELDS = "id,snippet,payload/headers"
+DRAFT_FIELDS = f"id,message({MESSAGE_FIELDS})"
+METADATA_HEADERS = ['From', 'Subject', 'Date']
+
 def get_gmail_service():
-    """Google 인증을 처리하고 Gmail API 서비스 객체를 반환하는 함수 (token.json 사용)"""
-    creds = None
-    # 'token.json' 파일은 사용자의 액세스 및 리프레시 토큰을 저장합니다.
-    if os.path.exists("token.json"):
-        creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-    
-    # 유효한 자격 증명이 없는 경우, 사용자가 로그인하도록 합니다.
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            # 토큰이 만료되었으면 리프레시합니다.
-            creds.refresh(Request())
-        else:
-            # 새 인증을 위해 로그인 흐름을 시작합니다.
-            flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
-            creds = flow.run_local_server(port=0)
-        
-        # 다음 실행을 위해 새 자격 증명(JSON 형식)을 저장합니다.
-        with open("token.json", "w") as token:
-            token.write(creds.to_json())
+    """
+    Gmail API 서비스 객체를 반환하는 함수 (token.json 사용)
 
-    # API 서비스 객체를 빌드하여 반환합니다.
-    service = build("gmail", "v1", credentials=creds)
-    return service
+    인증 정보와 서비스 객체는 처음 한 번만 만들어 재사용하고, 토큰은 만료 전에 미리 갱신합니다.
+    """
+    return get_google_service("gmail", "v1", SCOPES, token_path="token.json")
+
+
+def _batch_get_resources(service, resource_ids, include_body=False):
+    """
+    메시지/초안 ID 목록을 Gmail 배치 요청(BatchHttpRequest)으로 한 번에 조회합니다.
+
+    ID마다 get을 따로 호출하지 않고 GMAIL_BATCH_SIZE개씩 묶어 HTTP 왕복 한 번으로 보내며,
+    fields 마스크로 가공에 필요한 필드만 받습니다.
+
+    - service: 인증된 Gmail API 서비스 객체.
+    - resource_ids: 메시지 ID 또는 초안 ID('r'로 시작) 목록.
+    - include_body: True일 경우 메시지 본문(format='full')까지 조회합니다.
+    - 반환값: resource_ids 순서대로의 (응답, 오류) 튜플 리스트. 성공하면 오류가 None, 실패하면 응답이 None입니다.
+    """
+    results = [(None, None)] * len(resource_ids)
+
+    def _on_response(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for offset in range(0, len(resource_ids), GMAIL_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=_on_response)
+        for index, resource_id in enumerate(resource_ids[offset:offset + GMAIL_BATCH_SIZE], start=offset):
+            if resource_id.startswith('r'):
+                request = service.users().drafts().get(
+                    userId='me', id=resource_id, format='full', fields=DRAFT_FIELDS
+                )
+            elif include_body:
+                request = service.users().messages().get(
+                    userId='me', id=resource_id, format='full', fields=MESSAGE_FIELDS
+                )
+            else:
+                request = service.users().messages().get(
+                    userId='me', id=resource_id, format='metadata',
+                    metadataHeaders=METADATA_HEADERS, fields=MESSAGE_METADATA_FIELDS,
+                )
+            batch.add(request, request_id=str(index))
+        batch.execute()
+    return results
 
 
 def _process_message_list(service, list_results, include_body=False):
@@ -68,18 +97,22 @@ def _process_message_list(service, list_results, include_body=False):
     include_body=True
     processed_results = []
     num_items_to_process = 3 if include_body else 5
-    for item_stub in list_results[:num_items_to_process]:
+    item_stubs = [item_stub for item_stub in list_results[:num_items_to_process] if item_stub.get('id')]
+    # 상세 정보는 배치 요청 한 번으로 모두 받아 온 뒤 순서대로 가공합니다.
+    responses = _batch_get_resources(service, [item_stub['id'] for item_stub in item_stubs], include_body)
+    for item_stub, (full_resource, error) in zip(item_stubs, responses):
+        if error is not None:
+            print(f"ID '{item_stub.get('id')}' 처리 중 API 오류 발생: {error}")
+            continue
         try:
             resource_id = item_stub.get('id')
-            is_draft = resource_id and resource_id.startswith('r')
+            is_draft = resource_id.startswith('r')
 
             if is_draft:
-                full_resource = service.users().drafts().get(userId='me', id=resource_id, format='full').execute()
-                msg_data = full_resource.get('message', {})
+                msg_data = (full_resource or {}).get('message', {})
                 from_email = "나 (초안)"
             else: 
-                msg_format = 'full' if include_body else 'metadata'
-                msg_data = service.users().messages().get(userId='me', id=resource_id, format=msg_format).execute()
+                msg_data = full_resource or {}
                 headers_temp = msg_data.get('payload', {}).get('headers', [])
                 from_email = next((h['value'] for h in headers_temp if h['name'].lower() == 'from'), 'N/A')
 
@@ -1,14 +1,29 @@
 import os
-from typing import List, Optional
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 import httpx
 from dotenv import load_dotenv
 
+from ..cache import MISSING
+from ..http_client import get_async_client, get_client
+from ..rate_limit import RateLimitError, aacquire, acquire
+from .place_cache import PLACE_CACHE_NEGATIVE_TTL, place_cache, place_cache_key, place_cache_stats
+from .place_index import get_place_index
+
 # 환경 변수 로딩
 load_dotenv()
 
 NAVER_CLIENT_ID: str = os.getenv("NAVER_CLIENT_ID", "")
 NAVER_CLIENT_SECRET: str = os.getenv("NAVER_CLIENT_SECRET", "")
+NAVER_LOCAL_URL = "https://openapi.naver.com/v1/search/local.json"
+# 지역 검색 API의 페이지당 최대 결과 수와 최대 시작 위치
+NAVER_LOCAL_MAX_DISPLAY = 5
+NAVER_LOCAL_MAX_START = 5
+# 한 번의 도구 호출에서 모을 수 있는 최대 후보 수 (정렬 기준 2개 × 페이지당 5개)
+MAX_PLACE_CANDIDATES = 10
 
 class NaverPlaceItem(BaseModel):
     """네이버 지역 검색 결과의 단일 아이템 모델
@@ -68,43 +83,204 @@ class NaverPlaceSearchRequest(BaseModel):
     start: Optional[int] = Field(1, ge=1, le=5, description="검색 시작 위치(1~5)")
     sort: Optional[str] = Field("random", description="정렬 방법(random/comment)")
 
-# 시간복잡도: O(1) (단일 HTTP 요청)
+def _naver_headers() -> Dict[str, str]:
+    return {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
+    }
+
+
+def _to_params(req: NaverPlaceSearchRequest) -> Dict[str, object]:
+    return {
+        "query": req.query,
+        "display": req.display,
+        "start": req.start,
+        "sort": req.sort,
+    }
+
+
+def _to_response(data: dict) -> NaverPlaceSearchResponse:
+    # 네이버 API의 응답 필드명을 그대로 사용
+    return NaverPlaceSearchResponse(
+        total=data["total"],
+        start=data["start"],
+        display=data["display"],
+        items=[NaverPlaceItem(**item) for item in data["items"]],
+    )
+
+
+def _cached_response(req: NaverPlaceSearchRequest) -> Optional[NaverPlaceSearchResponse]:
+    cached = place_cache.get(place_cache_key(req.query, req.display, req.start, req.sort))
+    if cached is MISSING:
+        return None
+    place_cache_stats["quota_saved"] += 1
+    return NaverPlaceSearchResponse(**cached)
+
+
+def _stale_response(req: NaverPlaceSearchRequest, error: RateLimitError) -> NaverPlaceSearchResponse:
+    # 호출 한도에 걸리면 만료된 캐시라도 있으면 그것으로 응답합니다.
+    cached, _ = place_cache.get_stale(place_cache_key(req.query, req.display, req.start, req.sort))
+    if cached is MISSING or cached is None:
+        raise error
+    print(f"naver place search: {error}, 만료된 캐시로 응답")
+    place_cache_stats["quota_saved"] += 1
+    return NaverPlaceSearchResponse(**cached)
+
+
+def _store_response(req: NaverPlaceSearchRequest, data: dict) -> NaverPlaceSearchResponse:
+    result = _to_response(data)
+    get_place_index().add_naver_items(result.items)
+    # 결과가 없는 검색어는 음수 캐싱과 같은 짧은 TTL로 저장합니다.
+    place_cache.set(
+        place_cache_key(req.query, req.display, req.start, req.sort),
+        result.model_dump(),
+        ttl=None if result.items else PLACE_CACHE_NEGATIVE_TTL,
+    )
+    return result
+
+
+# 시간복잡도: 캐시 적중 시 O(1), 미적중 시 단일 HTTP 요청
 def search_naver_place(
     req: NaverPlaceSearchRequest
 ) -> NaverPlaceSearchResponse:
     """네이버 지역 검색 API를 호출하여 결과를 반환합니다.
 
+    정규화된 검색어가 같은 요청은 place_cache에서 응답합니다.
+
     Args:
         req (NaverPlaceSearchRequest): 검색 요청 파라미터
     Returns:
         NaverPlaceSearchResponse: 검색 결과
     Raises:
         httpx.HTTPStatusError: 네이버 API 호출 실패 시
+        RateLimitError: 호출 한도에 걸렸고 만료된 캐시도 없는 경우
     """
+    cached = _cached_response(req)
+    if cached is not None:
+        return cached
+    try:
+        acquire("naver", NAVER_CLIENT_ID)
+    except RateLimitError as e:
+        return _stale_response(req, e)
+
     print(f"naver place search: {req}")
-    url = "https://openapi.naver.com/v1/search/local.json"
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
-    }
-    params = {
-        "query": req.query,
-        "display": req.display,
-        "start": req.start,
-        "sort": req.sort,
-    }
-    with httpx.Client() as client:
-        response = client.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-        # print(f'receive naver place: {data}')
-        # 네이버 API의 응답 필드명을 그대로 사용
-        return NaverPlaceSearchResponse(
-            total=data["total"],
-            start=data["start"],
-            display=data["display"],
-            items=[NaverPlaceItem(**item) for item in data["items"]],
-        )
+    response = get_client().get(NAVER_LOCAL_URL, headers=_naver_headers(), params=_to_params(req))
+    response.raise_for_status()
+    # print(f'receive naver place: {response.json()}')
+    return _store_response(req, response.json())
+
+
+# 시간복잡도: 캐시 적중 시 O(1), 미적중 시 단일 HTTP 요청
+async def search_naver_place_async(
+    req: NaverPlaceSearchRequest
+) -> NaverPlaceSearchResponse:
+    """search_naver_place의 비동기 버전입니다. 같은 캐시와 공유 AsyncClient를 사용합니다.
+
+    Args:
+        req (NaverPlaceSearchRequest): 검색 요청 파라미터
+    Returns:
+        NaverPlaceSearchResponse: 검색 결과
+    Raises:
+        httpx.HTTPStatusError: 네이버 API 호출 실패 시
+        RateLimitError: 호출 한도에 걸렸고 만료된 캐시도 없는 경우
+    """
+    cached = _cached_response(req)
+    if cached is not None:
+        return cached
+    try:
+        await aacquire("naver", NAVER_CLIENT_ID)
+    except RateLimitError as e:
+        return _stale_response(req, e)
+
+    print(f"naver place search (async): {req}")
+    response = await get_async_client().get(NAVER_LOCAL_URL, headers=_naver_headers(), params=_to_params(req))
+    response.raise_for_status()
+    return _store_response(req, response.json())
+
+
+def build_fanout_requests(query: str, limit: int) -> List[NaverPlaceSearchRequest]:
+    """limit개의 후보를 모으는 데 필요한 페이지 요청 목록을 만듭니다.
+
+    지역 검색 API는 페이지당 5개, 시작 위치 5까지만 허용하므로
+    허용되는 시작 위치를 정확도순(random)과 리뷰순(comment) 정렬에 대해 나누어
+    서로 다른 후보 집합을 요청합니다. 중복 제거로 줄어드는 몫을 고려해 한 페이지를 더 요청합니다.
+
+    Args:
+        query (str): 검색어
+        limit (int): 모으려는 후보 수
+    Returns:
+        List[NaverPlaceSearchRequest]: 동시에 보낼 페이지 요청 목록 (limit이 5 이하면 1개)
+    """
+    starts = range(1, NAVER_LOCAL_MAX_START + 1, NAVER_LOCAL_MAX_DISPLAY)
+    pages = [(start, sort) for sort in ("random", "comment") for start in starts]
+    needed = math.ceil(limit / NAVER_LOCAL_MAX_DISPLAY)
+    if needed > 1:
+        needed += 1
+    return [
+        NaverPlaceSearchRequest(query=query, display=NAVER_LOCAL_MAX_DISPLAY, start=start, sort=sort)
+        for start, sort in pages[:needed]
+    ]
+
+
+def _place_key(item: NaverPlaceItem) -> str:
+    return item.link or item.roadAddress or f"{item.title}|{item.address}"
+
+
+# 시간복잡도: O(n) (n: 모든 페이지의 결과 수)
+def merge_place_results(responses: List[NaverPlaceSearchResponse], limit: int) -> List[NaverPlaceItem]:
+    """여러 페이지의 결과를 link/roadAddress 기준으로 중복 제거하고 순위를 매깁니다.
+
+    순위는 결과 목록별 순위의 역수 합(reciprocal rank fusion)으로 계산하여,
+    여러 정렬 기준에서 상위에 나온 장소가 앞에 오도록 합니다.
+
+    Args:
+        responses (List[NaverPlaceSearchResponse]): 페이지별 검색 결과
+        limit (int): 반환할 최대 결과 수
+    Returns:
+        List[NaverPlaceItem]: 순위가 매겨진 상위 limit개의 장소
+    """
+    scores: Dict[str, float] = {}
+    items: Dict[str, NaverPlaceItem] = {}
+    for response in responses:
+        for rank, item in enumerate(response.items, start=response.start):
+            key = _place_key(item)
+            items.setdefault(key, item)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (60 + rank)
+    ranked = sorted(items, key=lambda key: scores[key], reverse=True)
+    return [items[key] for key in ranked[:limit]]
+
+
+def fetch_place_candidates(query: str, limit: int = NAVER_LOCAL_MAX_DISPLAY) -> List[NaverPlaceItem]:
+    """필요한 페이지를 공유 Client로 동시에 요청하여 상위 limit개의 장소를 반환합니다.
+
+    Args:
+        query (str): 검색어
+        limit (int): 반환할 최대 결과 수 (최대 MAX_PLACE_CANDIDATES)
+    Returns:
+        List[NaverPlaceItem]: 중복 제거 후 순위가 매겨진 장소 목록
+    Raises:
+        httpx.HTTPStatusError: 네이버 API 호출 실패 시
+    """
+    page_requests = build_fanout_requests(query, min(limit, MAX_PLACE_CANDIDATES))
+    with ThreadPoolExecutor(max_workers=len(page_requests)) as executor:
+        responses = list(executor.map(search_naver_place, page_requests))
+    return merge_place_results(responses, limit)
+
+
+async def afetch_place_candidates(query: str, limit: int = NAVER_LOCAL_MAX_DISPLAY) -> List[NaverPlaceItem]:
+    """fetch_place_candidates의 비동기 버전입니다. 페이지 요청을 asyncio.gather로 동시에 보냅니다.
+
+    Args:
+        query (str): 검색어
+        limit (int): 반환할 최대 결과 수 (최대 MAX_PLACE_CANDIDATES)
+    Returns:
+        List[NaverPlaceItem]: 중복 제거 후 순위가 매겨진 장소 목록
+    Raises:
+        httpx.HTTPStatusError: 네이버 API 호출 실패 시
+    """
+    page_requests = build_fanout_requests(query, min(limit, MAX_PLACE_CANDIDATES))
+    responses = await asyncio.gather(*(search_naver_place_async(req) for req in page_requests))
+    return merge_place_results(list(responses), limit)
 
 # 사용 예시 (FastAPI endpoint로 확장 가능)
 # from fastapi import APIRouter
@@ -118,5 +294,5 @@ def search_naver_place(
 # 기술적 배경 및 장단점
 # - 네이버 지역 검색 API는 비로그인 오픈 API로, 인증이 간단하고 빠르게 사용할 수 있습니다.
 # - 단점: 호출 한도(25,000회/일)가 있으며, Client ID/Secret이 노출되지 않도록 주의해야 합니다.
-# - 본 함수는 비동기 HTTP 요청을 사용하여 FastAPI 등 비동기 프레임워크와 궁합이 좋습니다.
+# - 동기/비동기 함수 모두 공유 커넥션 풀(http_client.py)을 사용하여 FastAPI 등 비동기 프레임워크와 궁합이 좋습니다.
 # - 입력/출력 모델을 Pydantic으로 엄격하게 검증하여 안정성을 높였습니다.
@@ -1,15 +1,31 @@
-import os
-from typing import List, Optional, Dict, Any, Union
+import asyncio
+from typing import List, Optional, Dict, Any, Tuple, Union
 from pydantic import BaseModel, Field
 import httpx
 from dotenv import load_dotenv
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
+
+from .naver_place import (
+    MAX_PLACE_CANDIDATES,
+    NAVER_CLIENT_ID,
+    NAVER_CLIENT_SECRET,
+    NaverPlaceItem,
+    afetch_place_candidates,
+    fetch_place_candidates,
+)
+from .place_index import NAVER_SOURCE_API_ID, get_place_index, transform_naver_to_canonical
+from .place_rank import rank_places
+from ..weather.geocode import lookup_location
+from ..weather.weather_async import alookup_location
 
 load_dotenv()
 
-NAVER_CLIENT_ID: str = os.getenv("NAVER_CLIENT_ID", "")
-NAVER_CLIENT_SECRET: str = os.getenv("NAVER_CLIENT_SECRET", "")
+# 기준 위치에서 이 반경 안에 업종이 맞는 네이버 장소가 display개 이상 색인되어 있으면
+# 네이버 API를 호출하지 않고 색인에서 답합니다.
+LOCAL_ANSWER_RADIUS_M = 1_000.0
+# 위치명과 업종을 빼고 남아도 색인으로 답할 수 있는 일반적인 검색어
+GENERIC_QUERY_WORDS = ("근처", "주변", "맛집", "추천", "가까운", "곳")
 
 
 class NaverPlaceSearchArgs(BaseModel):
@@ -17,57 +33,157 @@ class NaverPlaceSearchArgs(BaseModel):
         description="검색할 장소나 가게 이름. '강남역 맛집', '홍대 카페'와 같이 구체적으로 입력해야 합니다."
     )
     display: int = Field(
-        default=5, ge=1, le=5, description="검색 결과 개수(1에서 5 사이)"
+        default=5, ge=1, le=MAX_PLACE_CANDIDATES,
+        description="검색 결과 개수(1에서 10 사이). 5개를 넘으면 여러 페이지를 동시에 조회하여 후보를 모읍니다.",
+    )
+    near: Optional[List[str]] = Field(
+        default=None,
+        description="가까운 순으로 정렬할 기준 위치명 목록. 사용자의 현재 위치나 일정 장소(예: ['강남역', '코엑스'])",
     )
+    category: Optional[str] = Field(
+        default=None, description="우선할 업종 (예: '카페', '한식')",
+    )
+
+
+def _candidate_limit(display: int, near: Optional[List[str]], category: Optional[str]) -> int:
+    # 로컬에서 순위를 매길 때는 후보를 최대한 받아 온 뒤 상위 display개만 돌려줍니다.
+    return MAX_PLACE_CANDIDATES if near or category else display
+
+
+def _geocode_all(near: Optional[List[str]]) -> List[Tuple[float, float]]:
+    origins = []
+    for location in near or []:
+        try:
+            point = lookup_location(location)
+        except Exception as e:
+            print(f"기준 위치 조회 실패({location}): {e}")
+            continue
+        if point:
+            origins.append(point)
+    return origins
+
+
+async def _ageocode_all(near: Optional[List[str]]) -> List[Tuple[float, float]]:
+    points = await asyncio.gather(*(alookup_location(location) for location in near or []), return_exceptions=True)
+    return [point for point in points if point and not isinstance(point, Exception)]
+
+
+def _is_neighborhood_query(query: str, near: Optional[List[str]], category: Optional[str]) -> bool:
+    # '강남역 카페'처럼 위치명, 업종, 일반적인 단어만으로 이루어진 검색어인지 확인합니다.
+    # ('강남역 스타벅스'처럼 상호가 들어간 검색어는 네이버에 맡깁니다.)
+    remaining = "".join(query.split())
+    for word in sorted([*(near or []), category or "", *GENERIC_QUERY_WORDS], key=len, reverse=True):
+        word = "".join(word.split())
+        if word:
+            remaining = remaining.replace(word, "")
+    return not remaining
+
+
+def _local_records(
+    query: str,
+    display: int,
+    near: Optional[List[str]],
+    origins: List[Tuple[float, float]],
+    category: Optional[str],
+) -> List[Dict[str, Any]]:
+    """기준 위치 주변에 이미 색인된 네이버 장소로 답할 수 있으면 그 레코드를, 아니면 빈 리스트를 반환합니다."""
+    if not origins or not category or not _is_neighborhood_query(query, near, category):
+        return []
+    index = get_place_index()
+    records: Dict[str, Dict[str, Any]] = {}
+    for latitude, longitude in origins:
+        for _, record in index.within(latitude, longitude, LOCAL_ANSWER_RADIUS_M, category):
+            if record.get("source_api_id") == NAVER_SOURCE_API_ID:
+                records.setdefault(record["source_data_id"], record)
+    return list(records.values()) if len(records) >= display else []
+
+
+def _simplify(
+    query: str,
+    items: List[NaverPlaceItem],
+    display: int,
+    origins: List[Tuple[float, float]],
+    category: Optional[str],
+) -> Union[List[Dict[str, Any]], str]:
+    if not items:
+        return f"'{query}'에 대한 검색 결과가 없습니다."
+    return _rank_records([transform_naver_to_canonical(item) for item in items], display, origins, category)
 
 
-@tool(args_schema=NaverPlaceSearchArgs)
-def search_naver_places(
-    query: str, display: int = 5
+def _rank_records(
+    records: List[Dict[str, Any]],
+    display: int,
+    origins: List[Tuple[float, float]],
+    category: Optional[str],
+) -> List[Dict[str, Any]]:
+    results = []
+    for record in rank_places(records, origins, category, k=display):
+        result = {
+            "title": record["canonical_name"],
+            "category": record["sub_category"],
+            "roadAddress": record["address_full"],
+            "link": record["link"],
+        }
+        if "distance_m" in record:
+            result["distance_m"] = record["distance_m"]
+        results.append(result)
+    return results
+
+
+def _search_naver_places(
+    query: str, display: int = 5, near: Optional[List[str]] = None, category: Optional[str] = None
 ) -> Union[List[Dict[str, Any]], str]:
     """
     사용자가 맛집, 카페, 병원 등 특정 장소를 찾아달라고 요청할 때 사용합니다.
     예: '강남역 근처 맛집 찾아줘', '서울 시청 주변 주차장 알려줘'
+    사용자 위치나 일정 장소를 near로 넘기면 가까운 순으로 정렬된 결과를 받습니다.
     """
     if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
         return "오류: 네이버 API 인증 정보(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET)가 설정되지 않았습니다."
 
     print(f"네이버 장소 검색 실행: query='{query}', display={display}")
 
-    url = "https://openapi.naver.com/v1/search/local.json"
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
-    }
-    params = {
-        "query": query,
-        "display": display,
-        "start": "1",
-        "sort": "sim",
-    }
+    try:
+        origins = _geocode_all(near)
+        local_records = _local_records(query, display, near, origins, category)
+        if local_records:
+            return _rank_records(local_records, display, origins, category)
+        items = fetch_place_candidates(query, _candidate_limit(display, near, category))
+        return _simplify(query, items, display, origins, category)
+
+    except httpx.HTTPStatusError as e:
+        return f"네이버 API 호출 중 오류가 발생했습니다: {e.response.status_code} - {e.response.text}"
+    except Exception as e:
+        return f"장소 검색 중 예기치 않은 오류가 발생했습니다: {str(e)}"
+
+
+async def _asearch_naver_places(
+    query: str, display: int = 5, near: Optional[List[str]] = None, category: Optional[str] = None
+) -> Union[List[Dict[str, Any]], str]:
+    """_search_naver_places의 비동기 구현. 공유 AsyncClient로 페이지를 동시에 조회합니다."""
+    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        return "오류: 네이버 API 인증 정보(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET)가 설정되지 않았습니다."
+
+    print(f"네이버 장소 검색 실행(async): query='{query}', display={display}")
 
     try:
-        with httpx.Client() as client:
-            response = client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-        items = data.get("items", [])
-        if not items:
-            return f"'{query}'에 대한 검색 결과가 없습니다."
-
-        simplified_results = [
-            {
-                "title": item["title"],
-                "category": item["category"],
-                "roadAddress": item["roadAddress"],
-                "link": item["link"],
-            }
-            for item in items
-        ]
-        return simplified_results
+        # 위치명은 대부분 오프라인 지명 사전에서 바로 좌표를 찾으므로, 색인으로 답할 수 있는지 먼저 확인합니다.
+        origins = await _ageocode_all(near)
+        local_records = _local_records(query, display, near, origins, category)
+        if local_records:
+            return _rank_records(local_records, display, origins, category)
+        items = await afetch_place_candidates(query, _candidate_limit(display, near, category))
+        return _simplify(query, items, display, origins, category)
 
     except httpx.HTTPStatusError as e:
         return f"네이버 API 호출 중 오류가 발생했습니다: {e.response.status_code} - {e.response.text}"
     except Exception as e:
         return f"장소 검색 중 예기치 않은 오류가 발생했습니다: {str(e)}"
+
+
+search_naver_places = StructuredTool.from_function(
+    func=_search_naver_places,
+    coroutine=_asearch_naver_places,
+    name="search_naver_places",
+    args_schema=NaverPlaceSearchArgs,
+)
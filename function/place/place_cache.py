@@ -0,0 +1,67 @@
+"""네이버 지역 검색 결과 캐시 모듈.
+
+네이버 지역 검색 API는 하루 호출 한도(25,000회)가 있으므로,
+'강남역 맛집', '강남역  맛집', '강남 역 맛집'처럼 사실상 같은 검색어는
+정규화된 키로 묶어 PersistentCache(메모리 LRU + SQLite)에서 응답합니다.
+"""
+import unicodedata
+from typing import Any, Dict
+
+from ..cache import PersistentCache
+
+# 검색어 토큰 끝에서 제거할 조사.
+# '로', '도' 같은 한 글자 조사는 '세종대로', '충무로'처럼 지명의 일부이기도 해서
+# 제거하면 다른 장소의 검색어와 캐시 키가 같아지므로 두 글자 조사만 제거합니다.
+MULTI_CHAR_PARTICLES = ("에서", "으로", "에게", "까지", "부터", "이랑", "하고")
+
+PLACE_CACHE_TTL = 60 * 60 * 6
+PLACE_CACHE_NEGATIVE_TTL = 60 * 30
+# 호출 한도에 걸렸을 때 만료된 결과로 응답할 수 있는 기간
+PLACE_CACHE_STALE_TTL = 60 * 60 * 24 * 7
+
+place_cache = PersistentCache(
+    "naver_place",
+    maxsize=2048,
+    ttl=PLACE_CACHE_TTL,
+    negative_ttl=PLACE_CACHE_NEGATIVE_TTL,
+    stale_ttl=PLACE_CACHE_STALE_TTL,
+)
+# 캐시 적중(호출 한도에 걸려 만료된 캐시로 응답한 경우 포함)으로 호출하지 않은 네이버 API 요청 수
+place_cache_stats: Dict[str, int] = {"quota_saved": 0}
+
+
+def _strip_particle(token: str) -> str:
+    for particle in MULTI_CHAR_PARTICLES:
+        if token.endswith(particle) and len(token) > len(particle) + 1:
+            return token[: -len(particle)]
+    return token
+
+
+def normalize_place_query(query: str) -> str:
+    """검색어를 캐시 키용으로 정규화합니다.
+
+    유니코드 NFC 정규화, 대소문자 통일, 토큰별 조사 제거 후 공백 없이 이어 붙여
+    '강남역 맛집', '강남 역 맛집', '강남역에서 맛집'이 같은 키가 되도록 합니다.
+    ('세종대로 맛집'과 '세종대 맛집'은 서로 다른 키)
+
+    Args:
+        query (str): 원본 검색어
+    Returns:
+        str: 정규화된 검색어
+    """
+    query = unicodedata.normalize("NFC", query or "").casefold()
+    return "".join(_strip_particle(token) for token in query.split())
+
+
+def place_cache_key(query: str, display: int, start: int, sort: str) -> str:
+    """페이지 단위 검색 요청의 캐시 키를 만듭니다."""
+    return f"{normalize_place_query(query)}|{display}|{start}|{sort}"
+
+
+def get_place_cache_stats() -> Dict[str, Any]:
+    """장소 검색 캐시의 적중/미적중 수와 절약한 API 호출 수를 반환합니다."""
+    return {
+        **place_cache.stats,
+        **place_cache_stats,
+        "hit_rate": round(place_cache.hit_rate(), 4),
+    }
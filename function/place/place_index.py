@@ -0,0 +1,297 @@
+"""조회한 장소를 모아 두는 로컬 공간 색인 모듈.
+
+네이버 지역 검색(mapx/mapy), 한국관광공사 TourAPI, 한국문화정보원(KCIS) 응답의 좌표를
+버리지 않고 프로세스 안에 누적하여, 같은 동네에 대한 반복 질의를 API 호출 없이 처리합니다.
+
+- 좌표는 array('d') 두 개에 연속으로 저장하고, 레코드는 같은 행 번호의 리스트에 저장합니다.
+- 행 번호는 geohash(정밀도 6, 약 1.2km × 0.6km) 버킷으로 묶어,
+  반경 질의는 질의 영역과 겹치는 버킷만 검사합니다.
+- 같은 출처의 같은 장소(source_api_id, source_data_id)는 최신 응답으로 덮어씁니다.
+- 색인한 지 PLACE_INDEX_TTL이 지난 장소는 질의에서 제외하고, 장소 수가 PLACE_INDEX_MAX_SIZE를 넘으면
+  만료된 장소와 오래된 장소부터 정리하여 프로세스 메모리가 계속 늘지 않게 합니다.
+"""
+import math
+import re
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+NAVER_SOURCE_API_ID = "naver_local"
+# 네이버 지역 검색의 mapx/mapy는 WGS84 경위도에 10^7을 곱한 정수입니다.
+NAVER_COORD_SCALE = 1e7
+
+GEOHASH_PRECISION = 6
+EARTH_RADIUS_M = 6_371_000.0
+# nearest() 가 반경을 넓혀 가며 찾을 때의 시작/최대 반경
+NEAREST_START_RADIUS_M = 500.0
+NEAREST_MAX_RADIUS_M = 50_000.0
+# 색인한 장소를 질의에 사용하는 기간(초)과 최대 장소 수
+PLACE_INDEX_TTL = 60 * 60 * 6
+PLACE_INDEX_MAX_SIZE = 50_000
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """경위도를 geohash 문자열로 변환합니다."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            target[0] = mid
+        else:
+            target[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """geohash 셀 하나의 (위도 폭, 경도 폭)을 도 단위로 반환합니다."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 좌표 사이의 대권 거리(m)를 계산합니다."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def transform_naver_to_canonical(item: Any) -> Dict[str, Any]:
+    """네이버 지역 검색 아이템(NaverPlaceItem 또는 dict)을 표준 데이터 모델로 변환합니다.
+
+    kr_tour.transform_kto_to_canonical/transform_kcis_to_canonical과 같은 필드를 사용하고,
+    네이버 상세 정보 URL은 link 필드에 추가로 담습니다.
+
+    Args:
+        item (Any): 네이버 지역 검색 결과 아이템
+    Returns:
+        Dict[str, Any]: 표준 데이터 모델 딕셔너리
+    """
+    if not isinstance(item, dict):
+        item = item.model_dump()
+    category = item.get("category", "")
+    return {
+        "canonical_name": re.sub(r"<[^>]+>", "", item.get("title", "")),
+        "category": category.split(">")[-1],
+        "sub_category": category,
+        "address_full": item.get("roadAddress") or item.get("address", ""),
+        "geo_lat": int(item.get("mapy") or 0) / NAVER_COORD_SCALE,
+        "geo_lon": int(item.get("mapx") or 0) / NAVER_COORD_SCALE,
+        "description_main": item.get("description", ""),
+        "image_url": "",
+        "contact_info": "",
+        "operating_hours": "",
+        "fee_info": "",
+        "source_api_id": NAVER_SOURCE_API_ID,
+        "source_data_id": item.get("link") or item.get("roadAddress") or item.get("title", ""),
+        "link": item.get("link", ""),
+    }
+
+
+class PlaceIndex:
+    """geohash 버킷으로 색인한 장소 저장소. (스레드 안전)
+
+    Args:
+        precision (int): geohash 정밀도
+        ttl (Optional[float]): 장소를 질의에 사용하는 기간(초). None이면 만료 없음
+        max_size (int): 보관할 최대 장소 수
+    """
+
+    def __init__(
+        self,
+        precision: int = GEOHASH_PRECISION,
+        ttl: Optional[float] = PLACE_INDEX_TTL,
+        max_size: int = PLACE_INDEX_MAX_SIZE,
+    ) -> None:
+        self.precision = precision
+        self.ttl = ttl
+        self.max_size = max_size
+        self._cell_lat, self._cell_lon = _cell_size(precision)
+        self._lats = array("d")
+        self._lons = array("d")
+        self._added_at = array("d")
+        self._records: List[Dict[str, Any]] = []
+        self._cells: List[str] = []
+        self._buckets: Dict[str, List[int]] = {}
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """표준 데이터 모델 레코드를 색인에 추가하거나 갱신합니다.
+
+        Args:
+            record (Dict[str, Any]): geo_lat/geo_lon을 가진 레코드
+        Returns:
+            bool: 색인했으면 True, 좌표가 없어 건너뛰었으면 False
+        """
+        try:
+            latitude, longitude = float(record.get("geo_lat") or 0), float(record.get("geo_lon") or 0)
+        except (TypeError, ValueError):
+            return False
+        if not latitude or not longitude or not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            return False
+
+        cell = geohash_encode(latitude, longitude, self.precision)
+        source_key = (str(record.get("source_api_id", "")), str(record.get("source_data_id", "")))
+        now = time.time()
+        with self._lock:
+            row = self._rows.get(source_key) if source_key[1] else None
+            if row is None:
+                if len(self._records) >= self.max_size:
+                    self._compact(now)
+                row = len(self._records)
+                self._lats.append(latitude)
+                self._lons.append(longitude)
+                self._added_at.append(now)
+                self._records.append(record)
+                self._cells.append(cell)
+                if source_key[1]:
+                    self._rows[source_key] = row
+            else:
+                self._lats[row], self._lons[row] = latitude, longitude
+                self._added_at[row] = now
+                self._records[row] = record
+                if self._cells[row] != cell:
+                    self._buckets[self._cells[row]].remove(row)
+                    self._cells[row] = cell
+                else:
+                    return True
+            self._buckets.setdefault(cell, []).append(row)
+        return True
+
+    def _compact(self, now: float) -> None:
+        """만료된 장소를 지우고, 그래도 많으면 오래된 장소부터 지워 max_size의 3/4만 남깁니다. (잠금 안에서 호출)"""
+        rows = [
+            row for row in range(len(self._records))
+            if self.ttl is None or now - self._added_at[row] <= self.ttl
+        ]
+        keep = self.max_size * 3 // 4
+        if len(rows) > keep:
+            rows = sorted(rows, key=lambda row: self._added_at[row])[-keep:]
+            rows.sort()
+        lats, lons, added_at = array("d"), array("d"), array("d")
+        records: List[Dict[str, Any]] = []
+        cells: List[str] = []
+        buckets: Dict[str, List[int]] = {}
+        source_rows: Dict[Tuple[str, str], int] = {}
+        for new_row, row in enumerate(rows):
+            record = self._records[row]
+            lats.append(self._lats[row])
+            lons.append(self._lons[row])
+            added_at.append(self._added_at[row])
+            records.append(record)
+            cells.append(self._cells[row])
+            buckets.setdefault(self._cells[row], []).append(new_row)
+            source_key = (str(record.get("source_api_id", "")), str(record.get("source_data_id", "")))
+            if source_key[1]:
+                source_rows[source_key] = new_row
+        self._lats, self._lons, self._added_at = lats, lons, added_at
+        self._records, self._cells, self._buckets, self._rows = records, cells, buckets, source_rows
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """여러 레코드를 색인하고 색인한 개수를 반환합니다."""
+        return sum(self.add(record) for record in records)
+
+    def add_naver_items(self, items: Iterable[Any]) -> int:
+        """네이버 지역 검색 아이템을 색인하고 색인한 개수를 반환합니다."""
+        return self.add_many(transform_naver_to_canonical(item) for item in items)
+
+    def _cells_within(self, latitude: float, longitude: float, radius_m: float) -> List[str]:
+        d_lat = math.degrees(radius_m / EARTH_RADIUS_M)
+        d_lon = d_lat / max(math.cos(math.radians(latitude)), 1e-6)
+        cells = set()
+        lat = latitude - d_lat
+        while True:
+            lon = longitude - d_lon
+            while True:
+                cells.add(geohash_encode(max(-90.0, min(90.0, lat)), max(-180.0, min(180.0, lon)), self.precision))
+                if lon >= longitude + d_lon:
+                    break
+                lon = min(lon + self._cell_lon, longitude + d_lon)
+            if lat >= latitude + d_lat:
+                break
+            lat = min(lat + self._cell_lat, latitude + d_lat)
+        return list(cells)
+
+    # 시간복잡도: O(c + m) (c: 질의 영역과 겹치는 버킷 수, m: 그 버킷 안의 장소 수)
+    def within(
+        self, latitude: float, longitude: float, radius_m: float, category: Optional[str] = None
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """(latitude, longitude)에서 radius_m 미터 안에 있는 장소를 가까운 순으로 반환합니다.
+
+        Args:
+            latitude (float): 기준 위도
+            longitude (float): 기준 경도
+            radius_m (float): 반경(m)
+            category (Optional[str]): 지정하면 category/sub_category에 이 문자열이 포함된 장소만 반환
+        Returns:
+            List[Tuple[float, Dict[str, Any]]]: (거리(m), 레코드) 목록
+        """
+        results = []
+        expired_before = time.time() - self.ttl if self.ttl is not None else None
+        with self._lock:
+            for cell in self._cells_within(latitude, longitude, radius_m):
+                for row in self._buckets.get(cell, ()):
+                    if expired_before is not None and self._added_at[row] < expired_before:
+                        continue
+                    record = self._records[row]
+                    if category and category not in f"{record.get('category') or ''}>{record.get('sub_category') or ''}":
+                        continue
+                    distance = haversine_m(latitude, longitude, self._lats[row], self._lons[row])
+                    if distance <= radius_m:
+                        results.append((distance, record))
+        results.sort(key=lambda pair: pair[0])
+        return results
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int = 5, category: Optional[str] = None
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """가장 가까운 장소 k개를 반환합니다.
+
+        반경을 두 배씩 넓혀 가며 within()으로 찾고, 최대 반경 안에 k개가 없으면
+        최대 반경 안에서 찾은 장소만 반환합니다.
+
+        Args:
+            latitude (float): 기준 위도
+            longitude (float): 기준 경도
+            k (int): 반환할 장소 수
+            category (Optional[str]): 지정하면 category/sub_category에 이 문자열이 포함된 장소만 반환
+        Returns:
+            List[Tuple[float, Dict[str, Any]]]: (거리(m), 레코드) 목록
+        """
+        radius = NEAREST_START_RADIUS_M
+        while True:
+            results = self.within(latitude, longitude, radius, category)
+            if len(results) >= k or radius >= NEAREST_MAX_RADIUS_M:
+                return results[:k]
+            radius = min(radius * 2, NEAREST_MAX_RADIUS_M)
+
+
+_place_index: Optional[PlaceIndex] = None
+_place_index_lock = threading.Lock()
+
+
+def get_place_index() -> PlaceIndex:
+    """프로세스에서 공유하는 PlaceIndex 인스턴스를 반환합니다."""
+    global _place_index
+    with _place_index_lock:
+        if _place_index is None:
+            _place_index = PlaceIndex()
+        return _place_index
@@ -0,0 +1,212 @@
+"""여러 출처의 장소 레코드를 실제 장소 단위로 병합하는 모듈.
+
+네이버 지역 검색, 한국관광공사 TourAPI, 한국문화정보원(KCIS) 결과는 같은 장소를
+서로 다른 이름/좌표로 돌려주므로, 표준 데이터 모델로 맞춘 뒤
+좌표 거리와 정규화한 이름 유사도로 군집화하여 장소당 레코드 하나로 합칩니다.
+
+모든 쌍을 비교하지 않도록 좌표를 병합 거리 크기의 격자로 나누고(blocking)
+같은 칸과 이웃 칸의 레코드끼리만 비교하므로, 비교 횟수는 결과 수에 거의 선형입니다.
+좌표가 없는 레코드는 정규화한 이름이 같은 레코드끼리만 비교합니다.
+같은 체인의 다른 지점('스타벅스 강남역점' / '스타벅스 강남대로점')은 가까이 있어도 합치지 않습니다.
+"""
+import math
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .place_index import NAVER_SOURCE_API_ID, haversine_m
+
+# 같은 장소로 볼 최대 좌표 거리(m)와 최소 이름 유사도
+MERGE_DISTANCE_M = 150.0
+MERGE_NAME_SIMILARITY = 0.7
+# 필드 값이 여러 출처에 있을 때 우선할 출처 순서 (관광공사 > 문화정보원 > 네이버)
+SOURCE_PRIORITY = ("B551011", "B553457", NAVER_SOURCE_API_ID)
+
+_METERS_PER_DEGREE = 111_320.0
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_PAREN_PATTERN = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_place_name(name: str) -> str:
+    """장소명 비교용 정규화: HTML 태그/괄호 설명/공백/구두점을 제거하고 대소문자를 통일합니다.
+
+    Args:
+        name (str): 장소명 (예: '<b>경복궁</b> (사적 제117호)')
+    Returns:
+        str: 정규화한 장소명 (예: '경복궁')
+    """
+    name = unicodedata.normalize("NFC", _TAG_PATTERN.sub("", name or ""))
+    return _NON_WORD_PATTERN.sub("", _PAREN_PATTERN.sub("", name)).casefold()
+
+
+def _bigrams(text: str) -> List[str]:
+    return [text[i:i + 2] for i in range(len(text) - 1)] or [text]
+
+
+def name_similarity(a: str, b: str) -> float:
+    """정규화한 두 장소명의 유사도(0~1)를 계산합니다.
+
+    글자 바이그램 Dice 계수를 사용하고, 한 이름이 다른 이름에 포함되면
+    ('스타벅스' / '스타벅스강남역점') 같은 장소일 가능성이 높으므로 0.9 이상으로 봅니다.
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    grams_a, grams_b = _bigrams(a), _bigrams(b)
+    pool = list(grams_b)
+    overlap = 0
+    for gram in grams_a:
+        if gram in pool:
+            pool.remove(gram)
+            overlap += 1
+    score = 2 * overlap / (len(grams_a) + len(grams_b))
+    shorter, longer = sorted((a, b), key=len)
+    if len(shorter) >= 2 and shorter in longer:
+        score = max(score, 0.9)
+    return score
+
+
+def _name_parts(name: str) -> Tuple[str, str, str, str]:
+    """장소명을 (정규화한 이름, 브랜드, 브랜드를 뺀 나머지, 지점명)으로 나눕니다.
+
+    브랜드는 두 단어 이상인 이름의 첫 단어, 지점명은 '…점'으로 끝나는 마지막 단어입니다.
+    (예: '스타벅스 강남역점' → ('스타벅스강남역점', '스타벅스', '강남역점', '강남역점'))
+    """
+    tokens = [
+        normalize_place_name(token)
+        for token in _PAREN_PATTERN.sub("", _TAG_PATTERN.sub("", name or "")).split()
+    ]
+    tokens = [token for token in tokens if token]
+    if len(tokens) < 2:
+        return "".join(tokens), "", "", ""
+    branch = tokens[-1] if len(tokens[-1]) >= 2 and tokens[-1].endswith("점") else ""
+    return "".join(tokens), tokens[0], "".join(tokens[1:]), branch
+
+
+def names_match(a: Tuple[str, str, str, str], b: Tuple[str, str, str, str], min_similarity: float) -> bool:
+    """_name_parts로 나눈 두 장소명이 같은 장소를 가리키는지 판단합니다.
+
+    - 두 이름에 모두 지점명이 있는데 서로 다르면 같은 체인의 다른 지점이므로 다른 장소
+    - 브랜드(첫 단어)가 같으면 브랜드를 뺀 나머지끼리 비교 (브랜드만으로 유사도가 높아지지 않도록)
+    """
+    if a[3] and b[3] and a[3] != b[3]:
+        return False
+    if a[1] and a[1] == b[1]:
+        return name_similarity(a[2], b[2]) >= min_similarity
+    return name_similarity(a[0], b[0]) >= min_similarity
+
+
+def _has_point(record: Dict[str, Any]) -> bool:
+    try:
+        return bool(float(record.get("geo_lat") or 0)) and bool(float(record.get("geo_lon") or 0))
+    except (TypeError, ValueError):
+        return False
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+# 시간복잡도: O(n) 평균 (n: 레코드 수, 격자 한 칸에 모이는 레코드 수가 작다고 가정)
+def cluster_places(
+    records: List[Dict[str, Any]],
+    max_distance_m: float = MERGE_DISTANCE_M,
+    min_similarity: float = MERGE_NAME_SIMILARITY,
+) -> List[List[int]]:
+    """같은 장소로 보이는 레코드끼리 묶은 군집(레코드 인덱스 목록)을 반환합니다.
+
+    Args:
+        records (List[Dict[str, Any]]): 표준 데이터 모델 레코드 목록
+        max_distance_m (float): 같은 장소로 볼 최대 좌표 거리(m)
+        min_similarity (float): 같은 장소로 볼 최소 이름 유사도
+    Returns:
+        List[List[int]]: 입력 순서를 유지한 군집 목록
+    """
+    parts = [_name_parts(record.get("canonical_name", "")) for record in records]
+    names = [part[0] for part in parts]
+    parent = list(range(len(records)))
+
+    def union(i: int, j: int) -> None:
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    points = [i for i, record in enumerate(records) if _has_point(record)]
+    if points:
+        # 경도 1도의 길이는 위도가 높을수록 짧아지므로, 가장 높은 위도 기준으로 칸 폭을 잡아
+        # 병합 거리 안의 두 레코드가 항상 같은 칸이나 이웃 칸에 들어가도록 합니다.
+        max_lat = max(abs(float(records[i]["geo_lat"])) for i in points)
+        cell_lat = max_distance_m / _METERS_PER_DEGREE
+        cell_lon = cell_lat / max(math.cos(math.radians(min(max_lat, 89.0))), 1e-6)
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for i in points:
+            lat, lon = float(records[i]["geo_lat"]), float(records[i]["geo_lon"])
+            row, col = math.floor(lat / cell_lat), math.floor(lon / cell_lon)
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    for j in grid.get((row + d_row, col + d_col), ()):
+                        if (
+                            names_match(parts[i], parts[j], min_similarity)
+                            and haversine_m(lat, lon, float(records[j]["geo_lat"]), float(records[j]["geo_lon"])) <= max_distance_m
+                        ):
+                            union(i, j)
+            grid.setdefault((row, col), []).append(i)
+
+    by_name: Dict[str, int] = {}
+    for i, record in enumerate(records):
+        if not _has_point(record) and names[i]:
+            if names[i] in by_name:
+                union(i, by_name[names[i]])
+            else:
+                by_name[names[i]] = i
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(records)):
+        clusters.setdefault(_find(parent, i), []).append(i)
+    return list(clusters.values())
+
+
+def _source_rank(record: Dict[str, Any]) -> int:
+    source = record.get("source_api_id")
+    return SOURCE_PRIORITY.index(source) if source in SOURCE_PRIORITY else len(SOURCE_PRIORITY)
+
+
+def merge_cluster(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """한 군집의 레코드를 출처 우선순위에 따라 필드별로 채워 하나로 합칩니다.
+
+    Args:
+        records (List[Dict[str, Any]]): 같은 장소로 묶인 레코드 목록
+    Returns:
+        Dict[str, Any]: 병합한 레코드. sources에 원본 (출처, ID) 목록을 담습니다.
+    """
+    ordered = sorted(records, key=_source_rank)
+    merged: Dict[str, Any] = {}
+    for record in ordered:
+        for field, value in record.items():
+            if field in ("source_api_id", "source_data_id"):
+                continue
+            if value not in (None, "", 0, 0.0) and merged.get(field) in (None, "", 0, 0.0):
+                merged[field] = value
+            else:
+                merged.setdefault(field, value)
+    merged["sources"] = [
+        f"{record.get('source_api_id', '')}:{record.get('source_data_id', '')}" for record in ordered
+    ]
+    return merged
+
+
+def merge_places(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """여러 출처의 표준 데이터 모델 레코드를 실제 장소당 하나로 병합합니다.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): 표준 데이터 모델 레코드
+    Returns:
+        List[Dict[str, Any]]: 병합한 레코드 목록 (각 장소가 처음 나온 순서)
+    """
+    records = list(records)
+    return [merge_cluster([records[i] for i in cluster]) for cluster in cluster_places(records)]
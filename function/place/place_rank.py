@@ -0,0 +1,141 @@
+"""장소 후보 순위 모듈.
+
+API가 돌려준 순서(정확도/랜덤)는 사용자 위치나 일정 장소를 고려하지 않으므로,
+후보를 넉넉히 받아 온 뒤 좌표/카테고리/인기 신호를 NumPy 배열로 바꿔
+한 번의 벡터 연산으로 점수를 매기고 상위 k개만 LLM에 전달합니다.
+
+점수 = w_distance × 거리 점수 + w_category × 카테고리 일치 + w_review × 인기 신호
+- 거리 점수: 기준 위치들(사용자 위치, 일정 장소) 중 가장 가까운 곳까지의 거리 d에 대해 exp(-d / DISTANCE_SCALE_M)
+- 카테고리 일치: category/sub_category에 요청 카테고리가 포함되면 1
+- 인기 신호: 네이버 지역 검색은 리뷰 수를 제공하지 않으므로, 리뷰순(comment) 정렬 결과가 합쳐진
+  입력 순위와 같은 장소를 돌려준 출처 수(sources)를 사용합니다. review_count 필드가 있으면 함께 반영합니다.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .place_index import EARTH_RADIUS_M
+
+DISTANCE_SCALE_M = 1_000.0
+DEFAULT_WEIGHTS = {"distance": 0.6, "category": 0.25, "review": 0.15}
+
+
+def _coordinates(records: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    coords = np.array(
+        [(_to_float(record.get("geo_lat")), _to_float(record.get("geo_lon"))) for record in records],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    return coords[:, 0], coords[:, 1]
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def min_distances_m(
+    latitudes: np.ndarray, longitudes: np.ndarray, origins: Sequence[Tuple[float, float]]
+) -> np.ndarray:
+    """각 후보에서 가장 가까운 기준 위치까지의 거리(m)를 계산합니다.
+
+    Args:
+        latitudes (np.ndarray): 후보 위도 배열 (n,)
+        longitudes (np.ndarray): 후보 경도 배열 (n,)
+        origins (Sequence[Tuple[float, float]]): 기준 위치 (위도, 경도) 목록 (m개)
+    Returns:
+        np.ndarray: (n,) 거리 배열. 좌표가 없는 후보는 inf
+    """
+    if not len(origins):
+        return np.full(latitudes.shape, np.inf)
+    origin = np.radians(np.asarray(origins, dtype=np.float64))
+    phi1 = np.radians(latitudes)[:, None]
+    phi2 = origin[None, :, 0]
+    d_phi = phi2 - phi1
+    d_lambda = origin[None, :, 1] - np.radians(longitudes)[:, None]
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    distances = (2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))).min(axis=1)
+    return np.where((latitudes == 0) | (longitudes == 0), np.inf, distances)
+
+
+def score_places(
+    records: Sequence[Dict[str, Any]],
+    origins: Sequence[Tuple[float, float]] = (),
+    category: Optional[str] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """후보 전체의 점수와 기준 위치까지의 거리를 한 번에 계산합니다.
+
+    Args:
+        records (Sequence[Dict[str, Any]]): 표준 데이터 모델 레코드 (API 순서대로)
+        origins (Sequence[Tuple[float, float]]): 사용자 위치/일정 장소 좌표 목록
+        category (Optional[str]): 원하는 카테고리 (예: '카페')
+        weights (Optional[Dict[str, float]]): distance/category/review 가중치
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (점수 배열, 거리(m) 배열)
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    n = len(records)
+    latitudes, longitudes = _coordinates(records)
+
+    distances = min_distances_m(latitudes, longitudes, origins)
+    distance_score = np.exp(-distances / DISTANCE_SCALE_M) if len(origins) else np.zeros(n)
+
+    if category:
+        labels = np.array([f"{r.get('category') or ''}>{r.get('sub_category') or ''}" for r in records], dtype=str)
+        category_score = (np.char.find(np.char.lower(labels), category.lower()) >= 0).astype(np.float64)
+    else:
+        category_score = np.zeros(n)
+
+    position_prior = 1.0 / (1.0 + np.arange(n, dtype=np.float64))
+    source_count = np.array([len(r.get("sources") or ()) or 1 for r in records], dtype=np.float64)
+    review_count = np.array([_to_float(r.get("review_count")) for r in records], dtype=np.float64)
+    review_score = (
+        position_prior
+        + np.minimum(source_count - 1, 2) / 2
+        + (np.log1p(review_count) / np.log1p(review_count.max()) if review_count.any() else 0.0)
+    ) / 3
+
+    scores = (
+        weights["distance"] * distance_score
+        + weights["category"] * category_score
+        + weights["review"] * review_score
+    )
+    return scores, distances
+
+
+# 시간복잡도: O(n·m + n) (n: 후보 수, m: 기준 위치 수), 상위 k개 선택은 argpartition
+def rank_places(
+    records: Sequence[Dict[str, Any]],
+    origins: Sequence[Tuple[float, float]] = (),
+    category: Optional[str] = None,
+    k: int = 5,
+    weights: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """후보를 점수순으로 정렬하여 상위 k개를 반환합니다.
+
+    Args:
+        records (Sequence[Dict[str, Any]]): 표준 데이터 모델 레코드 (API 순서대로)
+        origins (Sequence[Tuple[float, float]]): 사용자 위치/일정 장소 좌표 목록
+        category (Optional[str]): 원하는 카테고리 (예: '카페')
+        k (int): 반환할 후보 수
+        weights (Optional[Dict[str, float]]): distance/category/review 가중치
+    Returns:
+        List[Dict[str, Any]]: 상위 k개 레코드. 기준 위치가 있으면 distance_m(가장 가까운 기준 위치까지의 거리)을 추가합니다.
+    """
+    if not records or k <= 0:
+        return []
+    scores, distances = score_places(records, origins, category, weights)
+    k = min(k, len(records))
+    top = np.argpartition(-scores, k - 1)[:k]
+    # 점수가 같으면 API 순서를 유지합니다.
+    top = top[np.lexsort((top, -scores[top]))]
+
+    ranked = []
+    for i in top:
+        record = dict(records[i])
+        if np.isfinite(distances[i]):
+            record["distance_m"] = int(round(distances[i]))
+        ranked.append(record)
+    return ranked
@@ -0,0 +1,307 @@
+"""외부 API 호출 한도(rate limit / 일일 쿼터) 관리 모듈.
+
+네이버(25,000회/일), 카카오, 공공데이터포털(TourAPI/KCIS), open-meteo, Tavily,
+Binance, Google API는 모두 호출 한도가 있고, 지금까지는 429 응답이나 LLM에 전달된
+오류 문자열로 한도 초과를 알게 되었습니다. 모든 외부 호출 전에 acquire()/aacquire()를 거쳐
+한도를 넘기 전에 호출 측이 캐시 응답으로 전환할 수 있도록 합니다.
+
+- 초당 호출 수: 제공자와 API 키별 토큰 버킷. 기다려야 하면 잠시 대기하고,
+  대기 시간이 우선순위별 최대 대기 시간을 넘으면 RateLimitError를 발생시킵니다.
+- 일일 쿼터: 제공자와 API 키별 사용량을 SQLite(캐시 DB 파일의 quota_usage 테이블)에 기록하여
+  프로세스 재시작이나 여러 프로세스 사이에서도 누적됩니다. (KST 자정 기준)
+- 우선순위: 사용자 요청(interactive)과 배치/평가(batch)를 구분합니다. 배치 작업은
+  쿼터의 BATCH_QUOTA_SHARE까지만 쓰고, 토큰 버킷에도 사용자 요청 몫을 남겨 둡니다.
+  rate_limit_lane(LANE_BATCH) 블록 안의 호출은 배치로 처리됩니다.
+- 한도 소진: 사용량이 쿼터에 가까워지면 QuotaExceededError를 발생시키고,
+  호출 측은 만료된 캐시 값이 있으면 그것으로 응답합니다.
+"""
+import asyncio
+import contextvars
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+from .cache import CACHE_DB_PATH
+
+LANE_INTERACTIVE = "interactive"
+LANE_BATCH = "batch"
+
+# 우선순위별 사용할 수 있는 일일 쿼터 비율과 토큰 버킷 최대 대기 시간(초)
+INTERACTIVE_QUOTA_SHARE = 0.98
+BATCH_QUOTA_SHARE = 0.8
+MAX_WAIT_SECONDS = {LANE_INTERACTIVE: 2.0, LANE_BATCH: 60.0}
+# 배치 작업이 토큰 버킷에 남겨 두어야 하는 토큰 비율 (사용자 요청 몫)
+BATCH_BUCKET_RESERVE = 0.5
+
+KST = timezone(timedelta(hours=9))
+
+
+class ProviderLimit(NamedTuple):
+    """제공자별 호출 한도.
+
+    Attributes:
+        rate (float): 초당 허용 호출 수 (토큰 충전 속도)
+        burst (float): 한 번에 허용하는 최대 호출 수 (버킷 크기)
+        daily (Optional[int]): 일일 호출 한도. None이면 일일 쿼터를 기록하지 않음
+    """
+    rate: float
+    burst: float
+    daily: Optional[int]
+
+
+# 기본 한도. RATE_LIMIT_<PROVIDER>_DAILY 환경 변수로 일일 한도를 바꿀 수 있습니다.
+PROVIDER_LIMITS: Dict[str, ProviderLimit] = {
+    "naver": ProviderLimit(rate=10, burst=10, daily=25_000),
+    "kakao": ProviderLimit(rate=10, burst=10, daily=100_000),
+    # 공공데이터포털 개발계정 기본 트래픽 (API 키별 일 1,000회)
+    "data_go_kr": ProviderLimit(rate=5, burst=5, daily=1_000),
+    "open_meteo": ProviderLimit(rate=5, burst=10, daily=10_000),
+    "tavily": ProviderLimit(rate=2, burst=5, daily=1_000),
+    "binance": ProviderLimit(rate=20, burst=20, daily=None),
+    "google": ProviderLimit(rate=10, burst=10, daily=None),
+}
+
+
+class RateLimitError(Exception):
+    """호출 한도 때문에 외부 API를 호출할 수 없는 경우 발생합니다."""
+
+    def __init__(self, provider: str, message: str) -> None:
+        super().__init__(f"[{provider}] {message}")
+        self.provider = provider
+
+
+class QuotaExceededError(RateLimitError):
+    """일일 쿼터를 (거의) 모두 사용한 경우 발생합니다. 호출 측은 캐시 응답으로 전환합니다."""
+
+
+_lane: contextvars.ContextVar = contextvars.ContextVar("rate_limit_lane", default=LANE_INTERACTIVE)
+
+
+@contextmanager
+def rate_limit_lane(lane: str) -> Iterator[None]:
+    """블록 안의 외부 API 호출을 지정한 우선순위(LANE_INTERACTIVE/LANE_BATCH)로 처리합니다."""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def get_provider_limit(provider: str) -> ProviderLimit:
+    limit = PROVIDER_LIMITS[provider]
+    daily = os.getenv(f"RATE_LIMIT_{provider.upper()}_DAILY")
+    return limit._replace(daily=int(daily)) if daily else limit
+
+
+def key_id(api_key: Optional[str]) -> str:
+    """API 키 원문 대신 기록에 사용할 짧은 식별자를 만듭니다."""
+    if not api_key:
+        return "default"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class TokenBucket:
+    """초당 rate개씩 충전되고 최대 burst개까지 쌓이는 토큰 버킷. (스레드 안전)"""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float, reserve: float, max_wait: float) -> float:
+        """토큰을 예약하고 호출 전에 기다려야 할 시간(초)을 반환합니다.
+
+        Args:
+            cost (float): 사용할 토큰 수
+            reserve (float): 사용 후에도 남겨 두어야 할 토큰 수 (배치 작업용)
+            max_wait (float): 허용하는 최대 대기 시간(초)
+        Returns:
+            float: 대기 시간(초). 0이면 바로 호출 가능
+        Raises:
+            ValueError: 대기 시간이 max_wait를 넘는 경우 (토큰은 예약하지 않음)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            shortfall = cost + reserve - self._tokens
+            wait = max(0.0, shortfall / self.rate)
+            if wait > max_wait:
+                raise ValueError(f"{wait:.1f}초 대기 필요")
+            # 대기 중인 호출 몫까지 미리 차감하여 뒤에 온 호출은 그만큼 더 기다리게 합니다.
+            self._tokens -= cost
+            return wait
+
+    def refund(self, cost: float) -> None:
+        """예약했지만 호출하지 않게 된 토큰을 돌려줍니다. (일일 쿼터 초과로 거절된 경우 등)"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + cost)
+
+
+class QuotaLedger:
+    """제공자/API 키별 일일 사용량을 SQLite에 기록하는 장부. (프로세스 간 공유)"""
+
+    def __init__(self, db_path: str = CACHE_DB_PATH) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    provider TEXT NOT NULL,
+                    key_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    used INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (provider, key_id, day)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(KST).strftime("%Y-%m-%d")
+
+    def consume(self, provider: str, key: str, cost: int, allowed: float) -> Optional[int]:
+        """사용량을 cost만큼 늘립니다. 늘린 사용량이 allowed를 넘으면 기록하지 않고 None을 반환합니다."""
+        conn = self._connect()
+        day = self.today()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT used FROM quota_usage WHERE provider = ? AND key_id = ? AND day = ?",
+                (provider, key, day),
+            ).fetchone()
+            used = (row[0] if row else 0) + cost
+            if used > allowed:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute(
+                """
+                INSERT INTO quota_usage (provider, key_id, day, used) VALUES (?, ?, ?, ?)
+                ON CONFLICT (provider, key_id, day) DO UPDATE SET used = excluded.used
+                """,
+                (provider, key, day, used),
+            )
+            conn.execute("COMMIT")
+            return used
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def usage(self) -> Dict[Tuple[str, str], int]:
+        """오늘의 (제공자, 키 식별자)별 사용량을 반환합니다."""
+        rows = self._connect().execute(
+            "SELECT provider, key_id, used FROM quota_usage WHERE day = ?", (self.today(),)
+        ).fetchall()
+        return {(provider, key): used for provider, key, used in rows}
+
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+_ledger: Optional[QuotaLedger] = None
+
+
+def _get_ledger() -> QuotaLedger:
+    global _ledger
+    with _buckets_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
+
+
+def _get_bucket(provider: str, key: str) -> TokenBucket:
+    with _buckets_lock:
+        bucket = _buckets.get((provider, key))
+        if bucket is None:
+            limit = get_provider_limit(provider)
+            bucket = _buckets[(provider, key)] = TokenBucket(limit.rate, limit.burst)
+        return bucket
+
+
+def _reserve_tokens(provider: str, key: str, lane: str, cost: int) -> Tuple[TokenBucket, float]:
+    limit = get_provider_limit(provider)
+    reserve = limit.burst * BATCH_BUCKET_RESERVE if lane == LANE_BATCH else 0.0
+    bucket = _get_bucket(provider, key)
+    try:
+        return bucket, bucket.reserve(cost, reserve, MAX_WAIT_SECONDS.get(lane, 0.0))
+    except ValueError as e:
+        raise RateLimitError(provider, f"초당 호출 한도 초과: {e}") from None
+
+
+def _consume_quota(provider: str, key: str, lane: str, cost: int) -> None:
+    # SQLite 트랜잭션(BEGIN IMMEDIATE)을 사용하므로 비동기 호출에서는 스레드에서 실행합니다.
+    limit = get_provider_limit(provider)
+    if limit.daily is None:
+        return
+    share = BATCH_QUOTA_SHARE if lane == LANE_BATCH else INTERACTIVE_QUOTA_SHARE
+    if _get_ledger().consume(provider, key, cost, limit.daily * share) is None:
+        raise QuotaExceededError(provider, f"일일 호출 한도({limit.daily}회)의 {share:.0%}를 사용했습니다. ({lane})")
+
+
+def acquire(provider: str, api_key: Optional[str] = None, cost: int = 1) -> None:
+    """외부 API 호출 전에 한도를 확인하고, 필요하면 토큰이 충전될 때까지 기다립니다.
+
+    Args:
+        provider (str): PROVIDER_LIMITS의 제공자 이름 (예: 'naver')
+        api_key (Optional[str]): 한도가 적용되는 API 키 (키별로 따로 집계)
+        cost (int): 이번 호출이 사용하는 호출 수
+    Raises:
+        QuotaExceededError: 일일 쿼터를 (거의) 모두 사용한 경우
+        RateLimitError: 초당 호출 한도 때문에 최대 대기 시간 안에 호출할 수 없는 경우
+    """
+    lane, key = _lane.get(), key_id(api_key)
+    bucket, wait = _reserve_tokens(provider, key, lane, cost)
+    try:
+        _consume_quota(provider, key, lane, cost)
+    except BaseException:
+        # 쿼터 때문에 호출하지 못하면 예약한 토큰을 돌려주어 다른 호출의 초당 한도를 깎지 않습니다.
+        bucket.refund(cost)
+        raise
+    if wait:
+        time.sleep(wait)
+
+
+async def aacquire(provider: str, api_key: Optional[str] = None, cost: int = 1) -> None:
+    """acquire의 비동기 버전입니다. 쿼터 기록과 대기 모두 이벤트 루프를 막지 않습니다.
+
+    일일 쿼터 장부(SQLite)는 다른 프로세스가 쓰는 동안 최대 busy_timeout만큼 기다릴 수 있으므로
+    asyncio.to_thread로 실행합니다.
+    """
+    lane, key = _lane.get(), key_id(api_key)
+    bucket, wait = _reserve_tokens(provider, key, lane, cost)
+    try:
+        await asyncio.to_thread(_consume_quota, provider, key, lane, cost)
+    except BaseException:
+        bucket.refund(cost)
+        raise
+    if wait:
+        await asyncio.sleep(wait)
+
+
+def get_quota_status() -> Dict[str, Dict[str, int]]:
+    """오늘의 제공자/키별 사용량과 일일 한도를 반환합니다."""
+    status = {}
+    for (provider, key), used in _get_ledger().usage().items():
+        limit = get_provider_limit(provider) if provider in PROVIDER_LIMITS else None
+        status[f"{provider}:{key}"] = {"used": used, "daily": limit.daily if limit else None}
+    return status
@@ -5,19 +5,47 @@ from langchain_openai import ChatOpenAI
 from langchain.agents import tool, AgentExecutor, create_openai_functions_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
 
-tavily_qa_tool = TavilySearchResults(max_results=3)
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
+
+from ...rate_limit import RateLimitError, aacquire, acquire
+
+
+class RateLimitedTavilySearchResults(TavilySearchResults):
+    """호출 전에 공유 호출 한도(rate_limit.py)를 확인하는 Tavily 검색 도구."""
+
+    def _run(
+        self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None
+    ) -> Tuple[Union[List[Dict[str, str]], str], Dict]:
+        try:
+            acquire("tavily", os.getenv("TAVILY_API_KEY"))
+        except RateLimitError as e:
+            return f"검색 API 호출 한도에 걸렸습니다: {e}", {}
+        return super()._run(query, run_manager=run_manager)
+
+    async def _arun(
+        self, query: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None
+    ) -> Tuple[Union[List[Dict[str, str]], str], Dict]:
+        try:
+            await aacquire("tavily", os.getenv("TAVILY_API_KEY"))
+        except RateLimitError as e:
+            return f"검색 API 호출 한도에 걸렸습니다: {e}", {}
+        return await super()._arun(query, run_manager=run_manager)
+
+
+tavily_qa_tool = RateLimitedTavilySearchResults(max_results=3)
 tavily_qa_tool.name = "general_question_answering"
 tavily_qa_tool.description = "사용자의 일반적인 질문에 대해 웹을 검색하고 요약된 답변을 찾을 때 사용합니다."
 
-tech_search_tool = TavilySearchResults(
+tech_search_tool = RateLimitedTavilySearchResults(
     max_results=3,
     search_kwargs={"include_domains": ["techcrunch.com", "theverge.com"]}
 )
 tech_search_tool.name = "tech_news_search"
 tech_search_tool.description = "TechCrunch나 The Verge에서 최신 기술 뉴스를 검색할 때 사용합니다."
 
-find_links_tool = TavilySearchResults(
+find_links_tool = RateLimitedTavilySearchResults(
     name="find_relevant_links",
     max_results=5,
     search_kwargs={"include_answer": False}
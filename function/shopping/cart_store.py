@@ -0,0 +1,156 @@
+"""장바구니 MongoDB 저장소 모듈.
+
+호출마다 MongoClient를 새로 만들면 매번 연결 수립과 서버 탐색(server discovery)을 다시 하므로,
+프로세스 전체에서 커넥션 풀을 가진 클라이언트 하나를 공유합니다. (MongoClient는 스레드 안전)
+
+- get_mongo_client(): 공유 MongoClient (처음 생성할 때 예전 문서를 정리하고 장바구니 인덱스를 함께 만듦)
+- upsert_cart_items(): (user_id, product_url) 기준 bulk upsert로 같은 상품을 여러 번 담아도 한 건만 유지
+"""
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from pymongo import ASCENDING, MongoClient, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+from pymongo.results import BulkWriteResult
+
+load_dotenv()
+MONGODB_URI = os.getenv("MONGODB_URI")
+CART_DB_NAME = "shopping"
+CART_COLLECTION_NAME = "cart"
+# 상품별 최근 가격과 가격 이력 (price_tracker가 갱신)
+PRICE_WATCH_COLLECTION_NAME = "price_watch"
+# 사용자 구분 정보가 없을 때 사용하는 장바구니 소유자
+DEFAULT_CART_USER = os.getenv("SHOPPING_USER_ID", "default")
+MONGO_MAX_POOL_SIZE = 20
+MONGO_SERVER_SELECTION_TIMEOUT_MS = 5000
+
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+
+
+def ensure_cart_indexes(collection: Collection) -> None:
+    """장바구니 컬렉션의 인덱스를 만듭니다. (이미 있으면 아무 일도 하지 않음)
+
+    - (user_id, product_url) 유니크 인덱스: URL이 있는 상품의 중복 저장 방지
+    - (user_id, product_name) 인덱스: URL이 없는 상품을 이름으로 찾을 때 사용
+    """
+    collection.create_index(
+        [("user_id", ASCENDING), ("product_url", ASCENDING)],
+        name="user_product_url",
+        unique=True,
+        partialFilterExpression={"product_url": {"$gt": ""}},
+    )
+    collection.create_index([("user_id", ASCENDING), ("product_name", ASCENDING)], name="user_product_name")
+
+
+def backfill_legacy_cart_items(collection: Collection) -> Dict[str, int]:
+    """user_id 없이 저장된 예전 장바구니 문서를 DEFAULT_CART_USER의 것으로 옮기고 중복 상품을 정리합니다.
+
+    insert_many로 저장하던 때의 문서는 user_id가 없고 같은 상품이 여러 번 들어 있을 수 있어
+    그대로는 (user_id, product_url) 유니크 인덱스를 만들 수 없습니다.
+    같은 상품은 가장 최근에 갱신(없으면 저장)된 문서 하나만 남깁니다. 여러 번 실행해도 결과는 같습니다.
+
+    Returns:
+        Dict[str, int]: {"backfilled": user_id를 채운 문서 수, "removed": 삭제한 중복 문서 수}
+    """
+    backfilled = collection.update_many(
+        {"user_id": {"$exists": False}}, {"$set": {"user_id": DEFAULT_CART_USER}}
+    ).modified_count
+    pipeline = [
+        {"$sort": {"updated_at": -1, "_id": -1}},
+        {"$group": {
+            "_id": {
+                "user_id": "$user_id",
+                "product_url": "$product_url",
+                "product_name": {"$cond": [{"$gt": ["$product_url", ""]}, "", "$product_name"]},
+            },
+            "ids": {"$push": "$_id"},
+        }},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]
+    duplicate_ids = [doc_id for group in collection.aggregate(pipeline) for doc_id in group["ids"][1:]]
+    removed = collection.delete_many({"_id": {"$in": duplicate_ids}}).deleted_count if duplicate_ids else 0
+    return {"backfilled": backfilled, "removed": removed}
+
+
+def _prepare_cart_collection(collection: Collection) -> None:
+    # 인덱스를 만들지 못해도 클라이언트는 그대로 사용합니다. (다음 호출마다 클라이언트를 새로 만들지 않도록)
+    try:
+        if collection.find_one({"user_id": {"$exists": False}}, {"_id": 1}) is not None:
+            print(f"[CART] 예전 장바구니 문서 정리: {backfill_legacy_cart_items(collection)}")
+        ensure_cart_indexes(collection)
+    except PyMongoError as e:
+        print(f"[CART] 장바구니 인덱스 생성 실패: {e!r}")
+
+
+def get_mongo_client() -> MongoClient:
+    """프로세스에서 공유하는 MongoClient를 반환합니다. (스레드 안전)
+
+    Raises:
+        ValueError: MONGODB_URI가 설정되지 않은 경우
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            if not MONGODB_URI:
+                raise ValueError("데이터베이스 연결 정보(MONGODB_URI)가 설정되지 않았습니다.")
+            _client = MongoClient(
+                MONGODB_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            )
+            _prepare_cart_collection(_client[CART_DB_NAME][CART_COLLECTION_NAME])
+        return _client
+
+
+def get_cart_collection() -> Collection:
+    return get_mongo_client()[CART_DB_NAME][CART_COLLECTION_NAME]
+
+
+def get_price_watch_collection() -> Collection:
+    return get_mongo_client()[CART_DB_NAME][PRICE_WATCH_COLLECTION_NAME]
+
+
+def cart_product_key(item: Dict[str, Any]) -> str:
+    """장바구니 상품을 사용자와 관계없이 구분하는 키 (URL, 없으면 상품명)"""
+    return item.get("product_url") or f"name:{item.get('product_name', '')}"
+
+
+def _cart_filter(user_id: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    if item.get("product_url"):
+        return {"user_id": user_id, "product_url": item["product_url"]}
+    return {"user_id": user_id, "product_url": "", "product_name": item.get("product_name", "")}
+
+
+# 시간복잡도: 상품 수와 관계없이 서버 왕복 1회 (bulk_write)
+def upsert_cart_items(items: List[Dict[str, Any]], user_id: str = DEFAULT_CART_USER) -> BulkWriteResult:
+    """상품 목록을 사용자의 장바구니에 한 번의 bulk upsert로 저장합니다.
+
+    URL이 같은 상품은 새로 추가하지 않고 이름/가격과 updated_at만 갱신합니다.
+    URL이 없는 상품은 상품명으로 같은 상품을 판단합니다.
+
+    Args:
+        items (List[Dict[str, Any]]): product_name, product_url, price를 담은 상품 목록
+        user_id (str): 장바구니 소유자
+    Returns:
+        BulkWriteResult: upserted_count(새로 담긴 수), matched_count(이미 있던 수)
+    """
+    # 같은 요청 안의 중복 상품은 마지막 값만 남깁니다. (unordered upsert끼리 키가 겹치지 않도록)
+    unique_items = {tuple(_cart_filter(user_id, item).items()): item for item in items}
+    now = datetime.now(timezone.utc)
+    operations = [
+        UpdateOne(
+            dict(key),
+            {
+                "$set": {**item, "user_id": user_id, "updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
+        for key, item in unique_items.items()
+    ]
+    return get_cart_collection().bulk_write(operations, ordered=False)
@@ -0,0 +1,162 @@
+"""네이버 쇼핑 검색 모듈.
+
+쇼핑 검색 응답(shop.json)에는 <b> 태그가 섞인 상품명과 이미지, 카테고리, 브랜드 등
+LLM이 상품을 고르는 데 쓰지 않는 필드가 많아 그대로 넘기면 토큰 대부분을 차지합니다.
+응답을 SHOPPING_RESULT_FIELDS와 필터용 필드(SHOPPING_FILTER_FIELDS)만 남긴 형태로 줄이고,
+정규화한 검색어를 키로 PersistentCache(메모리 LRU + SQLite)에 짧게 캐시합니다.
+요청은 공유 AsyncClient로 보냅니다. 필터용 필드는 shopping_filter에서만 쓰고 LLM에는 넘기지 않습니다.
+"""
+import asyncio
+import html
+import math
+import os
+import re
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+from ..cache import MISSING, PersistentCache, normalize_key
+from ..http_client import get_async_client
+from ..rate_limit import RateLimitError, aacquire
+
+load_dotenv()
+
+NAVER_CLIENT_ID: str = os.getenv("NAVER_CLIENT_ID", "")
+NAVER_CLIENT_SECRET: str = os.getenv("NAVER_CLIENT_SECRET", "")
+NAVER_SHOP_URL = "https://openapi.naver.com/v1/search/shop.json"
+
+# LLM에 전달하는 상품 필드
+SHOPPING_RESULT_FIELDS = ("title", "lprice", "mallName", "productId", "link")
+# 가격/브랜드/카테고리 필터에만 사용하는 필드 (category는 category1~4를 '>'로 이은 값)
+SHOPPING_FILTER_FIELDS = ("brand", "maker", "category")
+# 쇼핑 검색 API의 페이지당 최대 결과 수와 필터링용으로 한 번에 모을 최대 후보 수
+SHOPPING_PAGE_SIZE = 100
+SHOPPING_MAX_CANDIDATES = 300
+# 필터/정렬 조건이 없을 때 중복 제거용으로 받아 올 후보 수 (API 호출 1회)
+SHOPPING_DEFAULT_CANDIDATES = 20
+
+# 가격은 자주 바뀌므로 짧게 캐시합니다.
+SHOPPING_CACHE_TTL = 60 * 10
+SHOPPING_CACHE_NEGATIVE_TTL = 60 * 5
+# 호출 한도에 걸렸을 때 만료된 결과로 응답할 수 있는 기간
+SHOPPING_CACHE_STALE_TTL = 60 * 60 * 24
+
+shopping_cache = PersistentCache(
+    "naver_shopping",
+    maxsize=1024,
+    ttl=SHOPPING_CACHE_TTL,
+    negative_ttl=SHOPPING_CACHE_NEGATIVE_TTL,
+    stale_ttl=SHOPPING_CACHE_STALE_TTL,
+)
+# 캐시 적중(호출 한도에 걸려 만료된 캐시로 응답한 경우 포함)으로 호출하지 않은 네이버 API 요청 수
+shopping_cache_stats: Dict[str, int] = {"quota_saved": 0}
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+def strip_html(text: Any) -> str:
+    """<b> 등 HTML 태그를 제거하고 &amp; 같은 엔티티를 되돌립니다."""
+    return html.unescape(_TAG_PATTERN.sub("", str(text or ""))).strip()
+
+
+def slim_shopping_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """쇼핑 검색 결과 아이템에서 SHOPPING_RESULT_FIELDS와 SHOPPING_FILTER_FIELDS만 남깁니다."""
+    slim = {field: strip_html(item.get(field)) for field in SHOPPING_RESULT_FIELDS}
+    slim["brand"] = strip_html(item.get("brand"))
+    slim["maker"] = strip_html(item.get("maker"))
+    slim["category"] = ">".join(
+        filter(None, (item.get(f"category{level}") for level in range(1, 5)))
+    )
+    return slim
+
+
+def shopping_cache_key(query: str, display: int, start: int, sort: str, filter: str) -> str:
+    """쇼핑 검색 요청의 캐시 키를 만듭니다. ('보온 텀블러'와 ' 보온텀블러'는 같은 키)"""
+    return f"{normalize_key(query)}|{display}|{start}|{sort}|{filter}"
+
+
+def get_shopping_cache_stats() -> Dict[str, Any]:
+    """쇼핑 검색 캐시의 적중/미적중 수와 절약한 API 호출 수를 반환합니다."""
+    return {
+        **shopping_cache.stats,
+        **shopping_cache_stats,
+        "hit_rate": round(shopping_cache.hit_rate(), 4),
+    }
+
+
+# 시간복잡도: 캐시 적중 시 O(1), 미적중 시 단일 HTTP 요청
+async def search_naver_shopping(
+    query: str, display: int = 5, start: int = 1, sort: str = "sim", filter: str = "naverpay"
+) -> Dict[str, Any]:
+    """네이버 쇼핑 검색 API를 호출하여 필드를 줄인 결과를 반환합니다.
+
+    Args:
+        query (str): 검색어
+        display (int): 페이지당 결과 수 (최대 100)
+        start (int): 시작 위치 (최대 1000)
+        sort (str): 정렬 기준 (sim: 정확도순, date: 날짜순, asc/dsc: 가격 오름/내림차순)
+        filter (str): 결과 필터 (예: 'naverpay'). 빈 문자열이면 필터 없음
+    Returns:
+        Dict[str, Any]: {"total": 전체 결과 수, "start": 시작 위치, "items": slim_shopping_item 목록}
+    Raises:
+        httpx.HTTPStatusError: 네이버 API 호출 실패 시
+        RateLimitError: 호출 한도에 걸렸고 만료된 캐시도 없는 경우
+    """
+    key = shopping_cache_key(query, display, start, sort, filter)
+    cached = shopping_cache.get(key)
+    if cached is not MISSING:
+        shopping_cache_stats["quota_saved"] += 1
+        return cached
+
+    try:
+        await aacquire("naver", NAVER_CLIENT_ID)
+    except RateLimitError as e:
+        # 호출 한도에 걸리면 만료된 캐시라도 있으면 그것으로 응답합니다.
+        cached, _ = shopping_cache.get_stale(key)
+        if cached is MISSING or cached is None:
+            raise
+        print(f"naver shopping search: {e}, 만료된 캐시로 응답")
+        shopping_cache_stats["quota_saved"] += 1
+        return cached
+
+    headers = {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
+    }
+    params = {"query": query, "display": display, "start": start, "sort": sort}
+    if filter:
+        params["filter"] = filter
+    response = await get_async_client().get(NAVER_SHOP_URL, headers=headers, params=params)
+    response.raise_for_status()
+    data = response.json()
+
+    result = {
+        "total": data.get("total", 0),
+        "start": start,
+        "items": [slim_shopping_item(item) for item in data.get("items", [])],
+    }
+    # 결과가 없는 검색어는 음수 캐싱과 같은 짧은 TTL로 저장합니다.
+    shopping_cache.set(key, result, ttl=None if result["items"] else SHOPPING_CACHE_NEGATIVE_TTL)
+    return result
+
+
+async def fetch_shopping_candidates(query: str, limit: int = SHOPPING_PAGE_SIZE, filter: str = "naverpay") -> List[Dict[str, Any]]:
+    """limit개의 후보를 모으는 데 필요한 페이지(start)를 동시에 요청하여 검색 순위대로 이어 붙입니다.
+
+    Args:
+        query (str): 검색어
+        limit (int): 모을 후보 수 (최대 SHOPPING_MAX_CANDIDATES)
+        filter (str): 결과 필터 (예: 'naverpay')
+    Returns:
+        List[Dict[str, Any]]: slim_shopping_item 목록 (정확도순)
+    Raises:
+        httpx.HTTPStatusError: 네이버 API 호출 실패 시
+        RateLimitError: 호출 한도에 걸렸고 만료된 캐시도 없는 경우
+    """
+    limit = max(1, min(limit, SHOPPING_MAX_CANDIDATES))
+    display = min(limit, SHOPPING_PAGE_SIZE)
+    starts = range(1, limit + 1, display)[: math.ceil(limit / display)]
+    pages = await asyncio.gather(
+        *(search_naver_shopping(query, display=display, start=start, sort="sim", filter=filter) for start in starts)
+    )
+    return [item for page in pages for item in page["items"]]
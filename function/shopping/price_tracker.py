@@ -0,0 +1,216 @@
+"""장바구니 상품 가격 추적 모듈.
+
+장바구니에 담을 때 저장한 가격은 곧 바뀌므로, 주기적으로 실행되는 작업이
+장바구니의 모든 상품을 한 번에 읽어 가격을 다시 조회하고 price_watch 컬렉션에 기록합니다.
+'장바구니 상품 가격 변동 알려줘' 같은 질문은 get_cart_price_changes로 미리 계산된 값을 읽어
+외부 API 호출 없이 답합니다.
+
+- 상품 목록: cart 컬렉션을 상품 키(URL, 없으면 상품명)로 묶는 aggregate 한 번으로 조회
+- 가격 조회: 상품명으로 쇼핑 검색을 동시에(PRICE_REFRESH_CONCURRENCY개씩) 호출하되,
+  rate_limit_lane(LANE_BATCH)으로 사용자 요청에 쿼터와 토큰을 양보
+- 기록: price_watch에 상품별 최근 가격/직전 가격(마지막으로 달랐던 가격)/최저가와
+  가격이 바뀐 시점의 최근 PRICE_HISTORY_LENGTH건 이력을 bulk upsert,
+  cart 문서에는 current_price와 price_dropped를 함께 갱신
+
+실행: python -m function.shopping.price_tracker (--once: 한 번만 갱신)
+"""
+import asyncio
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateMany, UpdateOne
+
+from ..rate_limit import LANE_BATCH, RateLimitError, rate_limit_lane
+from .cart_store import DEFAULT_CART_USER, cart_product_key, get_cart_collection, get_price_watch_collection
+from .naver_shopping import fetch_shopping_candidates
+from .shopping_filter import parse_prices, summarize_prices
+
+# 동시에 가격을 조회할 상품 수
+PRICE_REFRESH_CONCURRENCY = 4
+# 상품 하나의 가격을 찾을 때 받아 올 검색 후보 수 (API 호출 1회)
+PRICE_REFRESH_CANDIDATES = 40
+# price_watch에 남길 가격 이력 건수
+PRICE_HISTORY_LENGTH = 30
+# 주기 실행 간격(초)
+PRICE_REFRESH_INTERVAL = 60 * 60 * 6
+
+
+def load_cart_products() -> List[Dict[str, Any]]:
+    """장바구니의 서로 다른 상품을 한 번의 aggregate로 읽어 옵니다.
+
+    Returns:
+        List[Dict[str, Any]]: key, product_name, product_url, cart_price(담을 때 가격 중 가장 최근 값)
+    """
+    pipeline = [
+        {"$sort": {"updated_at": -1}},
+        {"$group": {
+            "_id": {"$cond": [
+                {"$gt": ["$product_url", ""]}, "$product_url", {"$concat": ["name:", "$product_name"]},
+            ]},
+            "product_name": {"$first": "$product_name"},
+            "product_url": {"$first": "$product_url"},
+            "cart_price": {"$first": "$price"},
+        }},
+    ]
+    return [
+        {**{k: v for k, v in doc.items() if k != "_id"}, "key": doc["_id"]}
+        for doc in get_cart_collection().aggregate(pipeline)
+    ]
+
+
+def _match_price(product: Dict[str, Any], items: List[Dict[str, Any]]) -> Optional[int]:
+    # 담은 상품과 링크가 같은 검색 결과가 있으면 그 가격, 없으면 상품명이 일치하는 상품의 최저가
+    url = product.get("product_url")
+    if url:
+        for item in items:
+            if item.get("link") == url or (item.get("productId") and item["productId"] in url):
+                price = int(parse_prices([item.get("lprice")])[0])
+                if price:
+                    return price
+    return summarize_prices(product.get("product_name", ""), items).get("lowest_price")
+
+
+async def _lookup_price(product: Dict[str, Any], semaphore: asyncio.Semaphore) -> Optional[int]:
+    async with semaphore:
+        with rate_limit_lane(LANE_BATCH):
+            items = await fetch_shopping_candidates(product["product_name"], PRICE_REFRESH_CANDIDATES)
+    return _match_price(product, items)
+
+
+def _price_updates(
+    product: Dict[str, Any], price: int, previous: Optional[Dict[str, Any]], now: datetime
+) -> Dict[str, Any]:
+    if previous and previous.get("last_price") == price:
+        # 가격이 그대로면 직전 변동 정보(price_dropped 등)를 유지하고 확인 시각만 갱신합니다.
+        return {"checked_at": now}
+    if previous and previous.get("last_price"):
+        previous_price = previous["last_price"]
+        lowest_price = min(previous.get("lowest_price") or price, price)
+    else:
+        # 첫 조회는 장바구니에 담을 때의 가격과 비교합니다.
+        previous_price = int(parse_prices([product.get("cart_price")])[0]) or price
+        lowest_price = min(previous_price, price)
+    change = price - previous_price
+    return {
+        "product_name": product["product_name"],
+        "product_url": product.get("product_url", ""),
+        "last_price": price,
+        "previous_price": previous_price,
+        "lowest_price": lowest_price,
+        "change": change,
+        "change_pct": round(change / previous_price * 100, 1) if previous_price else 0.0,
+        "price_dropped": change < 0,
+        "checked_at": now,
+    }
+
+
+async def refresh_cart_prices() -> Dict[str, int]:
+    """장바구니의 모든 상품 가격을 다시 조회하여 price_watch와 cart에 기록합니다.
+
+    Returns:
+        Dict[str, int]: {"products": 상품 수, "updated": 가격을 갱신한 수, "dropped": 가격이 내린 수, "failed": 조회 실패 수}
+    """
+    products = await asyncio.to_thread(load_cart_products)
+    if not products:
+        return {"products": 0, "updated": 0, "dropped": 0, "failed": 0}
+    watch = get_price_watch_collection()
+    previous = {
+        doc["_id"]: doc
+        for doc in await asyncio.to_thread(
+            lambda: list(watch.find({"_id": {"$in": [p["key"] for p in products]}}, {"history": 0}))
+        )
+    }
+
+    semaphore = asyncio.Semaphore(PRICE_REFRESH_CONCURRENCY)
+    prices = await asyncio.gather(
+        *(_lookup_price(product, semaphore) for product in products), return_exceptions=True
+    )
+
+    now = datetime.now(timezone.utc)
+    watch_ops, cart_ops = [], []
+    stats = {"products": len(products), "updated": 0, "dropped": 0, "failed": 0}
+    for product, price in zip(products, prices):
+        if isinstance(price, Exception) or not price:
+            if isinstance(price, Exception) and not isinstance(price, RateLimitError):
+                print(f"[PRICE] 가격 조회 실패({product['product_name']}): {price!r}")
+            stats["failed"] += 1
+            continue
+        updates = _price_updates(product, price, previous.get(product["key"]), now)
+        price_dropped = updates.get("price_dropped", previous.get(product["key"], {}).get("price_dropped", False))
+        watch_update: Dict[str, Any] = {"$set": updates}
+        if "last_price" in updates:
+            # 이력은 가격이 바뀐 시점만 남깁니다.
+            watch_update["$push"] = {
+                "history": {"$each": [{"at": now, "price": price}], "$slice": -PRICE_HISTORY_LENGTH}
+            }
+        watch_ops.append(UpdateOne({"_id": product["key"]}, watch_update, upsert=True))
+        cart_filter = (
+            {"product_url": product["product_url"]} if product.get("product_url")
+            else {"product_url": "", "product_name": product["product_name"]}
+        )
+        cart_ops.append(UpdateMany(cart_filter, {"$set": {
+            "current_price": price, "price_dropped": price_dropped, "price_checked_at": now,
+        }}))
+        stats["updated"] += 1
+        stats["dropped"] += int(updates.get("price_dropped", False))
+
+    if watch_ops:
+        await asyncio.to_thread(watch.bulk_write, watch_ops, ordered=False)
+        await asyncio.to_thread(get_cart_collection().bulk_write, cart_ops, ordered=False)
+    return stats
+
+
+def get_cart_price_changes(user_id: str = DEFAULT_CART_USER) -> List[Dict[str, Any]]:
+    """사용자 장바구니 상품의 최근 가격 변동을 미리 기록된 값으로 반환합니다. (외부 API 호출 없음)
+
+    Args:
+        user_id (str): 장바구니 소유자
+    Returns:
+        List[Dict[str, Any]]: 상품별 product_name, cart_price, last_price, previous_price, lowest_price,
+            change(직전 가격 대비), change_pct, price_dropped, change_since_added(담을 때 가격 대비), checked_at.
+            가격이 내린 상품이 앞에 옵니다.
+    """
+    cart_items = list(get_cart_collection().find(
+        {"user_id": user_id}, {"_id": 0, "product_name": 1, "product_url": 1, "price": 1}
+    ))
+    keys = [cart_product_key(item) for item in cart_items]
+    watched = {
+        doc["_id"]: doc
+        for doc in get_price_watch_collection().find({"_id": {"$in": keys}}, {"history": 0})
+    }
+    changes = []
+    for key, item in zip(keys, cart_items):
+        doc = watched.get(key)
+        row = {"product_name": item.get("product_name", ""), "cart_price": item.get("price", "")}
+        if doc:
+            row.update({
+                field: doc.get(field)
+                for field in ("last_price", "previous_price", "lowest_price", "change", "change_pct", "price_dropped")
+            })
+            cart_price = int(parse_prices([item.get("price")])[0])
+            if cart_price and doc.get("last_price"):
+                row["change_since_added"] = doc["last_price"] - cart_price
+            row["checked_at"] = doc["checked_at"].isoformat() if doc.get("checked_at") else None
+        else:
+            row["message"] = "아직 가격을 확인하지 않은 상품입니다."
+        changes.append(row)
+    changes.sort(key=lambda row: row.get("change") if row.get("change") is not None else 0)
+    return changes
+
+
+async def run_price_refresh_worker(interval: float = PRICE_REFRESH_INTERVAL) -> None:
+    """interval초마다 refresh_cart_prices를 실행합니다. 한 번의 실패가 작업 전체를 멈추지 않도록 예외는 기록만 합니다."""
+    while True:
+        try:
+            print(f"[PRICE] 가격 갱신 완료: {await refresh_cart_prices()}")
+        except Exception as e:
+            print(f"[PRICE] 가격 갱신 실패: {e!r}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    if "--once" in sys.argv[1:]:
+        print(f"[PRICE] 가격 갱신 완료: {asyncio.run(refresh_cart_prices())}")
+    else:
+        asyncio.run(run_price_refresh_worker())
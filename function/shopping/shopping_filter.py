@@ -0,0 +1,193 @@
+"""쇼핑 검색 결과 후처리 모듈.
+
+'3만원 이하 텀블러', '가성비 좋은' 같은 조건을 LLM이 결과를 읽으며 적용하지 않도록,
+여러 페이지에서 넉넉히 받아 온 후보를 NumPy 배열로 바꿔 한 번의 벡터 연산으로
+가격 범위/브랜드/카테고리 필터, 중복 제거, 정렬을 처리합니다.
+
+- 가격: lprice 문자열('45000', '45,000원')을 정수로 변환. 가격이 없는 상품은 0
+- 중복 제거: productId가 같거나 정규화한 상품명이 같은 상품을 하나로 묶고,
+  묶음에서 가장 싼 상품을 남기며 판매처 수(mall_count)를 함께 반환
+- 정렬: relevance(검색 순위), price_asc, price_desc, value(가성비: 검색 순위와 가격의 가중합)
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+SORT_OPTIONS = ("relevance", "price_asc", "price_desc", "value")
+# value 정렬에서 가격 점수의 가중치 (나머지는 검색 순위)
+VALUE_PRICE_WEIGHT = 0.5
+
+_NON_DIGIT = re.compile(r"[^\d]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def parse_prices(values: Sequence[Any]) -> np.ndarray:
+    """가격 문자열 목록을 정수 배열로 변환합니다. 숫자가 없으면 0."""
+    digits = [_NON_DIGIT.sub("", str(value or "")) for value in values]
+    return np.array([int(d) if d else 0 for d in digits], dtype=np.int64)
+
+
+def normalize_title(title: str) -> str:
+    """판매처마다 다른 띄어쓰기/기호를 없앤 상품명 비교 키를 만듭니다."""
+    return _NON_WORD.sub("", (title or "").casefold())
+
+
+def _contains(labels: np.ndarray, keyword: Optional[str]) -> np.ndarray:
+    if not keyword:
+        return np.ones(labels.shape, dtype=bool)
+    return np.char.find(labels, keyword.casefold()) >= 0
+
+
+def _group_ids(items: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """productId 또는 정규화한 상품명이 같은 상품에 같은 그룹 번호를 붙입니다."""
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    first_seen: Dict[str, int] = {}
+    for i, item in enumerate(items):
+        for key in (f"id:{item.get('productId') or ''}", f"title:{normalize_title(item.get('title', ''))}"):
+            if key in ("id:", "title:"):
+                continue
+            if key in first_seen:
+                parent[find(i)] = find(first_seen[key])
+            else:
+                first_seen[key] = i
+    return np.array([find(i) for i in range(len(items))], dtype=np.int64)
+
+
+# 시간복잡도: O(n log n) (n: 후보 수, 정렬과 np.unique)
+def filter_products(
+    items: Sequence[Dict[str, Any]],
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    brand: Optional[str] = None,
+    category: Optional[str] = None,
+    sort: str = "relevance",
+    k: int = 5,
+) -> List[Dict[str, Any]]:
+    """후보 상품에 필터를 적용하고 중복을 제거한 뒤 정렬하여 상위 k개를 반환합니다.
+
+    Args:
+        items (Sequence[Dict[str, Any]]): 검색 순위대로의 상품 (title, lprice, mallName, productId, link, brand, maker, category)
+        min_price (Optional[int]): 최소 가격(원)
+        max_price (Optional[int]): 최대 가격(원)
+        brand (Optional[str]): 브랜드/제조사
+        category (Optional[str]): 카테고리 (예: '텀블러', '휴대폰케이스')
+        sort (str): relevance, price_asc, price_desc, value 중 하나
+        k (int): 반환할 상품 수
+    Returns:
+        List[Dict[str, Any]]: 상위 k개 상품. lprice는 정수, mall_count는 같은 상품을 파는 판매처 수
+    """
+    if not items or k <= 0:
+        return []
+    prices = parse_prices([item.get("lprice") for item in items])
+    # 브랜드/카테고리 정보가 없는 상품은 상품명으로 대신 판단합니다.
+    brand_labels = np.array(
+        [(f"{item.get('brand', '')}|{item.get('maker', '')}".strip("|") or item.get("title", "")).casefold()
+         for item in items],
+        dtype=str,
+    )
+    category_labels = np.array(
+        [(item.get("category") or item.get("title", "")).casefold() for item in items], dtype=str
+    )
+
+    mask = (
+        (prices > 0)
+        & (prices >= (min_price or 0))
+        & (prices <= (max_price if max_price else np.iinfo(np.int64).max))
+        & _contains(brand_labels, brand)
+        & _contains(category_labels, category)
+    )
+    candidates = np.flatnonzero(mask)
+    if not len(candidates):
+        return []
+
+    # 묶음마다 가장 싼 상품(가격이 같으면 검색 순위가 높은 상품)을 대표로 남깁니다.
+    groups = _group_ids(items)[candidates]
+    order = np.lexsort((candidates, prices[candidates], groups))
+    unique_groups, first, inverse = np.unique(groups[order], return_index=True, return_inverse=True)
+    representatives = candidates[order][first]
+    malls = np.array([items[i].get("mallName", "") for i in candidates[order]], dtype=str)
+    mall_pairs = np.unique(np.stack([inverse.astype(str), malls]), axis=1)
+    mall_counts = np.bincount(mall_pairs[0].astype(np.int64), minlength=len(unique_groups))
+    # 묶음의 검색 순위는 묶음 안에서 가장 높은 순위
+    best_rank = np.full(len(unique_groups), np.iinfo(np.int64).max)
+    np.minimum.at(best_rank, inverse, candidates[order])
+
+    rep_prices = prices[representatives].astype(np.float64)
+    if sort == "price_asc":
+        keys = (best_rank, rep_prices)
+    elif sort == "price_desc":
+        keys = (best_rank, -rep_prices)
+    elif sort == "value":
+        relevance = 1.0 - best_rank / len(items)
+        spread = rep_prices.max() - rep_prices.min()
+        price_score = 1.0 - (rep_prices - rep_prices.min()) / spread if spread else np.ones(len(rep_prices))
+        keys = (best_rank, -(VALUE_PRICE_WEIGHT * price_score + (1 - VALUE_PRICE_WEIGHT) * relevance))
+    else:
+        keys = (best_rank,)
+    ranked = np.lexsort(keys)[:k]
+
+    results = []
+    for g in ranked:
+        item = items[representatives[g]]
+        results.append({
+            "title": item.get("title", ""),
+            "lprice": int(prices[representatives[g]]),
+            "mallName": item.get("mallName", ""),
+            "productId": item.get("productId", ""),
+            "link": item.get("link", ""),
+            "mall_count": int(mall_counts[g]),
+        })
+    return results
+
+
+def summarize_prices(query: str, items: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """한 검색어의 후보 상품에서 최저가, 판매처 수, 가격 분포를 요약합니다. (상품 비교용)
+
+    세척솔/케이스 같은 액세서리가 최저가로 잡히지 않도록 상품명에 검색어의 단어를
+    모두 포함한 상품만 사용하고, 그런 상품이 없으면 전체 후보를 사용합니다.
+
+    Args:
+        query (str): 비교할 상품 검색어 (예: '스탠리 퀜처')
+        items (Sequence[Dict[str, Any]]): 검색어의 후보 상품
+    Returns:
+        Dict[str, Any]: query, lowest_price, lowest_title, lowest_mall, link, mall_count,
+            median_price, max_price, price_spread(최고가 - 최저가), matched(요약에 사용한 상품 수)
+    """
+    summary: Dict[str, Any] = {"query": query, "matched": 0}
+    prices = parse_prices([item.get("lprice") for item in items])
+    if not len(prices):
+        return summary
+    titles = np.array([normalize_title(item.get("title", "")) for item in items], dtype=str)
+    matches = prices > 0
+    relevant = matches.copy()
+    for token in query.split():
+        relevant &= np.char.find(titles, normalize_title(token)) >= 0
+    if relevant.any():
+        matches = relevant
+    indices = np.flatnonzero(matches)
+    if not len(indices):
+        return summary
+
+    selected = prices[indices]
+    lowest = indices[np.argmin(selected)]
+    malls = {items[i].get("mallName", "") for i in indices}
+    summary.update({
+        "lowest_price": int(prices[lowest]),
+        "lowest_title": items[lowest].get("title", ""),
+        "lowest_mall": items[lowest].get("mallName", ""),
+        "link": items[lowest].get("link", ""),
+        "mall_count": len(malls),
+        "median_price": int(np.median(selected)),
+        "max_price": int(selected.max()),
+        "price_spread": int(selected.max() - selected.min()),
+        "matched": len(indices),
+    })
+    return summary
@@ -165,12 +165,12 @@
 
 import os
 import json
+import asyncio
 import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from dotenv import load_dotenv
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import ConnectionFailure, PyMongoError
 
 from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_openai_functions_agent
@@ -178,40 +178,92 @@ from langchain_core.tools import tool
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain import hub
 
+from ..rate_limit import RateLimitError
+from .cart_store import DEFAULT_CART_USER, upsert_cart_items
+from .naver_shopping import SHOPPING_DEFAULT_CANDIDATES, SHOPPING_MAX_CANDIDATES, fetch_shopping_candidates
+from .price_tracker import get_cart_price_changes as load_cart_price_changes
+from .shopping_filter import SORT_OPTIONS, filter_products, summarize_prices
+
 load_dotenv()
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID", "")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET", "")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 MONGODB_URI = os.getenv("MONGODB_URI")
+# 상품 비교에서 검색어마다 받아 올 후보 수 (API 호출 1회)
+COMPARE_CANDIDATES = 40
+MAX_COMPARE_QUERIES = 5
 
 
 class NaverShoppingSearchInput(BaseModel):
     query: str = Field(
         description="상품 혹은 유저가 찾고자 하는 상품의 키워드 e.g., '파란 신발', '서정적인 책', '보온 텀블러'"
     )
+    display: int = Field(default=5, ge=1, le=20, description="반환할 상품 수")
+    min_price: Optional[int] = Field(default=None, description="최소 가격(원). 예: '2만원 이상' → 20000")
+    max_price: Optional[int] = Field(default=None, description="최대 가격(원). 예: '3만원 이하' → 30000")
+    brand: Optional[str] = Field(default=None, description="원하는 브랜드/제조사 (예: '스탠리')")
+    category: Optional[str] = Field(default=None, description="원하는 상품 카테고리 (예: '텀블러')")
+    sort: str = Field(
+        default="relevance",
+        description="정렬 기준: relevance(정확도순), price_asc(낮은 가격순), price_desc(높은 가격순), value(가성비)",
+    )
 
 
 @tool(args_schema=NaverShoppingSearchInput)
-async def get_naver_search_results(query: str) -> Dict[str, Any]:
-    """사용자가 쇼핑 상품에 대한 검색, 구매 및 추천을 원할 때 사용하는 함수. 이 함수를 통해 사용자의 쿼리와 연관된 상품을 검색할 수 있습니다."""
-    url = "https://openapi.naver.com/v1/search/shop.json"
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
-    }
-    params = {
-        "query": query,
-        "display": "5",
-        "start": "1",
-        "sort": "sim",
-        "filter": "naverpay",
-    }
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-    return data
+async def get_naver_search_results(
+    query: str,
+    display: int = 5,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    brand: Optional[str] = None,
+    category: Optional[str] = None,
+    sort: str = "relevance",
+) -> Dict[str, Any]:
+    """사용자가 쇼핑 상품에 대한 검색, 구매 및 추천을 원할 때 사용하는 함수. 이 함수를 통해 사용자의 쿼리와 연관된 상품을 검색할 수 있습니다.
+    가격 범위, 브랜드, 카테고리 조건과 정렬 기준을 넘기면 조건에 맞는 상품만 골라 반환합니다.
+    각 상품은 title, lprice(최저가, 원), mallName, productId, link, mall_count(같은 상품을 파는 판매처 수)를 담습니다."""
+    if sort not in SORT_OPTIONS:
+        sort = "relevance"
+    # 조건이 있으면 여러 페이지의 후보를 모아 로컬에서 거릅니다.
+    constrained = any([min_price, max_price, brand, category]) or sort != "relevance"
+    limit = SHOPPING_MAX_CANDIDATES if constrained else SHOPPING_DEFAULT_CANDIDATES
+    try:
+        candidates = await fetch_shopping_candidates(query, limit)
+        items = filter_products(candidates, min_price, max_price, brand, category, sort, k=display)
+        return {"query": query, "candidates": len(candidates), "items": items}
+    except RateLimitError as e:
+        return {"error": f"네이버 쇼핑 검색 호출 한도에 걸렸습니다: {e}"}
+    except httpx.HTTPStatusError as e:
+        return {"error": f"네이버 API 호출 중 오류가 발생했습니다: {e.response.status_code} - {e.response.text}"}
+    except httpx.HTTPError as e:
+        # 타임아웃/연결 실패 등 응답을 받지 못한 경우
+        return {"error": f"네이버 API 호출 중 오류가 발생했습니다: {e!r}"}
+
+
+class CompareProductsInput(BaseModel):
+    queries: List[str] = Field(
+        description="비교할 상품 검색어 목록 (2~5개). e.g., ['스탠리 퀜처', '써모스 보온보냉 텀블러']"
+    )
+
+
+@tool(args_schema=CompareProductsInput)
+async def compare_products(queries: List[str]) -> Dict[str, Any]:
+    """사용자가 여러 상품을 비교해 달라고 할 때 사용하는 함수. 상품마다 get_naver_search_results를 따로 호출하는 대신 한 번에 사용합니다.
+    각 검색어를 동시에 검색하여 최저가(lowest_price)와 그 판매처, 판매처 수(mall_count), 중간 가격(median_price),
+    가격 차이(price_spread: 최고가 - 최저가)를 상품별 한 줄로 정리한 비교표를 반환합니다."""
+    queries = list(dict.fromkeys(query.strip() for query in queries if query.strip()))[:MAX_COMPARE_QUERIES]
+    results = await asyncio.gather(
+        *(fetch_shopping_candidates(query, COMPARE_CANDIDATES) for query in queries), return_exceptions=True
+    )
+    rows = []
+    for query, result in zip(queries, results):
+        if isinstance(result, RateLimitError):
+            rows.append({"query": query, "error": f"네이버 쇼핑 검색 호출 한도에 걸렸습니다: {result}"})
+        elif isinstance(result, Exception):
+            rows.append({"query": query, "error": f"검색 중 오류가 발생했습니다: {result!r}"})
+        else:
+            rows.append(summarize_prices(query, result))
+    return {"comparison": rows}
 
 
 class AddProductToCartInput(BaseModel):
@@ -224,11 +276,14 @@ class AddProductToCartInput(BaseModel):
     prices: List[str] = Field(
         description="해당 상품의 가격. product_names와 길이가 같아야 하며, 만약 가격이 없다면 공백을 삽입"
     )
+    user_id: str = Field(
+        default=DEFAULT_CART_USER, description="장바구니 소유자 ID. 알 수 없으면 생략"
+    )
 
 
 @tool(args_schema=AddProductToCartInput)
 def add_product_to_mycart(
-    product_names: List[str], product_urls: List[str], prices: List[str]
+    product_names: List[str], product_urls: List[str], prices: List[str], user_id: str = DEFAULT_CART_USER
 ) -> str:
     """사용자가 추천 혹은 검색된 상품을 장바구니에 추가하고자 할 때 사용하는 함수. 사용자 대화 히스토리를 기반으로 저장할 상품을 탐색합니다."""
     if not MONGODB_URI:
@@ -244,23 +299,44 @@ def add_product_to_mycart(
         }
         add_cart_list.append(tmp_product)
 
-    try:
-        client = MongoClient(MONGODB_URI)
-        db = client["shopping"]
-        collection = db["cart"]
+    if not add_cart_list:
+        return "장바구니에 추가할 상품을 찾을 수 없습니다."
 
-        if add_cart_list:
-            result = collection.insert_many(add_cart_list)
-            return f"{len(result.inserted_ids)}개의 상품이 장바구니에 성공적으로 추가되었습니다."
-        else:
-            return "장바구니에 추가할 상품을 찾을 수 없습니다."
+    try:
+        result = upsert_cart_items(add_cart_list, user_id or DEFAULT_CART_USER)
     except ConnectionFailure as e:
         return "데이터베이스에 연결할 수 없습니다."
-    except Exception as e:
+    except (PyMongoError, ValueError) as e:
         return "장바구니에 상품을 추가하는 중 문제가 발생했습니다."
 
+    message = f"{result.upserted_count}개의 상품이 장바구니에 성공적으로 추가되었습니다."
+    if result.matched_count:
+        message += f" ({result.matched_count}개는 이미 장바구니에 있어 정보만 갱신했습니다.)"
+    return message
+
+
+class CartPriceChangesInput(BaseModel):
+    user_id: str = Field(
+        default=DEFAULT_CART_USER, description="장바구니 소유자 ID. 알 수 없으면 생략"
+    )
+
+
+@tool(args_schema=CartPriceChangesInput)
+def get_cart_price_changes(user_id: str = DEFAULT_CART_USER) -> Dict[str, Any]:
+    """사용자가 장바구니 상품의 가격 변동, 가격 인하 여부를 물을 때 사용하는 함수. 주기적으로 확인해 둔 가격으로 답하므로 검색을 다시 하지 않습니다.
+    상품별 장바구니에 담을 때 가격(cart_price), 최근 가격(last_price), 직전 가격(previous_price), 최저가(lowest_price),
+    변동액(change), 변동률(change_pct), 가격 인하 여부(price_dropped)를 반환합니다."""
+    if not MONGODB_URI:
+        return {"error": "데이터베이스 연결 정보(MONGODB_URI)가 설정되지 않았습니다."}
+    try:
+        return {"items": load_cart_price_changes(user_id or DEFAULT_CART_USER)}
+    except ConnectionFailure:
+        return {"error": "데이터베이스에 연결할 수 없습니다."}
+    except (PyMongoError, ValueError):
+        return {"error": "장바구니 가격 정보를 읽는 중 문제가 발생했습니다."}
+
 
-tools = [get_naver_search_results, add_product_to_mycart]
+tools = [get_naver_search_results, compare_products, add_product_to_mycart, get_cart_price_changes]
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=OPENAI_API_KEY)
 prompt = hub.pull("hwchase17/openai-functions-agent")
 agent = create_openai_functions_agent(llm, tools, prompt)
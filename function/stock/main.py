@@ -1,11 +1,18 @@
 # main.py
 import os
+import sys
 import json
 import asyncio
 import openai
 from dotenv import load_dotenv
 from stock_price import get_stock_price
-from symbol_map import find_symbol_by_name
+from symbol_map import stock_code_map
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from function.entity_matcher import EntityMatcher
+
+# 종목명 → 코드 매칭기 (임포트 시 한 번만 생성)
+STOCK_NAME_MATCHER = EntityMatcher(stock_code_map)
 
 load_dotenv()
 client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -30,11 +37,7 @@ async def main():
     user_prompt = "삼성전자 최근 주가 어때? 시가랑 거래량도 알려줘."
 
     # 종목명 → 코드 매핑
-    symbol = None
-    for name in ["삼성전자", "SK하이닉스", "카카오", "NAVER", "LG화학"]:
-        if name in user_prompt:
-            symbol = find_symbol_by_name(name)
-            break
+    symbol = STOCK_NAME_MATCHER.find_first(user_prompt)
 
     if not symbol:
         print("⛔ 종목명을 찾을 수 없습니다.")
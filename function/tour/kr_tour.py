@@ -17,12 +17,14 @@
 - KR_CULTURE_API_KEY: 한국문화정보원 API 인증키
 """
 import os
+import re
+import sys
 import json
 import httpx
 import xml.etree.ElementTree as ET
 from openai import OpenAI
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
 import asyncio
 from dotenv import load_dotenv
 from urllib.parse import quote, urlencode
@@ -34,6 +36,15 @@ from langchain_core.tools import tool
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain import hub
 
+from ..cache import MISSING, PersistentCache
+from ..entity_matcher import EntityMatcher
+from ..http_client import get_async_client
+from ..place.naver_place import MAX_PLACE_CANDIDATES, afetch_place_candidates
+from ..place.place_index import get_place_index, transform_naver_to_canonical
+from ..place.place_merge import merge_places
+from ..rate_limit import LANE_BATCH, RateLimitError, aacquire, rate_limit_lane
+from .tour_mirror import get_tour_mirror
+
 load_dotenv()
 # --- 1. 설정: API 키 및 클라이언트 초기화 ---
 try:
@@ -124,6 +135,205 @@ def transform_kcis_to_canonical(item: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+class TourApiError(Exception):
+    """공공데이터 API가 정상 응답 코드가 아닌 결과를 반환한 경우 발생합니다."""
+
+
+async def fetch_tourist_places(keyword: str, area_code: str = "") -> List[Dict[str, Any]]:
+    """관광지를 키워드로 검색하여 표준 데이터 모델 목록을 반환합니다.
+
+    전국 전체 동기화(sync_tour_mirror)를 마친 로컬 미러가 있으면 미러에서 먼저 찾고,
+    미러가 없거나 결과가 없을 때 TourAPI 키워드 검색(searchKeyword2)을 호출합니다.
+
+    Args:
+        keyword (str): 검색할 키워드.
+        area_code (str, optional): 지역 코드 (예: '1' for 서울). Defaults to "".
+
+    Returns:
+        List[Dict[str, Any]]: 표준 데이터 모델로 변환한 검색 결과. 결과가 없으면 빈 리스트.
+
+    Raises:
+        httpx.HTTPError: API 호출 실패 시
+        TourApiError: API가 오류 결과 코드를 반환한 경우
+        RateLimitError: 공공데이터포털 호출 한도에 걸린 경우
+    """
+    mirror = get_tour_mirror()
+    # 일부만 채워진 미러가 실시간 검색을 대신하지 않도록 전체 동기화를 마친 뒤에만 사용합니다.
+    mirrored = (
+        await asyncio.to_thread(mirror.search, keyword, area_code, "", 3)
+        if await asyncio.to_thread(mirror.is_fully_synced) else []
+    )
+    if mirrored:
+        print(f"[DEBUG] 로컬 미러에서 {len(mirrored)}건 조회: keyword='{keyword}'")
+        canonical_results = [transform_kto_to_canonical(item) for item in mirrored]
+        get_place_index().add_many(canonical_results)
+        return canonical_results
+
+    base_url = "http://apis.data.go.kr/B551011/KorService2/searchKeyword2"
+    params = {
+        "serviceKey": KR_TOUR_API_KEY, "numOfRows": 3, "pageNo": 1,
+        "MobileOS": "WEB", "MobileApp": "PlaceAgent", "_type": "json",
+        "keyword": quote(keyword),
+        "areaCode": area_code
+    }
+
+    print(f"[DEBUG] 요청 URL: {base_url}")
+    print(f"[DEBUG] 요청 파라미터: {params}")
+    query_string = urlencode(
+        {k: v for k, v in params.items() if v}, safe='%')
+    full_url = f"{base_url}?{query_string}"
+    print(f"[DEBUG] 최종 요청 URL: {full_url}")
+    await aacquire("data_go_kr", KR_TOUR_API_KEY)
+    response = await get_async_client().get(full_url)
+    print(f"[DEBUG] 응답 status code: {response.status_code}")
+    print(f"[DEBUG] 응답 본문: {response.text}")
+    response.raise_for_status()
+    items, _ = _parse_tour_response(response.json())
+
+    canonical_results = [
+        transform_kto_to_canonical(item) for item in items]
+    get_place_index().add_many(canonical_results)
+    return canonical_results
+
+
+def _parse_tour_response(data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+    """TourAPI JSON 응답에서 item 목록과 전체 건수(totalCount)를 꺼냅니다.
+
+    Raises:
+        TourApiError: API가 오류 결과 코드를 반환한 경우
+    """
+    response = data.get("response", {})
+    if response.get("header", {}).get("resultCode") != "0000":
+        raise TourApiError(response.get("header", {}).get("resultMsg", "알 수 없는 오류"))
+
+    body = response.get("body", {})
+    items_container = body.get("items", "")
+    if isinstance(items_container, dict):
+        items = items_container.get("item", [])
+    elif not items_container:
+        items = []
+    else:
+        items = items_container
+    # 결과가 한 건이면 리스트가 아닌 딕셔너리로 내려옵니다.
+    if isinstance(items, dict):
+        items = [items]
+    return items, int(body.get("totalCount") or 0)
+
+
+# 미러 동기화 시 한 페이지에 받아 올 건수 (TourAPI 최대값)
+MIRROR_SYNC_PAGE_SIZE = 1000
+
+
+async def _fetch_tour_page(base_url: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+    query_string = urlencode({k: v for k, v in params.items() if v}, safe='%')
+    with rate_limit_lane(LANE_BATCH):
+        await aacquire("data_go_kr", KR_TOUR_API_KEY)
+    response = await get_async_client().get(f"{base_url}?{query_string}", timeout=60.0)
+    response.raise_for_status()
+    return _parse_tour_response(response.json())
+
+
+async def sync_tour_mirror(area_code: str = "", content_type_id: str = "") -> int:
+    """지역 기반 관광정보(areaBasedList2) 전체를 페이지 단위로 내려받아 로컬 미러에 저장합니다.
+
+    페이지마다 바로 저장하므로 중간에 실패해도 그때까지 받은 데이터는 미러에 남습니다.
+    전국 동기화가 끝나면 시작일을 워터마크로 기록하여, 이후에는 sync_tour_mirror_changes로
+    변경분만 받습니다. (실행: python -m function.tour.kr_tour sync)
+
+    Args:
+        area_code (str, optional): 특정 지역만 동기화할 때의 지역 코드. 비어 있으면 전국.
+        content_type_id (str, optional): 특정 관광 타입만 동기화할 때의 타입 ID.
+
+    Returns:
+        int: 저장한 콘텐츠 수
+
+    Raises:
+        httpx.HTTPError: API 호출 실패 시
+        TourApiError: API가 오류 결과 코드를 반환한 경우
+        RateLimitError: 공공데이터포털 호출 한도에 걸린 경우
+    """
+    base_url = "http://apis.data.go.kr/B551011/KorService2/areaBasedList2"
+    mirror = get_tour_mirror()
+    # 크롤링 도중 바뀐 콘텐츠도 다음 증분 동기화에서 받도록 시작 시점을 워터마크로 씁니다.
+    started_day = datetime.now().strftime("%Y%m%d")
+    synced, page_no = 0, 1
+    while True:
+        params = {
+            "serviceKey": KR_TOUR_API_KEY, "numOfRows": MIRROR_SYNC_PAGE_SIZE, "pageNo": page_no,
+            "MobileOS": "WEB", "MobileApp": "PlaceAgent", "_type": "json",
+            "areaCode": area_code, "contentTypeId": content_type_id,
+        }
+        items, total_count = await _fetch_tour_page(base_url, params)
+        synced += mirror.upsert_items(items)
+        print(f"[SYNC] {page_no}페이지 저장 완료: {synced}/{total_count}")
+        if not items or page_no * MIRROR_SYNC_PAGE_SIZE >= total_count:
+            break
+        page_no += 1
+
+    state = {"last_full_sync": datetime.now().strftime("%Y%m%d%H%M%S")}
+    if not area_code and not content_type_id:
+        state.update({"watermark": started_day, "cursor": ""})
+    mirror.apply_changes(state=state)
+    return synced
+
+
+async def sync_tour_mirror_changes() -> Dict[str, int]:
+    """마지막 워터마크 이후 변경된 콘텐츠만 받아 로컬 미러에 반영합니다.
+
+    관광정보 동기화 목록(areaBasedSyncList2)을 워터마크 날짜부터 오늘까지 하루씩 modifiedtime으로
+    조회합니다. showflag가 '1'인 콘텐츠는 저장하고, '0'(비표출)인 콘텐츠는 미러에서 삭제합니다.
+    페이지마다 변경분과 진행 위치(cursor)를 한 트랜잭션으로 기록하므로, 중단된 뒤 다시 실행하면
+    마지막으로 반영한 페이지 다음부터 이어서 받습니다. 하루치를 모두 받으면 워터마크를 그날로 옮깁니다.
+    (실행: python -m function.tour.kr_tour sync-changes)
+
+    Returns:
+        Dict[str, int]: {"upserted": 저장 수, "deleted": 삭제 수, "pages": 조회한 페이지 수}
+
+    Raises:
+        TourApiError: 전체 동기화(sync_tour_mirror) 기록이 없거나 API가 오류 결과 코드를 반환한 경우
+        httpx.HTTPError: API 호출 실패 시
+        RateLimitError: 공공데이터포털 호출 한도에 걸린 경우
+    """
+    base_url = "http://apis.data.go.kr/B551011/KorService2/areaBasedSyncList2"
+    mirror = get_tour_mirror()
+    watermark = mirror.get_state("watermark")
+    if not watermark:
+        raise TourApiError("전체 동기화 기록이 없습니다. sync_tour_mirror를 먼저 실행하세요.")
+
+    # cursor: 'YYYYMMDD:마지막으로 반영한 페이지'
+    cursor_day, _, cursor_page = (mirror.get_state("cursor") or "").partition(":")
+    day = datetime.strptime(watermark, "%Y%m%d")
+    today = datetime.now()
+    stats = {"upserted": 0, "deleted": 0, "pages": 0}
+    while day.date() <= today.date():
+        day_str = day.strftime("%Y%m%d")
+        page_no = int(cursor_page) + 1 if cursor_day == day_str and cursor_page else 1
+        while True:
+            params = {
+                "serviceKey": KR_TOUR_API_KEY, "numOfRows": MIRROR_SYNC_PAGE_SIZE, "pageNo": page_no,
+                "MobileOS": "WEB", "MobileApp": "PlaceAgent", "_type": "json",
+                "modifiedtime": day_str,
+            }
+            items, total_count = await _fetch_tour_page(base_url, params)
+            upserts = [item for item in items if str(item.get("showflag", "1")) == "1"]
+            deleted_ids = [item.get("contentid") for item in items if str(item.get("showflag", "1")) != "1"]
+            upserted, deleted = mirror.apply_changes(upserts, deleted_ids, {"cursor": f"{day_str}:{page_no}"})
+            stats["upserted"] += upserted
+            stats["deleted"] += deleted
+            stats["pages"] += 1
+            print(f"[SYNC] {day_str} {page_no}페이지 반영: 저장 {upserted}건, 삭제 {deleted}건 (전체 {total_count}건)")
+            if not items or page_no * MIRROR_SYNC_PAGE_SIZE >= total_count:
+                break
+            page_no += 1
+
+        # 오늘은 아직 변경이 더 생길 수 있으므로 워터마크를 오늘에 두고 다음 실행에서 다시 조회합니다.
+        mirror.apply_changes(state={"watermark": day_str, "cursor": ""})
+        day += timedelta(days=1)
+
+    mirror.set_state("last_change_sync", today.strftime("%Y%m%d%H%M%S"))
+    return stats
+
+
 class KrTourInfoInput(BaseModel):
     keyword: str = Field(
         description="한국 관광공사에서 제공하는 지역별 추천 여행지 관련 키워드"
@@ -133,19 +343,29 @@ class KrTourInfoInput(BaseModel):
     )
 
 
+# 요약(stub)에 남기는 표준 데이터 모델 필드
+PLACE_STUB_FIELDS = ("canonical_name", "category", "address_full", "source_api_id", "source_data_id")
+
+
+def to_place_stub(record: Dict[str, Any]) -> Dict[str, Any]:
+    """표준 데이터 모델에서 후보를 고르는 데 필요한 필드만 남긴 요약(stub)을 만듭니다."""
+    return {key: record.get(key, "") for key in PLACE_STUB_FIELDS}
+
+
 @tool(args_schema=KrTourInfoInput)
 async def search_tourist_info(keyword: str, area_code: str = "") -> str:
     """한국관광공사 TourAPI를 호출하여 관광 정보를 검색합니다.
 
-    키워드, 지역 코드를 사용하여 관광 정보를 조회하고,
-    결과를 JSON 형식의 문자열로 반환합니다.
+    키워드, 지역 코드를 사용하여 관광지를 조회하고, 이름/분류/주소와 source_data_id만 담은
+    요약 목록을 JSON 형식의 문자열로 반환합니다. 소개, 운영 시간, 요금 등 상세 정보가 필요하면
+    고른 장소의 source_data_id로 get_tourist_details를 호출하세요.
 
     Args:
         keyword (str): 검색할 키워드.
         area_code (str, optional): 지역 코드 (예: '1' for 서울). Defaults to "".
 
     Returns:
-        str: 검색 결과를 표준 데이터 모델로 변환한 후 직렬화한 JSON 문자열.
+        str: 검색 결과 요약(to_place_stub)을 직렬화한 JSON 문자열.
              오류 발생 시 오류 정보를 담은 JSON 문자열을 반환합니다.
     """
     print(
@@ -153,47 +373,14 @@ async def search_tourist_info(keyword: str, area_code: str = "") -> str:
     if KR_TOUR_API_KEY == "DUMMY_KEY":
         return json.dumps({"error": "한국관광공사 API 키가 없어 실제 호출을 할 수 없습니다."})
 
-    base_url = "http://apis.data.go.kr/B551011/KorService2/searchKeyword2"
-    params = {
-        "serviceKey": KR_TOUR_API_KEY, "numOfRows": 3, "pageNo": 1,
-        "MobileOS": "WEB", "MobileApp": "PlaceAgent", "_type": "json",
-        "keyword": quote(keyword),
-        "areaCode": area_code
-    }
-
     try:
-        print(f"[DEBUG] 요청 URL: {base_url}")
-        print(f"[DEBUG] 요청 파라미터: {params}")
-        query_string = urlencode(
-            {k: v for k, v in params.items() if v}, safe='%')
-        full_url = f"{base_url}?{query_string}"
-        print(f"[DEBUG] 최종 요청 URL: {full_url}")
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(full_url)
-            print(f"[DEBUG] 응답 status code: {response.status_code}")
-            print(f"[DEBUG] 응답 본문: {response.text}")
-            response.raise_for_status()
-            data = response.json()
-
-        if data.get("response", {}).get("header", {}).get("resultCode") != "0000":
-            return json.dumps({"error": data.get("response", {}).get("header", {}).get("resultMsg", "알 수 없는 오류")}, ensure_ascii=False)
-
-        items_container = data.get("response", {}).get(
-            "body", {}).get("items", "")
-        if isinstance(items_container, dict):
-            items = items_container.get("item", [])
-        elif not items_container:
-            items = []
-        else:
-            items = items_container
-
-        if not items:
+        canonical_results = await fetch_tourist_places(keyword, area_code)
+        if not canonical_results:
             return json.dumps({"message": "검색 결과가 없습니다."}, ensure_ascii=False)
+        return json.dumps([to_place_stub(record) for record in canonical_results], ensure_ascii=False, indent=2)
 
-        canonical_results = [
-            transform_kto_to_canonical(item) for item in items]
-        return json.dumps(canonical_results, ensure_ascii=False, indent=2)
-
+    except (TourApiError, RateLimitError) as e:
+        return json.dumps({"error": str(e)}, ensure_ascii=False)
     except httpx.HTTPError as e:
         print(f"[ERROR] httpx.HTTPError: {e!r}")
         print(f"[ERROR] type: {type(e)}")
@@ -216,6 +403,318 @@ async def search_tourist_info(keyword: str, area_code: str = "") -> str:
         return json.dumps({"error": f"알 수 없는 오류 발생: {e!r}"}, ensure_ascii=False)
 
 
+class TripPlaceSearchInput(BaseModel):
+    keyword: str = Field(
+        description="검색할 장소 키워드 (예: '경복궁', '해운대 카페')"
+    )
+    area_code: str = Field(
+        default="", description="관광공사 검색에 사용할 지역 코드: 1=서울, 2=인천, 3=대전, 4=대구, 5=광주, 6=부산, 7=울산, 8=세종, 31=경기도, 32=강원도, 33=충청북도, 34=충청남도, 35=경상북도, 36=경상남도, 37=전라북도, 38=전라남도, 39=제주도"
+    )
+
+
+@tool(args_schema=TripPlaceSearchInput)
+async def search_trip_places(keyword: str, area_code: str = "") -> str:
+    """네이버 지역 검색과 한국관광공사 TourAPI를 동시에 조회하고, 같은 장소는 하나로 합쳐 반환합니다.
+
+    여행 일정처럼 맛집/카페와 관광지를 함께 찾을 때 search_naver_places와
+    search_tourist_info를 각각 호출하는 대신 사용합니다.
+    같은 장소는 sources에 출처가 모두 표시된 레코드 하나로 반환됩니다.
+
+    Args:
+        keyword (str): 검색할 키워드.
+        area_code (str, optional): 관광공사 검색용 지역 코드. Defaults to "".
+
+    Returns:
+        str: 병합한 표준 데이터 모델 목록의 JSON 문자열.
+    """
+    print(f"  [도구 실행] search_trip_places(keyword='{keyword}', area_code='{area_code}')")
+    sources = [afetch_place_candidates(keyword, MAX_PLACE_CANDIDATES)]
+    if KR_TOUR_API_KEY != "DUMMY_KEY":
+        sources.append(fetch_tourist_places(keyword, area_code))
+    results = await asyncio.gather(*sources, return_exceptions=True)
+
+    records: List[Dict[str, Any]] = []
+    errors = []
+    for name, result in zip(("naver", "tour"), results):
+        if isinstance(result, Exception):
+            print(f"[ERROR] {name} 검색 실패: {result!r}")
+            errors.append(f"{name}: {result!r}")
+        elif name == "naver":
+            records.extend(transform_naver_to_canonical(item) for item in result)
+        else:
+            records.extend(result)
+
+    if not records:
+        if errors:
+            return json.dumps({"error": f"API 요청 중 오류 발생: {'; '.join(errors)}"}, ensure_ascii=False)
+        return json.dumps({"message": "검색 결과가 없습니다."}, ensure_ascii=False)
+    return json.dumps(merge_places(records), ensure_ascii=False, indent=2)
+
+
+# 상세 조회 결과는 자주 바뀌지 않으므로 하루 동안 캐시합니다.
+tour_detail_cache = PersistentCache("tour_detail", maxsize=1024, ttl=60 * 60 * 24)
+# 한 번의 get_tourist_details 호출에서 조회할 최대 콘텐츠 수
+MAX_DETAIL_BATCH = 10
+# detailIntro2 응답에서 관광 타입별 (운영 시간, 쉬는 날) 필드
+INTRO_HOURS_FIELDS = {
+    "12": ("usetime", "restdate"),
+    "14": ("usetimeculture", "restdateculture"),
+    "15": ("playtime", ""),
+    "25": ("taketime", ""),
+    "28": ("usetimeleports", "restdateleports"),
+    "32": ("checkintime", ""),
+    "38": ("opentime", "restdateshopping"),
+    "39": ("opentimefood", "restdatefood"),
+}
+# detailIntro2 응답에서 관광 타입별 요금 필드
+INTRO_FEE_FIELDS = {
+    "14": "usefee",
+    "15": "usetimefestival",
+    "28": "usefeeleports",
+    "39": "firstmenu",
+}
+
+
+def _clean_intro_text(value: Any) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"<[^>]+>", " ", str(value or ""))).strip()
+
+
+def _intro_fields(content_type_id: str, intro: Dict[str, Any]) -> Dict[str, str]:
+    hours_field, rest_field = INTRO_HOURS_FIELDS.get(content_type_id, ("", ""))
+    hours = _clean_intro_text(intro.get(hours_field)) if hours_field else ""
+    rest = _clean_intro_text(intro.get(rest_field)) if rest_field else ""
+    if content_type_id == "32" and hours:
+        hours = f"체크인 {hours}, 체크아웃 {_clean_intro_text(intro.get('checkouttime'))}"
+    if rest:
+        hours = f"{hours} (쉬는 날: {rest})" if hours else f"쉬는 날: {rest}"
+    fee_field = INTRO_FEE_FIELDS.get(content_type_id)
+    return {
+        "operating_hours": hours,
+        "fee_info": _clean_intro_text(intro.get(fee_field)) if fee_field else "",
+    }
+
+
+async def _fetch_tour_detail_item(operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    base_url = f"http://apis.data.go.kr/B551011/KorService2/{operation}"
+    params = {
+        "serviceKey": KR_TOUR_API_KEY, "MobileOS": "WEB", "MobileApp": "PlaceAgent", "_type": "json",
+        **params,
+    }
+    query_string = urlencode({k: v for k, v in params.items() if v}, safe='%')
+    await aacquire("data_go_kr", KR_TOUR_API_KEY)
+    response = await get_async_client().get(f"{base_url}?{query_string}")
+    response.raise_for_status()
+    items, _ = _parse_tour_response(response.json())
+    return items[0] if items else {}
+
+
+async def fetch_tourist_detail(content_id: str) -> Optional[Dict[str, Any]]:
+    """관광 콘텐츠 하나의 상세 정보(소개, 운영 시간, 요금)를 조회하여 표준 데이터 모델로 반환합니다.
+
+    공통 정보(detailCommon2)로 소개/연락처를 채운 뒤, 관광 타입에 맞는 소개 정보(detailIntro2)로
+    operating_hours와 fee_info를 채웁니다. 결과는 tour_detail_cache에 캐시하고,
+    소개(overview)가 키워드 검색에 쓰이도록, 로컬 미러에 이미 있는 콘텐츠라면 미러의 overview도 갱신합니다.
+
+    Args:
+        content_id (str): TourAPI 콘텐츠 ID (search_tourist_info 결과의 source_data_id)
+
+    Returns:
+        Optional[Dict[str, Any]]: 상세 정보를 채운 표준 데이터 모델. 콘텐츠가 없으면 None.
+
+    Raises:
+        httpx.HTTPError: API 호출 실패 시
+        TourApiError: API가 오류 결과 코드를 반환한 경우
+        RateLimitError: 공공데이터포털 호출 한도에 걸린 경우
+    """
+    cached = tour_detail_cache.get(content_id)
+    if cached is not MISSING:
+        return cached
+
+    common = await _fetch_tour_detail_item("detailCommon2", {"contentId": content_id})
+    if not common:
+        tour_detail_cache.set(content_id, None)
+        return None
+    content_type_id = str(common.get("contenttypeid") or "")
+    intro = await _fetch_tour_detail_item(
+        "detailIntro2", {"contentId": content_id, "contentTypeId": content_type_id}
+    ) if content_type_id else {}
+
+    # 미러에 이미 있는 콘텐츠의 overview만 갱신합니다. (사용자가 열어 본 콘텐츠로 미러를 채우지 않음)
+    await asyncio.to_thread(get_tour_mirror().set_overview, content_id, str(common.get("overview") or ""))
+    detail = {**transform_kto_to_canonical(common), **_intro_fields(content_type_id, intro)}
+    tour_detail_cache.set(content_id, detail)
+    return detail
+
+
+async def fetch_tourist_details(content_ids: List[str]) -> List[Dict[str, Any]]:
+    """여러 관광 콘텐츠의 상세 정보를 동시에 조회합니다. (최대 MAX_DETAIL_BATCH개, 중복 ID는 한 번만 조회)
+
+    Args:
+        content_ids (List[str]): TourAPI 콘텐츠 ID 목록
+
+    Returns:
+        List[Dict[str, Any]]: 요청 순서대로의 상세 정보. 조회에 실패한 항목은 source_data_id와 error만 담습니다.
+    """
+    unique_ids = list(dict.fromkeys(str(content_id) for content_id in content_ids if content_id))[:MAX_DETAIL_BATCH]
+    results = await asyncio.gather(
+        *(fetch_tourist_detail(content_id) for content_id in unique_ids), return_exceptions=True
+    )
+    details = []
+    for content_id, result in zip(unique_ids, results):
+        if isinstance(result, Exception):
+            print(f"[ERROR] 상세 조회 실패({content_id}): {result!r}")
+            details.append({"source_data_id": content_id, "error": str(result)})
+        elif result is None:
+            details.append({"source_data_id": content_id, "error": "콘텐츠를 찾을 수 없습니다."})
+        else:
+            details.append(result)
+    return details
+
+
+class TourDetailInput(BaseModel):
+    content_ids: List[str] = Field(
+        description="상세 정보를 조회할 관광지의 source_data_id 목록 (search_tourist_info 결과에서 고른 항목, 최대 10개)"
+    )
+
+
+@tool(args_schema=TourDetailInput)
+async def get_tourist_details(content_ids: List[str]) -> str:
+    """search_tourist_info로 찾은 관광지 중 고른 장소의 소개, 운영 시간, 쉬는 날, 요금, 연락처를 조회합니다.
+
+    후보를 고른 뒤 사용자에게 자세히 안내할 장소에 대해서만 호출하세요.
+
+    Args:
+        content_ids (List[str]): 관광지 source_data_id 목록
+
+    Returns:
+        str: 상세 정보를 채운 표준 데이터 모델 목록의 JSON 문자열.
+    """
+    print(f"  [도구 실행] get_tourist_details(content_ids={content_ids})")
+    if KR_TOUR_API_KEY == "DUMMY_KEY":
+        return json.dumps({"error": "한국관광공사 API 키가 없어 실제 호출을 할 수 없습니다."})
+    return json.dumps(await fetch_tourist_details(content_ids), ensure_ascii=False, indent=2)
+
+
+async def iter_kcis_items(chunks: AsyncIterable[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    """문화정보원 XML 응답을 받는 대로 파싱하여 <item>을 표준 데이터 모델로 하나씩 반환합니다.
+
+    전체 응답을 메모리에 올려 ElementTree를 만드는 대신 XMLPullParser에 바이트 조각을
+    넣으면서 완성된 <item>만 변환하고, 변환한 요소는 트리에서 제거하여
+    응답 크기와 관계없이 메모리 사용량을 일정하게 유지합니다.
+
+    Args:
+        chunks (AsyncIterable[bytes]): 응답 본문 바이트 조각 (예: response.aiter_bytes())
+
+    Yields:
+        Dict[str, Any]: 표준 데이터 모델로 변환한 문화 행사.
+
+    Raises:
+        ET.ParseError: XML 파싱 실패 시
+        TourApiError: 응답 헤더의 결과 코드가 정상(00)이 아닌 경우
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parent = None
+    header: Dict[str, Optional[str]] = {}
+    async for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                if element.tag == "items":
+                    parent = element
+                continue
+            if element.tag in ("resultCode", "resultMsg", "returnAuthMsg"):
+                header[element.tag] = element.text
+            elif element.tag == "header" and header.get("resultCode") not in (None, "00"):
+                raise TourApiError(header.get("resultMsg") or "알 수 없는 오류")
+            elif element.tag == "cmmMsgHeader":
+                # 인증키 오류 등 게이트웨이 오류는 OpenAPI_ServiceResponse 형식으로 옵니다.
+                raise TourApiError(header.get("returnAuthMsg") or "알 수 없는 오류")
+            elif element.tag == "item":
+                yield transform_kcis_to_canonical({child.tag: child.text for child in element})
+                element.clear()
+                if parent is not None:
+                    parent.remove(element)
+    parser.close()
+
+
+async def stream_cultural_events(
+    sido: str,
+    from_date: str,
+    to_date: str,
+    sigungu: str = "",
+    keyword: str = "",
+    serviceTp: str = "",
+    num_of_rows: int = 3,
+    page_no: int = 1,
+) -> AsyncIterator[Dict[str, Any]]:
+    """한국문화정보원 기간/지역별 공연전시 API(area2) 응답을 내려받는 대로 표준 데이터 모델로 반환합니다.
+
+    대량 조회(num_of_rows가 큰 경우)에서도 다운로드가 끝나기 전에 첫 결과를 사용할 수 있습니다.
+    인자와 예외는 fetch_cultural_events와 같습니다.
+
+    Yields:
+        Dict[str, Any]: 표준 데이터 모델로 변환한 문화 행사.
+    """
+    base_url = "http://apis.data.go.kr/B553457/cultureinfo/area2"
+    params = {
+        "serviceKey": KR_CULTURE_API_KEY, "numOfrows": num_of_rows, "pageNo": page_no,
+        "sido": quote(sido),
+        "from": from_date.replace("-", ""),
+        "to": to_date.replace("-", ""),
+        "sigungu": quote(sigungu) if sigungu else "",
+        "keyword": quote(keyword) if keyword else "",
+        "serviceTp": serviceTp,
+        "sortStdr": "1",  # 1:등록일, 2:공연명, 3:지역
+    }
+
+    print(f"[DEBUG] 요청 URL: {base_url}")
+    print(f"[DEBUG] 요청 파라미터: {params}")
+    query_string = urlencode(
+        {k: v for k, v in params.items() if v}, safe='%')
+    full_url = f"{base_url}?{query_string}"
+    print(f"[DEBUG] 최종 요청 URL: {full_url}")
+    await aacquire("data_go_kr", KR_CULTURE_API_KEY)
+    async with get_async_client().stream("GET", full_url) as response:
+        print(f"[DEBUG] 응답 status code: {response.status_code}")
+        response.raise_for_status()
+        async for record in iter_kcis_items(response.aiter_bytes()):
+            yield record
+
+
+async def fetch_cultural_events(
+    sido: str,
+    from_date: str,
+    to_date: str,
+    sigungu: str = "",
+    keyword: str = "",
+    serviceTp: str = ""
+) -> List[Dict[str, Any]]:
+    """한국문화정보원 기간/지역별 공연전시 API(area2)를 호출하여 표준 데이터 모델 목록을 반환합니다.
+
+    Args:
+        sido (str): 검색할 시/도 이름 (예: '서울').
+        from_date (str): 검색 시작일 (YYYY-MM-DD).
+        to_date (str): 검색 종료일 (YYYY-MM-DD).
+        sigungu (str, optional): 시/군/구 이름 (예: '종로구'). Defaults to "".
+        keyword (str, optional): 검색할 키워드. Defaults to "".
+        serviceTp (str, optional): 분야 구분 코드 (A:공연/전시, B:행사/축제,
+                                   C:교육/체험). Defaults to "".
+
+    Returns:
+        List[Dict[str, Any]]: 표준 데이터 모델로 변환한 검색 결과. 결과가 없으면 빈 리스트.
+
+    Raises:
+        httpx.HTTPError: API 호출 실패 시
+        ET.ParseError: XML 응답 파싱 실패 시
+        TourApiError: API가 오류 결과 코드를 반환한 경우
+        RateLimitError: 공공데이터포털 호출 한도에 걸린 경우
+    """
+    canonical_results = [
+        record async for record in stream_cultural_events(sido, from_date, to_date, sigungu, keyword, serviceTp)]
+    get_place_index().add_many(canonical_results)
+    return canonical_results
+
+
 async def search_cultural_events(
     sido: str,
     from_date: str,
@@ -247,46 +746,10 @@ async def search_cultural_events(
     if KR_CULTURE_API_KEY == "DUMMY_KEY":
         return json.dumps({"error": "한국문화정보원 API 키가 없어 실제 호출을 할 수 없습니다."})
 
-    base_url = "http://apis.data.go.kr/B553457/cultureinfo/area2"
-    params = {
-        "serviceKey": KR_CULTURE_API_KEY, "numOfrows": 3, "pageNo": 1,
-        "sido": quote(sido),
-        "from": from_date.replace("-", ""),
-        "to": to_date.replace("-", ""),
-        "sigungu": quote(sigungu) if sigungu else "",
-        "keyword": quote(keyword) if keyword else "",
-        "serviceTp": serviceTp,
-        "sortStdr": "1",  # 1:등록일, 2:공연명, 3:지역
-    }
-
     try:
-        print(f"[DEBUG] 요청 URL: {base_url}")
-        print(f"[DEBUG] 요청 파라미터: {params}")
-        query_string = urlencode(
-            {k: v for k, v in params.items() if v}, safe='%')
-        full_url = f"{base_url}?{query_string}"
-        print(f"[DEBUG] 최종 요청 URL: {full_url}")
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(full_url)
-            print(f"[DEBUG] 응답 status code: {response.status_code}")
-            print(f"[DEBUG] 응답 본문: {response.text}")
-            response.raise_for_status()
-
-            root = ET.fromstring(response.content)
-
-        if root.find(".//resultCode").text != "00":
-            return json.dumps({"error": root.find(".//resultMsg").text}, ensure_ascii=False)
-
-        items = []
-        for item_node in root.findall(".//item"):
-            item_dict = {child.tag: child.text for child in item_node}
-            items.append(item_dict)
-
-        if not items:
+        canonical_results = await fetch_cultural_events(sido, from_date, to_date, sigungu, keyword, serviceTp)
+        if not canonical_results:
             return json.dumps({"message": "검색 결과가 없습니다."}, ensure_ascii=False)
-
-        canonical_results = [
-            transform_kcis_to_canonical(item) for item in items]
         return json.dumps(canonical_results, ensure_ascii=False, indent=2)
 
     except httpx.HTTPError as e:
@@ -299,12 +762,12 @@ async def search_cultural_events(
             print(f"[ERROR] 응답 status code: {e.response.status_code}")
             print(f"[ERROR] 응답 본문: {e.response.text}")
         return json.dumps({"error": f"API 요청 중 오류 발생: {e!r}"}, ensure_ascii=False)
+    except (TourApiError, RateLimitError) as e:
+        return json.dumps({"error": str(e)}, ensure_ascii=False)
     except ET.ParseError as e:
         print(f"[ERROR] XML ParseError: {e!r}")
         print(f"[ERROR] type: {type(e)}")
         print(traceback.format_exc())
-        if 'response' in locals():
-            print(f"[ERROR] 응답 원문: {response.text}")
         return json.dumps({"error": f"XML 파싱 중 오류 발생: {e!r}"}, ensure_ascii=False)
     except Exception as e:
         print(f"[ERROR] Exception: {e!r}")
@@ -313,6 +776,69 @@ async def search_cultural_events(
         return json.dumps({"error": f"알 수 없는 오류 발생: {e!r}"}, ensure_ascii=False)
 
 
+class TourCultureSearchInput(BaseModel):
+    keyword: str = Field(
+        description="관광 정보 검색 키워드 (예: '한옥마을', '해수욕장')"
+    )
+    sido: str = Field(
+        description="검색할 시/도 이름 (예: '서울', '부산', '제주')"
+    )
+    from_date: str = Field(
+        description="문화 행사 검색 시작일 (YYYY-MM-DD 형식)"
+    )
+    to_date: str = Field(
+        description="문화 행사 검색 종료일 (YYYY-MM-DD 형식)"
+    )
+    serviceTp: str = Field(
+        default="", description="문화 행사 분야 구분(A:공연/전시, B:행사/축제, C:교육/체험). 지정하지 않으면 전체"
+    )
+
+
+@tool(args_schema=TourCultureSearchInput)
+async def search_tour_and_culture(
+    keyword: str, sido: str, from_date: str, to_date: str, serviceTp: str = ""
+) -> str:
+    """여행 일정용으로 관광지(한국관광공사)와 기간 내 문화 행사(한국문화정보원)를 동시에 검색합니다.
+
+    두 공공데이터 API를 동시에 호출하고, 같은 장소는 sources에 출처가 모두 표시된
+    레코드 하나로 합쳐 반환합니다. 관광지는 keyword로, 문화 행사는 지역과 기간으로 찾습니다.
+
+    Args:
+        keyword (str): 관광 정보 검색 키워드.
+        sido (str): 시/도 이름 (예: '서울').
+        from_date (str): 검색 시작일 (YYYY-MM-DD).
+        to_date (str): 검색 종료일 (YYYY-MM-DD).
+        serviceTp (str, optional): 문화 행사 분야 구분 코드. Defaults to "".
+
+    Returns:
+        str: 병합한 표준 데이터 모델 목록의 JSON 문자열.
+    """
+    print(f"  [도구 실행] search_tour_and_culture(keyword='{keyword}', sido='{sido}', from='{from_date}', to='{to_date}')")
+    searches = {}
+    if KR_TOUR_API_KEY != "DUMMY_KEY":
+        searches["tour"] = fetch_tourist_places(keyword, AREA_CODE_MAP.get(sido, ""))
+    if KR_CULTURE_API_KEY != "DUMMY_KEY":
+        searches["culture"] = fetch_cultural_events(sido, from_date, to_date, serviceTp=serviceTp)
+    if not searches:
+        return json.dumps({"error": "공공데이터 API 키가 없어 실제 호출을 할 수 없습니다."}, ensure_ascii=False)
+
+    results = await asyncio.gather(*searches.values(), return_exceptions=True)
+    records: List[Dict[str, Any]] = []
+    errors = []
+    for name, result in zip(searches, results):
+        if isinstance(result, Exception):
+            print(f"[ERROR] {name} 검색 실패: {result!r}")
+            errors.append(f"{name}: {result!r}")
+        else:
+            records.extend(result)
+
+    if not records:
+        if errors:
+            return json.dumps({"error": f"API 요청 중 오류 발생: {'; '.join(errors)}"}, ensure_ascii=False)
+        return json.dumps({"message": "검색 결과가 없습니다."}, ensure_ascii=False)
+    return json.dumps(merge_places(records), ensure_ascii=False, indent=2)
+
+
 # --- 3. AI 오케스트레이션 계층: LLM 설정 및 대화 흐름 제어 ---
 
 # 3.1. LLM에게 제공할 도구(함수) 목록 정의
@@ -326,6 +852,24 @@ tools = [
                           "description": "지역 코드: 1=서울, 2=인천, 3=대전, 4=대구, 5=광주, 6=부산, 7=울산, 8=세종, 31=경기도, 32=강원도, 33=충청북도, 34=충청남도, 35=경상북도, 36=경상남도, 37=전라북도, 38=전라남도, 39=제주도"},
         }, "required": ["keyword"]}
     }},
+    {"type": "function", "function": {
+        "name": "get_tourist_details",
+        "description": "search_tourist_info 결과에서 고른 관광지의 소개, 운영 시간, 쉬는 날, 요금을 조회합니다. 자세히 안내할 장소에 대해서만 호출하세요.",
+        "parameters": {"type": "object", "properties": {
+            "content_ids": {"type": "array", "items": {"type": "string"}, "description": "관광지 source_data_id 목록 (최대 10개)"},
+        }, "required": ["content_ids"]}
+    }},
+    {"type": "function", "function": {
+        "name": "search_tour_and_culture",
+        "description": "여행 일정을 짤 때 관광지와 기간 내 문화 행사(공연, 전시, 축제)를 동시에 검색합니다.",
+        "parameters": {"type": "object", "properties": {
+            "keyword": {"type": "string", "description": "관광 정보 검색 키워드"},
+            "sido": {"type": "string", "description": "검색할 지역의 시/도 이름 (예: '서울', '부산', '제주')"},
+            "from_date": {"type": "string", "description": "검색 시작일 (YYYY-MM-DD 형식)"},
+            "to_date": {"type": "string", "description": "검색 종료일 (YYYY-MM-DD 형식)"},
+            "serviceTp": {"type": "string", "enum": ["A", "B", "C"], "description": "분야 구분(A:공연/전시, B:행사/축제, C:교육/체험)"}
+        }, "required": ["keyword", "sido", "from_date", "to_date"]}
+    }},
     # {"type": "function", "function": {
     #     "name": "search_cultural_events",
     #     "description": "특정 기간과 지역의 문화 행사(공연, 전시, 축제)를 검색합니다.",
@@ -358,6 +902,9 @@ SERVICE_TYPE_MAP = {
     "행사": "B", "축제": "B",
     "교육": "C", "체험": "C", "강좌": "C"
 }
+# 질문에서 지역/분야를 한 번의 선형 탐색으로 찾도록 임포트 시점에 컴파일해 둡니다.
+AREA_CODE_MATCHER = EntityMatcher(AREA_CODE_MAP)
+SERVICE_TYPE_MATCHER = EntityMatcher(SERVICE_TYPE_MAP)
 
 
 def preprocess_arguments(function_name: str, args: dict, query: str) -> dict:
@@ -378,12 +925,12 @@ def preprocess_arguments(function_name: str, args: dict, query: str) -> dict:
 
     if function_name == "search_tourist_info":
         if not processed_args.get("area_code"):
-            for loc, code in AREA_CODE_MAP.items():
-                if loc in query or loc in processed_args.get("keyword", ""):
-                    processed_args["area_code"] = code
-                    break
+            area_code = (AREA_CODE_MATCHER.find_first(query)
+                         or AREA_CODE_MATCHER.find_first(processed_args.get("keyword", "")))
+            if area_code:
+                processed_args["area_code"] = area_code
 
-    elif function_name == "search_cultural_events":
+    elif function_name in ("search_cultural_events", "search_tour_and_culture"):
         today = datetime.now()
         if "오늘" in query:
             processed_args["from_date"] = today.strftime("%Y-%m-%d")
@@ -395,10 +942,9 @@ def preprocess_arguments(function_name: str, args: dict, query: str) -> dict:
             processed_args["to_date"] = sunday.strftime("%Y-%m-%d")
 
         if not processed_args.get("serviceTp"):
-            for type_name, type_code in SERVICE_TYPE_MAP.items():
-                if type_name in query:
-                    processed_args["serviceTp"] = type_code
-                    break
+            service_type = SERVICE_TYPE_MATCHER.find_first(query)
+            if service_type:
+                processed_args["serviceTp"] = service_type
     return processed_args
 
 
@@ -433,10 +979,12 @@ async def run_conversation(user_query: str, messages: List[Dict[str, Any]]) -> s
     if tool_calls:
         print("  [LLM 판단] 도구 사용 결정 됨.")
         available_functions = {"search_tourist_info": search_tourist_info,
-                               "search_cultural_events": search_cultural_events}
+                               "get_tourist_details": get_tourist_details,
+                               "search_cultural_events": search_cultural_events,
+                               "search_tour_and_culture": search_tour_and_culture}
         messages.append(response_message)
 
-        for tool_call in tool_calls:
+        async def run_tool_call(tool_call) -> str:
             function_name = tool_call.function.name
             function_to_call = available_functions[function_name]
             function_args = json.loads(tool_call.function.arguments)
@@ -444,10 +992,17 @@ async def run_conversation(user_query: str, messages: List[Dict[str, Any]]) -> s
             processed_args = preprocess_arguments(
                 function_name, function_args, user_query)
 
-            function_response = await function_to_call(**processed_args)
+            # @tool로 등록된 함수는 LangChain 도구 객체이므로 ainvoke로 호출합니다.
+            if hasattr(function_to_call, "ainvoke"):
+                return await function_to_call.ainvoke(processed_args)
+            return await function_to_call(**processed_args)
+
+        # 한 턴의 도구 호출은 서로 독립적이므로 공유 커넥션 풀 위에서 동시에 실행합니다.
+        function_responses = await asyncio.gather(*(run_tool_call(tool_call) for tool_call in tool_calls))
+        for tool_call, function_response in zip(tool_calls, function_responses):
             print(f"  [도구 결과]\n{function_response}\n")
             messages.append({"tool_call_id": tool_call.id, "role": "tool",
-                            "name": function_name, "content": function_response})
+                            "name": tool_call.function.name, "content": function_response})
 
         second_response = client.chat.completions.create(
             model="gpt-4o", messages=messages)
@@ -519,4 +1074,9 @@ if __name__ == "__main__":
             [
                 "주말에 가볼만한데 없나?"]
         )
-    asyncio.run(main())
+    if sys.argv[1:] == ["sync"]:
+        print(f"관광 미러 동기화 완료: {asyncio.run(sync_tour_mirror())}건")
+    elif sys.argv[1:] == ["sync-changes"]:
+        print(f"관광 미러 변경분 동기화 완료: {asyncio.run(sync_tour_mirror_changes())}")
+    else:
+        asyncio.run(main())
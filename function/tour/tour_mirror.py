@@ -0,0 +1,264 @@
+"""한국관광공사 TourAPI 로컬 미러 모듈.
+
+관광 콘텐츠 목록은 자주 바뀌지 않으므로 지역 기반 목록(areaBasedList2)을 SQLite에 내려받아 두고,
+search_tourist_info는 이 미러에서 먼저 검색합니다. (kr_tour.sync_tour_mirror로 동기화)
+
+- tour_items: contentid를 키로 주요 컬럼과 원본 JSON(raw)을 저장
+- tour_fts: title/overview에 대한 FTS5 색인. 한국어는 띄어쓰기 단위 토큰으로는
+  조사가 붙은 단어나 부분 문자열을 찾을 수 없으므로 trigram 토크나이저를 사용합니다.
+  (세 글자 미만 검색어는 LIKE로 보완)
+- (areacode, contenttypeid) 인덱스로 지역/유형 필터를 처리
+- tour_sync_state: 동기화 워터마크와 진행 위치 (kr_tour.sync_tour_mirror_changes의 재개 지점)
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..cache import CACHE_DIR
+
+TOUR_MIRROR_PATH = os.path.join(CACHE_DIR, "tour_mirror.sqlite3")
+# trigram 토크나이저가 색인하는 최소 글자 수
+MIN_FTS_TOKEN_LENGTH = 3
+
+_COLUMNS = (
+    "contentid", "contenttypeid", "areacode", "sigungucode", "title", "addr1", "addr2",
+    "mapx", "mapy", "firstimage", "tel", "cat1", "cat2", "cat3", "overview", "modifiedtime",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tour_items (
+    contentid TEXT PRIMARY KEY,
+    contenttypeid TEXT,
+    areacode TEXT,
+    sigungucode TEXT,
+    title TEXT NOT NULL DEFAULT '',
+    addr1 TEXT,
+    addr2 TEXT,
+    mapx TEXT,
+    mapy TEXT,
+    firstimage TEXT,
+    tel TEXT,
+    cat1 TEXT,
+    cat2 TEXT,
+    cat3 TEXT,
+    overview TEXT NOT NULL DEFAULT '',
+    modifiedtime TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tour_items_area ON tour_items (areacode, contenttypeid);
+CREATE INDEX IF NOT EXISTS idx_tour_items_type ON tour_items (contenttypeid);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tour_fts USING fts5(
+    title, overview, content='tour_items', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS tour_items_ai AFTER INSERT ON tour_items BEGIN
+    INSERT INTO tour_fts (rowid, title, overview) VALUES (new.rowid, new.title, new.overview);
+END;
+CREATE TRIGGER IF NOT EXISTS tour_items_ad AFTER DELETE ON tour_items BEGIN
+    INSERT INTO tour_fts (tour_fts, rowid, title, overview) VALUES ('delete', old.rowid, old.title, old.overview);
+END;
+CREATE TRIGGER IF NOT EXISTS tour_items_au AFTER UPDATE ON tour_items BEGIN
+    INSERT INTO tour_fts (tour_fts, rowid, title, overview) VALUES ('delete', old.rowid, old.title, old.overview);
+    INSERT INTO tour_fts (rowid, title, overview) VALUES (new.rowid, new.title, new.overview);
+END;
+
+CREATE TABLE IF NOT EXISTS tour_sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class TourMirror:
+    """TourAPI 관광 콘텐츠를 저장하고 키워드/지역으로 검색하는 SQLite 미러. (스레드마다 별도 커넥션)
+
+    Args:
+        db_path (str): SQLite 파일 경로
+    """
+
+    def __init__(self, db_path: str = TOUR_MIRROR_PATH) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    # --- 쓰기 ---
+
+    def upsert_items(self, items: Iterable[Dict[str, Any]]) -> int:
+        """TourAPI 응답 아이템을 저장합니다. 이미 있는 contentid는 새 값으로 덮어씁니다.
+
+        이미 저장된 overview(상세 조회로 채운 값)는 새 아이템에 overview가 없으면 유지합니다.
+
+        Args:
+            items (Iterable[Dict[str, Any]]): areaBasedList2 등 목록 API의 item 딕셔너리
+        Returns:
+            int: 저장한 아이템 수
+        """
+        return self.apply_changes(items)[0]
+
+    def apply_changes(
+        self,
+        upserts: Iterable[Dict[str, Any]] = (),
+        deleted_ids: Iterable[str] = (),
+        state: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, int]:
+        """변경분(저장/삭제)과 동기화 상태를 하나의 트랜잭션으로 반영합니다.
+
+        상태(워터마크, 진행 위치)가 데이터와 함께 커밋되므로 동기화가 중간에 끊겨도
+        마지막으로 반영한 페이지 다음부터 이어서 받을 수 있습니다.
+
+        Args:
+            upserts (Iterable[Dict[str, Any]]): 저장할 TourAPI item 딕셔너리
+            deleted_ids (Iterable[str]): 삭제할 contentid
+            state (Optional[Dict[str, str]]): 함께 기록할 tour_sync_state 값
+        Returns:
+            Tuple[int, int]: (저장한 아이템 수, 삭제한 아이템 수)
+        """
+        rows = []
+        for item in upserts:
+            if not item.get("contentid"):
+                continue
+            values = [str(item.get(column) or "") for column in _COLUMNS]
+            rows.append((*values, json.dumps(item, ensure_ascii=False)))
+        deleted = [(str(content_id),) for content_id in deleted_ids if content_id]
+
+        placeholders = ", ".join("?" for _ in range(len(_COLUMNS) + 1))
+        updates = ", ".join(
+            f"{column} = excluded.{column}" for column in _COLUMNS if column not in ("contentid", "overview")
+        )
+        with self._connect() as conn:
+            if rows:
+                conn.executemany(
+                    f"""
+                    INSERT INTO tour_items ({", ".join(_COLUMNS)}, raw) VALUES ({placeholders})
+                    ON CONFLICT (contentid) DO UPDATE SET {updates}, raw = excluded.raw,
+                        overview = CASE WHEN excluded.overview != '' THEN excluded.overview ELSE tour_items.overview END
+                    """,
+                    rows,
+                )
+            removed = 0
+            if deleted:
+                removed = conn.executemany("DELETE FROM tour_items WHERE contentid = ?", deleted).rowcount
+            if state:
+                conn.executemany(
+                    "INSERT INTO tour_sync_state (name, value) VALUES (?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+                    list(state.items()),
+                )
+        return len(rows), removed
+
+    def set_overview(self, content_id: str, overview: str) -> bool:
+        """이미 저장된 아이템의 overview만 갱신합니다. (다른 열은 그대로 둠)
+
+        상세 조회(detailCommon2) 응답에는 목록 API의 열 일부(지역 코드 등)가 없으므로
+        응답 전체로 upsert하면 그 열이 비어 지역 조건 검색에서 빠지게 됩니다.
+
+        Args:
+            content_id (str): TourAPI 콘텐츠 ID
+            overview (str): 소개 문구
+        Returns:
+            bool: 갱신했으면 True, 미러에 없는 contentid면 False
+        """
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE tour_items SET overview = ? WHERE contentid = ?", (overview, str(content_id))
+            ).rowcount
+        return bool(updated)
+
+    def get_state(self, name: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM tour_sync_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, name: str, value: str) -> None:
+        self.apply_changes(state={name: value})
+
+    # --- 조회 ---
+
+    def is_fully_synced(self) -> bool:
+        """전국 전체 동기화(sync_tour_mirror)가 한 번 이상 끝나 워터마크가 기록되었는지 여부."""
+        return bool(self.get_state("watermark"))
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM tour_items").fetchone()[0]
+
+    # 시간복잡도: FTS5 색인 조회 O(log n + k) (n: 미러 크기, k: 일치 건수)
+    def search(
+        self, keyword: str, area_code: str = "", content_type_id: str = "", limit: int = 3
+    ) -> List[Dict[str, Any]]:
+        """키워드로 미러를 검색하여 TourAPI 원본 형식의 아이템을 반환합니다.
+
+        띄어쓰기로 나눈 검색어를 모두 포함하는 콘텐츠를 찾고, 제목에서 일치한 결과를 앞에 둡니다.
+
+        Args:
+            keyword (str): 검색어 (예: '경복궁', '서울 한옥')
+            area_code (str): 지역 코드. 비어 있으면 전체
+            content_type_id (str): 관광 타입 ID. 비어 있으면 전체
+            limit (int): 최대 결과 수
+        Returns:
+            List[Dict[str, Any]]: TourAPI item 딕셔너리 목록
+        """
+        tokens = keyword.split()
+        if not tokens:
+            return []
+        fts_tokens = [token for token in tokens if len(token) >= MIN_FTS_TOKEN_LENGTH]
+        like_tokens = [token for token in tokens if len(token) < MIN_FTS_TOKEN_LENGTH]
+
+        conditions, params = [], []
+        if fts_tokens:
+            match = " AND ".join('"' + token.replace('"', '""') + '"' for token in fts_tokens)
+            conditions.append("i.rowid IN (SELECT rowid FROM tour_fts WHERE tour_fts MATCH ?)")
+            params.append(match)
+        for token in like_tokens:
+            conditions.append("(i.title LIKE ? OR i.overview LIKE ?)")
+            params.extend([f"%{token}%"] * 2)
+        if area_code:
+            conditions.append("i.areacode = ?")
+            params.append(area_code)
+        if content_type_id:
+            conditions.append("i.contenttypeid = ?")
+            params.append(content_type_id)
+
+        title_hit = " + ".join(["(instr(i.title, ?) > 0)"] * len(tokens))
+        rows = self._connect().execute(
+            f"""
+            SELECT i.raw, i.overview FROM tour_items AS i
+            WHERE {" AND ".join(conditions)}
+            ORDER BY ({title_hit}) DESC, length(i.title)
+            LIMIT ?
+            """,
+            (*params, *tokens, limit),
+        ).fetchall()
+        results = []
+        for raw, overview in rows:
+            item = json.loads(raw)
+            if overview:
+                item["overview"] = overview
+            results.append(item)
+        return results
+
+
+_mirror: Optional[TourMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_tour_mirror() -> TourMirror:
+    """프로세스에서 공유하는 TourMirror 인스턴스를 반환합니다."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = TourMirror()
+        return _mirror
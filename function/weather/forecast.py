@@ -0,0 +1,213 @@
+"""open-meteo 예보 조회 및 격자 단위 예보 캐시 모듈.
+
+가까운 좌표에 대한 날씨 요청은 같은 예보 모델 격자를 가리키므로,
+좌표를 격자에 맞춰 반올림한 값을 키로 예보 응답을 캐싱합니다.
+
+- TTL: open-meteo의 current 데이터 갱신 주기(15분)에 맞춰 다음 갱신 시각까지만 유효
+- stale-while-revalidate: 만료된 항목은 백그라운드에서 갱신하고, 업스트림이
+  SWR_WAIT_SECONDS 안에 응답하지 않거나 실패하면 이전 예보를 응답
+- 적중률 등 지표는 get_forecast_cache_stats()로 조회
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from ..cache import MISSING, PersistentCache
+from ..rate_limit import RateLimitError, acquire
+
+OPEN_METEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+CURRENT_FIELDS = "temperature_2m,relative_humidity_2m,wind_speed_10m,weather_code"
+DAILY_FIELDS = "temperature_2m_max,temperature_2m_min,uv_index_max,wind_speed_10m_max,precipitation_probability_max,weather_code"
+# 도구 인자로 선택할 수 있는 일별 항목과 open-meteo daily 변수의 대응
+DAILY_FIELD_GROUPS = {
+    "temperature": ["temperature_2m_max", "temperature_2m_min"],
+    "precipitation": ["precipitation_probability_max"],
+    "weather": ["weather_code"],
+    "wind": ["wind_speed_10m_max"],
+    "uv": ["uv_index_max"],
+}
+DEFAULT_FORECAST_DAYS = 7
+MAX_FORECAST_DAYS = 16
+
+# 예보 모델 격자 간격(도). 0.1도 ≈ 11km로, 이 안의 좌표는 같은 캐시 항목을 사용합니다.
+GRID_RESOLUTION = 0.1
+# open-meteo current 데이터 갱신 주기와 반영 지연(초)
+MODEL_UPDATE_INTERVAL = 15 * 60
+MODEL_UPDATE_LAG = 60
+# 만료 후 이전 예보를 응답할 수 있는 시간과, 갱신 응답을 기다리는 최대 시간(초)
+STALE_TTL = 60 * 60
+SWR_WAIT_SECONDS = 1.5
+
+forecast_cache = PersistentCache("open_meteo_forecast", maxsize=2048, db_path=None, stale_ttl=STALE_TTL)
+forecast_stats: Dict[str, int] = {"upstream_calls": 0, "stale_served": 0, "revalidations": 0}
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="forecast-revalidate")
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def snap_to_grid(latitude: float, longitude: float) -> Tuple[float, float]:
+    """좌표를 예보 모델 격자점으로 반올림합니다."""
+    return (
+        round(round(float(latitude) / GRID_RESOLUTION) * GRID_RESOLUTION, 4),
+        round(round(float(longitude) / GRID_RESOLUTION) * GRID_RESOLUTION, 4),
+    )
+
+
+def seconds_until_next_update(now: float = None) -> float:
+    """다음 모델 갱신 시각(갱신 주기 경계 + 반영 지연)까지 남은 시간(초)을 반환합니다."""
+    now = time.time() if now is None else now
+    next_boundary = (now // MODEL_UPDATE_INTERVAL + 1) * MODEL_UPDATE_INTERVAL
+    return next_boundary + MODEL_UPDATE_LAG - now
+
+
+def resolve_daily_fields(fields: Optional[List[str]] = None) -> str:
+    """선택한 항목 이름(DAILY_FIELD_GROUPS의 키)을 open-meteo daily 파라미터로 변환합니다.
+
+    Args:
+        fields (Optional[List[str]]): 예: ['temperature', 'precipitation']. 없으면 전체 항목
+    Returns:
+        str: 쉼표로 구분된 open-meteo daily 변수 목록
+    """
+    if not fields:
+        return DAILY_FIELDS
+    variables = [v for field in fields for v in DAILY_FIELD_GROUPS.get(field, [])]
+    return ",".join(dict.fromkeys(variables)) or DAILY_FIELDS
+
+
+def forecast_key(latitude: float, longitude: float, days: int, daily: str) -> str:
+    """격자점, 예보 일수, daily 변수 목록으로 캐시 키를 만듭니다."""
+    return f"{latitude},{longitude}|{days}|{daily}"
+
+
+def build_forecast_params(latitude, longitude, days: int = DEFAULT_FORECAST_DAYS, daily: str = DAILY_FIELDS) -> Dict[str, Any]:
+    """open-meteo 요청 파라미터를 만듭니다. 위도/경도에는 쉼표로 구분한 목록도 허용됩니다."""
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": CURRENT_FIELDS,
+        "daily": daily,
+        "forecast_days": days,
+        "timezone": "Asia/Tokyo",
+    }
+
+
+def _request_forecast(latitude, longitude, days: int, daily: str) -> Any:
+    """open-meteo를 호출합니다. 위도/경도에 쉼표로 구분한 목록을 넘기면 응답도 목록입니다."""
+    params = build_forecast_params(latitude, longitude, days, daily)
+    acquire("open_meteo")
+    forecast_stats["upstream_calls"] += 1
+    response = requests.get(OPEN_METEO_FORECAST_URL, params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def _refresh(key: str, latitude: float, longitude: float, days: int, daily: str) -> Dict[str, Any]:
+    data = _request_forecast(latitude, longitude, days, daily)
+    forecast_cache.set(key, data, ttl=seconds_until_next_update())
+    return data
+
+
+def _revalidate(key: str, latitude: float, longitude: float, days: int, daily: str) -> Future:
+    """같은 키에 대한 갱신이 진행 중이면 그 작업을 공유하고, 아니면 새로 시작합니다."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _executor.submit(_refresh, key, latitude, longitude, days, daily)
+            _inflight[key] = future
+            future.add_done_callback(lambda _: _inflight.pop(key, None))
+    return future
+
+
+# 시간복잡도: 캐시 적중 시 O(1), 미적중 시 단일 HTTP 요청
+def fetch_forecast(
+    latitude: float, longitude: float, days: int = DEFAULT_FORECAST_DAYS, daily: str = DAILY_FIELDS
+) -> Dict[str, Any]:
+    """좌표의 현재 및 일별 예보(open-meteo 원본 JSON)를 캐시를 거쳐 조회합니다.
+
+    Args:
+        latitude (float): 위도
+        longitude (float): 경도
+        days (int): 예보 일수 (open-meteo forecast_days)
+        daily (str): 쉼표로 구분된 daily 변수 목록 (resolve_daily_fields 참고)
+    Returns:
+        Dict[str, Any]: open-meteo forecast API 응답
+    Raises:
+        requests.exceptions.RequestException: 캐시에 이전 예보가 없고 API 호출이 실패한 경우
+        RateLimitError: 캐시에 이전 예보가 없고 호출 한도에 걸린 경우
+    """
+    latitude, longitude = snap_to_grid(latitude, longitude)
+    key = forecast_key(latitude, longitude, days, daily)
+    cached, fresh = forecast_cache.get_stale(key)
+    if fresh:
+        return cached
+    if cached is MISSING:
+        return _revalidate(key, latitude, longitude, days, daily).result()
+
+    # 만료된 예보가 남아 있으면 갱신을 잠시 기다리고, 늦거나 실패하면 이전 예보를 응답합니다.
+    forecast_stats["revalidations"] += 1
+    future = _revalidate(key, latitude, longitude, days, daily)
+    try:
+        return future.result(timeout=SWR_WAIT_SECONDS)
+    except (TimeoutError, requests.exceptions.RequestException, RateLimitError) as e:
+        print(f"예보 갱신 지연/실패, 이전 예보 응답: {e!r}")
+        forecast_stats["stale_served"] += 1
+        return cached
+
+
+# 시간복잡도: O(n) (캐시 미적중 좌표가 있으면 단일 HTTP 요청)
+def fetch_forecasts(
+    points: List[Tuple[float, float]], days: int = DEFAULT_FORECAST_DAYS, daily: str = DAILY_FIELDS
+) -> List[Dict[str, Any]]:
+    """여러 좌표의 예보를 한 번의 open-meteo 요청으로 조회합니다.
+
+    캐시에 유효한 예보가 있는 좌표는 제외하고, 나머지 격자점만 모아
+    쉼표로 구분된 위도/경도 목록으로 한 번에 요청합니다.
+
+    Args:
+        points (List[Tuple[float, float]]): (위도, 경도) 목록
+        days (int): 예보 일수 (open-meteo forecast_days)
+        daily (str): 쉼표로 구분된 daily 변수 목록
+    Returns:
+        List[Dict[str, Any]]: points와 같은 순서의 open-meteo 응답 목록
+    Raises:
+        requests.exceptions.RequestException: API 호출이 실패한 경우
+        RateLimitError: 호출 한도에 걸린 경우
+    """
+    grid_points = [snap_to_grid(lat, lon) for lat, lon in points]
+    results: Dict[Tuple[float, float], Dict[str, Any]] = {}
+    missing: List[Tuple[float, float]] = []
+    for point in dict.fromkeys(grid_points):
+        cached = forecast_cache.get(forecast_key(*point, days, daily))
+        if cached is MISSING:
+            missing.append(point)
+        else:
+            results[point] = cached
+
+    if missing:
+        data = _request_forecast(
+            ",".join(str(lat) for lat, _ in missing),
+            ",".join(str(lon) for _, lon in missing),
+            days,
+            daily,
+        )
+        if isinstance(data, dict):
+            data = [data]
+        ttl = seconds_until_next_update()
+        for point, forecast in zip(missing, data):
+            forecast_cache.set(forecast_key(*point, days, daily), forecast, ttl=ttl)
+            results[point] = forecast
+
+    return [results[point] for point in grid_points]
+
+
+def get_forecast_cache_stats() -> Dict[str, Any]:
+    """예보 캐시 적중률과 업스트림 호출 지표를 반환합니다."""
+    return {
+        **forecast_cache.stats,
+        **forecast_stats,
+        "hit_rate": round(forecast_cache.hit_rate(), 4),
+    }
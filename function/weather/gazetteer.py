@@ -0,0 +1,181 @@
+"""오프라인 한국 지명 사전(gazetteer) 모듈.
+
+시/도, 시/군/구, 주요 동, 지하철/기차역, 주요 명소의 좌표를 담은
+data/kr_gazetteer.tsv를 메모리 맵으로 열고, 지명을 자모 단위 트라이로 색인합니다.
+카카오 API를 호출하기 전에 이 사전에서 먼저 좌표를 찾아 대부분의 위치명을
+네트워크 호출 없이 처리합니다.
+
+조회 순서:
+1. 정규화된 위치명과 정확히 일치하는 지명
+2. 지명 종류 접미사(역/구/시/군/동 등)의 오타 보정 (예: '강남억' → '강남역').
+   '사상역'/'사당역', '신천역'/'신촌역'처럼 이름 부분이 다르면 실제로 다른 지명일 수 있으므로
+   보정하지 않고 카카오 검색에 맡깁니다.
+3. 위치명 안에 포함된 가장 긴 지명 (예: '강남역 근처' → '강남역', '서울 강남구' → '강남구')
+"""
+import mmap
+import os
+from typing import Dict, Optional, Tuple
+
+from ..cache import normalize_key
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "data", "kr_gazetteer.tsv")
+
+# 위치명 안에서 찾은 지명이 이 비율 이상을 차지해야 포함 일치로 인정합니다.
+# ('서울대입구역'에서 '서울'만 찾은 경우처럼 짧은 일치는 카카오 검색에 맡깁니다.)
+MIN_COVERAGE = 0.6
+
+# 오타 보정을 적용할 지명 종류 접미사. 위치명의 마지막 음절이 이 중 하나와 자모 한 개만 다르고
+# 나머지(이름 부분)가 사전의 지명과 같을 때만 보정합니다.
+KIND_SUFFIXES = ("역", "시", "구", "군", "도", "동", "읍", "면")
+# 이름 부분이 이보다 짧으면 보정하지 않습니다.
+MIN_TYPO_STEM_LENGTH = 2
+
+_TERMINAL = ""
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해합니다. 한글이 아닌 문자는 그대로 둡니다.
+
+    Args:
+        text (str): 원본 문자열 (예: '역')
+    Returns:
+        str: 자모 문자열 (예: '역')
+    """
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            chars.append(chr(0x1100 + offset // 588))
+            chars.append(chr(0x1161 + (offset % 588) // 28))
+            if offset % 28:
+                chars.append(chr(0x11A7 + offset % 28))
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def _edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ch_a in enumerate(a, start=1):
+        row = [i]
+        for j, ch_b in enumerate(b, start=1):
+            row.append(min(row[j - 1] + 1, previous[j] + 1, previous[j - 1] + (ch_a != ch_b)))
+        previous = row
+    return previous[-1]
+
+
+class Gazetteer:
+    """자모 트라이로 색인한 메모리 맵 지명 사전.
+
+    트라이의 단말에는 TSV 파일 내 행의 바이트 오프셋만 저장하고,
+    좌표는 조회 시점에 메모리 맵에서 해당 행을 읽어 파싱합니다.
+    """
+
+    def __init__(self, path: str = GAZETTEER_PATH) -> None:
+        self.path = path
+        self._trie: Dict[str, dict] = {}
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._build()
+
+    def _build(self) -> None:
+        offset = 0
+        for line in iter(self._mm.readline, b""):
+            text = line.decode("utf-8")
+            if text.strip() and not text.startswith("#"):
+                for name in text.split("\t", 1)[0].split("|"):
+                    self._insert(to_jamo(normalize_key(name)), offset)
+            offset += len(line)
+
+    def _insert(self, key: str, offset: int) -> None:
+        node = self._trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        # 같은 이름이 여러 번 나오면 파일에서 먼저 나온 행을 사용합니다.
+        node.setdefault(_TERMINAL, offset)
+
+    def _read(self, offset: int) -> Tuple[float, float, str, str]:
+        end = self._mm.find(b"\n", offset)
+        line = self._mm[offset:end if end != -1 else len(self._mm)].decode("utf-8")
+        names, latitude, longitude, kind = line.rstrip("\r").split("\t")
+        return float(latitude), float(longitude), kind, names.split("|")[0]
+
+    def _exact(self, key: str) -> Optional[int]:
+        node = self._trie
+        for ch in key:
+            node = node.get(ch)
+            if node is None:
+                return None
+        return node.get(_TERMINAL)
+
+    def _longest_contained(self, key: str) -> Optional[Tuple[int, int]]:
+        """key 안에 포함된 가장 긴 지명의 (자모 길이, 오프셋)을 찾습니다."""
+        best = None
+        for start in range(len(key)):
+            node = self._trie
+            for end in range(start, len(key)):
+                node = node.get(key[end])
+                if node is None:
+                    break
+                if _TERMINAL in node and (best is None or end - start + 1 > best[0]):
+                    best = (end - start + 1, node[_TERMINAL])
+        return best
+
+    def _suffix_typo(self, name: str) -> Optional[int]:
+        """마지막 음절만 지명 종류 접미사의 오타인 지명의 오프셋을 찾습니다. (예: '강남억' → '강남역')
+
+        위치명의 마지막 음절이 이미 접미사라면 사전에 없는 실제 지명일 수 있으므로 보정하지 않습니다.
+        자모 편집 거리 1인 후보가 정확히 하나일 때만 보정합니다.
+        """
+        stem, last = name[:-1], name[-1]
+        if len(stem) < MIN_TYPO_STEM_LENGTH or last in KIND_SUFFIXES:
+            return None
+        last_jamo = to_jamo(last)
+        candidates = [
+            offset
+            for suffix in KIND_SUFFIXES
+            if _edit_distance(last_jamo, to_jamo(suffix)) <= 1
+            for offset in [self._exact(to_jamo(stem + suffix))]
+            if offset is not None
+        ]
+        return candidates[0] if len(set(candidates)) == 1 else None
+
+    # 시간복잡도: 정확 일치 O(n), 포함 일치 O(n^2) (n: 위치명 자모 길이), 오타 보정 O(n × 접미사 수)
+    def lookup(self, location: str) -> Optional[Tuple[float, float]]:
+        """위치명의 좌표를 사전에서 찾습니다.
+
+        Args:
+            location (str): 위치명 (예: '판교역', '서울 강남구', '강남역 근처')
+        Returns:
+            Optional[Tuple[float, float]]: (위도, 경도). 사전에 없으면 None
+        """
+        name = normalize_key(location)
+        key = to_jamo(name)
+        if not key:
+            return None
+
+        offset = self._exact(key)
+        if offset is None:
+            offset = self._suffix_typo(name)
+        if offset is None:
+            contained = self._longest_contained(key)
+            if contained and contained[0] / len(key) >= MIN_COVERAGE:
+                offset = contained[1]
+        if offset is None:
+            return None
+
+        latitude, longitude, _, _ = self._read(offset)
+        return latitude, longitude
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+def get_gazetteer() -> Gazetteer:
+    """프로세스에서 공유하는 Gazetteer 인스턴스를 반환합니다. (최초 호출 시 색인)"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
@@ -0,0 +1,22 @@
+from function.weather.gazetteer import get_gazetteer
+
+GANGNEUNG_STATION = (37.7642, 128.8996)
+
+
+def test_typo_in_last_syllable_is_corrected():
+    assert get_gazetteer().lookup("강남억") == (37.4979, 127.0276)
+
+
+def test_different_first_syllable_is_not_corrected():
+    # 공릉(서울 노원구)을 강릉으로 보정하면 170km 떨어진 곳의 날씨를 답하게 됩니다.
+    gazetteer = get_gazetteer()
+    assert gazetteer.lookup("공릉역") != GANGNEUNG_STATION
+    assert gazetteer.lookup("공릉") is None
+    assert gazetteer.lookup("공릉역") is None
+
+
+def test_different_name_with_same_suffix_is_not_corrected():
+    # 사상역(부산)은 사당역(서울), 신천역은 신촌역과 다른 역입니다.
+    gazetteer = get_gazetteer()
+    assert gazetteer.lookup("사상역") is None
+    assert gazetteer.lookup("신천역") is None
@@ -0,0 +1,60 @@
+"""위치명 지오코딩 모듈.
+
+1. 오프라인 지명 사전(gazetteer.py)에서 먼저 좌표를 찾습니다.
+2. 사전에 없는 위치명은 카카오 키워드 검색 API로 조회합니다.
+   좌표는 바뀌지 않으므로 정규화된 위치명을 키로 PersistentCache(메모리 LRU + SQLite)에
+   저장하고, 검색 결과가 없는 위치명은 음수 캐싱하여 같은 실패 조회를 반복하지 않습니다.
+"""
+import os
+from typing import Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+from ..cache import MISSING, PersistentCache, normalize_key
+from ..rate_limit import acquire
+from .gazetteer import get_gazetteer
+
+load_dotenv()
+
+KAKAO_KEYWORD_URL = "https://dapi.kakao.com/v2/local/search/keyword.json"
+
+# 좌표는 사실상 변하지 않으므로 만료 없이 저장하고, 검색 실패는 하루 동안만 기억합니다.
+geocode_cache = PersistentCache("kakao_geocode", maxsize=4096, ttl=None, negative_ttl=60 * 60 * 24)
+
+
+# 시간복잡도: 사전/캐시 적중 시 네트워크 호출 없음, 미적중 시 단일 HTTP 요청
+def lookup_location(location: str) -> Optional[Tuple[float, float]]:
+    """위치명을 (위도, 경도)로 변환합니다.
+
+    Args:
+        location (str): 위치명 (예: '판교역')
+    Returns:
+        Optional[Tuple[float, float]]: 소수점 4자리로 반올림한 (위도, 경도).
+            지명 사전과 카카오 검색 모두에서 찾지 못하면 None
+    Raises:
+        requests.exceptions.RequestException: 카카오 API 호출 실패 시 (캐싱하지 않음)
+        RateLimitError: 카카오 API 호출 한도에 걸린 경우
+    """
+    point = get_gazetteer().lookup(location)
+    if point:
+        return point
+
+    key = normalize_key(location)
+    cached = geocode_cache.get(key)
+    if cached is not MISSING:
+        return tuple(cached) if cached is not None else None
+
+    api_key = os.getenv("KAKAO_REST_API_KEY")
+    acquire("kakao", api_key)
+    headers = {"Authorization": f"KakaoAK {api_key}"}
+    params = {"page": 1, "size": 1, "sort": "accuracy", "query": location}
+    response = requests.get(KAKAO_KEYWORD_URL, headers=headers, params=params, timeout=5)
+    response.raise_for_status()
+    documents = response.json().get("documents")
+
+    point = None
+    if documents:
+        point = (round(float(documents[0].get("y")), 4), round(float(documents[0].get("x")), 4))
+    geocode_cache.set(key, point)
+    return point
@@ -1,8 +1,10 @@
 from dotenv import load_dotenv
 # 검색 위치의 좌표 찾기
-import os
 import requests
-import json
+
+from ..rate_limit import RateLimitError
+from .forecast import fetch_forecast
+from .geocode import lookup_location
 
 load_dotenv()
 weather_code_dict = {
@@ -38,19 +40,8 @@ weather_code_dict = {
 
 
 def get_location_points(location):
-    map_url = f"https://dapi.kakao.com/v2/local/search/keyword.json?page=1&size=15&sort=accuracy&query={location}"
-    headers = {"Authorization": f"KakaoAK {os.getenv('KAKAO_REST_API_KEY')}"}
-
     try:
-        tmp = requests.get(map_url, headers=headers)
-        tmp.raise_for_status()
-        results = json.loads(tmp.text)
-        if results.get("documents"):
-            latitude = results.get("documents")[0].get("y")
-            longitude = results.get("documents")[0].get("x")
-            return round(float(latitude), 4), round(float(longitude), 4)
-        else:
-            return str(37.3947), str(127.1111)
+        return lookup_location(location)
     except Exception as e:
         print(e)
         return None
@@ -68,18 +59,13 @@ def get_current_weather(location: str) -> dict:
     Returns:
         dict: 위치에 대한 현재 및 14일간의 일별 날씨 정보
     """
-    latitude, longitude = get_location_points(location)
-    weather_url = (
-        f"https://api.open-meteo.com/v1/forecast"
-        f"?latitude={latitude}&longitude={longitude}"
-        f"&current=temperature_2m,relative_humidity_2m,wind_speed_10m,weather_code"
-        f"&daily=temperature_2m_max,temperature_2m_min,uv_index_max,wind_speed_10m_max,precipitation_probability_max,weather_code"
-        f"&timezone=Asia%2FTokyo"
-    )
+    point = get_location_points(location)
+    if point is None:
+        print(f"위치를 찾을 수 없습니다: {location}")
+        return {}
+    latitude, longitude = point
     try:
-        response = requests.get(weather_url)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_forecast(latitude, longitude)
         current = data.get("current", {})
         current_units = data.get("current_units", {})
         daily = data.get("daily", {})
@@ -114,7 +100,7 @@ def get_current_weather(location: str) -> dict:
             "current_weather": current_result,
             "daily_forecast": daily_result
         }
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, RateLimitError) as e:
         print(f"API 요청 오류: {e}")
         return {}
 
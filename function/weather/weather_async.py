@@ -0,0 +1,120 @@
+"""비동기 날씨 조회 모듈.
+
+비동기 에이전트 실행 중 이벤트 루프를 막지 않도록 카카오/open-meteo 호출을
+공유 httpx.AsyncClient(keep-alive 커넥션 풀, http_client.py)로 수행합니다.
+같은 위치(또는 같은 예보 격자)에 대한 요청이 진행 중이면 새 요청을 보내지 않고
+진행 중인 요청의 결과를 함께 기다립니다(single-flight).
+
+지오코딩/예보 캐시는 동기 구현(geocode.py, forecast.py)과 공유합니다.
+"""
+import asyncio
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from ..cache import MISSING, normalize_key
+from ..http_client import get_async_client, single_flight
+from ..rate_limit import RateLimitError, aacquire
+from .forecast import (
+    DAILY_FIELDS,
+    DEFAULT_FORECAST_DAYS,
+    OPEN_METEO_FORECAST_URL,
+    SWR_WAIT_SECONDS,
+    build_forecast_params,
+    forecast_cache,
+    forecast_key,
+    forecast_stats,
+    seconds_until_next_update,
+    snap_to_grid,
+)
+from .gazetteer import get_gazetteer
+from .geocode import KAKAO_KEYWORD_URL, geocode_cache
+
+load_dotenv()
+
+
+async def _request_location_points(location: str, key: str) -> Optional[Tuple[float, float]]:
+    api_key = os.getenv("KAKAO_REST_API_KEY")
+    await aacquire("kakao", api_key)
+    headers = {"Authorization": f"KakaoAK {api_key}"}
+    params = {"page": 1, "size": 1, "sort": "accuracy", "query": location}
+    response = await get_async_client().get(KAKAO_KEYWORD_URL, headers=headers, params=params)
+    response.raise_for_status()
+    documents = response.json().get("documents")
+
+    point = None
+    if documents:
+        point = (round(float(documents[0].get("y")), 4), round(float(documents[0].get("x")), 4))
+    geocode_cache.set(key, point)
+    return point
+
+
+async def alookup_location(location: str) -> Optional[Tuple[float, float]]:
+    """lookup_location의 비동기 버전입니다.
+
+    Args:
+        location (str): 위치명 (예: '판교역')
+    Returns:
+        Optional[Tuple[float, float]]: (위도, 경도). 지명 사전과 카카오 검색 모두에서 찾지 못하면 None
+    Raises:
+        httpx.HTTPError: 카카오 API 호출 실패 시
+        RateLimitError: 카카오 API 호출 한도에 걸린 경우
+    """
+    point = get_gazetteer().lookup(location)
+    if point:
+        return point
+
+    key = normalize_key(location)
+    cached = geocode_cache.get(key)
+    if cached is not MISSING:
+        return tuple(cached) if cached is not None else None
+    task = single_flight(f"geocode:{key}", lambda: _request_location_points(location, key))
+    return await asyncio.shield(task)
+
+
+async def _request_forecast(key: str, latitude: float, longitude: float, days: int, daily: str) -> Dict[str, Any]:
+    params = build_forecast_params(latitude, longitude, days, daily)
+    await aacquire("open_meteo")
+    forecast_stats["upstream_calls"] += 1
+    response = await get_async_client().get(OPEN_METEO_FORECAST_URL, params=params)
+    response.raise_for_status()
+    data = response.json()
+    forecast_cache.set(key, data, ttl=seconds_until_next_update())
+    return data
+
+
+async def afetch_forecast(
+    latitude: float, longitude: float, days: int = DEFAULT_FORECAST_DAYS, daily: str = DAILY_FIELDS
+) -> Dict[str, Any]:
+    """fetch_forecast의 비동기 버전입니다. 캐시와 stale-while-revalidate 정책을 공유합니다.
+
+    Args:
+        latitude (float): 위도
+        longitude (float): 경도
+        days (int): 예보 일수 (open-meteo forecast_days)
+        daily (str): 쉼표로 구분된 daily 변수 목록
+    Returns:
+        Dict[str, Any]: open-meteo forecast API 응답
+    Raises:
+        httpx.HTTPError: 캐시에 이전 예보가 없고 API 호출이 실패한 경우
+        RateLimitError: 캐시에 이전 예보가 없고 호출 한도에 걸린 경우
+    """
+    latitude, longitude = snap_to_grid(latitude, longitude)
+    key = forecast_key(latitude, longitude, days, daily)
+    cached, fresh = forecast_cache.get_stale(key)
+    if fresh:
+        return cached
+
+    task = single_flight(f"forecast:{key}", lambda: _request_forecast(key, latitude, longitude, days, daily))
+    if cached is MISSING:
+        return await asyncio.shield(task)
+
+    forecast_stats["revalidations"] += 1
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout=SWR_WAIT_SECONDS)
+    except (asyncio.TimeoutError, httpx.HTTPError, RateLimitError) as e:
+        print(f"예보 갱신 지연/실패, 이전 예보 응답: {e!r}")
+        forecast_stats["stale_served"] += 1
+        return cached
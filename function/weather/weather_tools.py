@@ -1,10 +1,24 @@
 import os
+import httpx
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal, Optional
 from dotenv import load_dotenv
 
 from pydantic import BaseModel, Field
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
+
+from ..rate_limit import RateLimitError
+from .forecast import (
+    DEFAULT_FORECAST_DAYS,
+    MAX_FORECAST_DAYS,
+    fetch_forecast,
+    fetch_forecasts,
+    resolve_daily_fields,
+)
+from .geocode import lookup_location
+from .weather_async import afetch_forecast, alookup_location
 
 load_dotenv()
 
@@ -19,79 +33,165 @@ weather_code_dict = {
 
 
 def get_location_points(location: str):
-    """카카오맵 API를 사용하여 위치명을 위도, 경도로 변환하는 함수"""
-    map_url = f"https://dapi.kakao.com/v2/local/search/keyword.json?page=1&size=1&sort=accuracy&query={location}"
-    headers = {"Authorization": f"KakaoAK {os.getenv('KAKAO_REST_API_KEY')}"}
+    """위치명을 위도, 경도로 변환하는 함수 (지명 사전 → 카카오맵 API 순, 찾지 못하면 None)"""
     try:
-        response = requests.get(map_url, headers=headers)
-        response.raise_for_status()
-        results = response.json()
-        if results.get("documents"):
-            document = results["documents"][0]
-            return round(float(document.get("y")), 4), round(float(document.get("x")), 4)
-        else:
-            return 37.3947, 127.1111 
+        return lookup_location(location)
     except Exception as e:
         print(f"카카오맵 API 오류: {e}")
-        return 37.3947, 127.1111 
+        return None
 
 
 class WeatherInput(BaseModel):
     location: str = Field(description="날씨를 조회할 위치명, 예: '판교역', '강남역', '서울'")
+    days: int = Field(
+        default=DEFAULT_FORECAST_DAYS, ge=1, le=MAX_FORECAST_DAYS,
+        description="오늘을 포함한 예보 일수(1~16). '내일 날씨'라면 2, '이번 주'라면 7",
+    )
+    fields: Optional[List[Literal["temperature", "precipitation", "weather", "wind", "uv"]]] = Field(
+        default=None, description="필요한 일별 항목. 지정하지 않으면 전체 항목을 조회합니다.",
+    )
+
+
+# open-meteo 변수명을 응답에 사용할 짧은 컬럼명으로 변환합니다.
+COLUMN_NAMES = {
+    "temperature_2m": "temp", "relative_humidity_2m": "rh", "wind_speed_10m": "wind", "weather_code": "wx",
+    "temperature_2m_max": "tmax", "temperature_2m_min": "tmin", "uv_index_max": "uv",
+    "wind_speed_10m_max": "wind", "precipitation_probability_max": "pop",
+}
 
 
+def format_weather(location: str, data: dict) -> str:
+    """open-meteo 응답을 에이전트에 전달할 컬럼형 JSON 문자열로 변환합니다.
 
-@tool(args_schema=WeatherInput)
-def get_weather(location: str) -> str:
+    일별 예보를 행(dict) 목록 대신 컬럼별 배열로 담고, 단위는 값마다 붙이지 않고
+    units에 한 번만 표기하여 LLM에 전달되는 토큰 수를 줄입니다.
+    예: {"loc":"서울","now":{...},"units":{...},"daily":{"date":[...],"tmax":[...]}}
     """
-    지정한 위치의 현재 날씨와 14일간의 일일 예보를 조회합니다.
+    current = data.get("current", {})
+    daily = data.get("daily", {})
+    units = {}
+    for unit_key in ("current_units", "daily_units"):
+        for name, unit in data.get(unit_key, {}).items():
+            if name in COLUMN_NAMES and name != "weather_code" and unit:
+                units[COLUMN_NAMES[name]] = unit
+
+    now = {"time": current.get("time")}
+    for name in ("temperature_2m", "relative_humidity_2m", "wind_speed_10m"):
+        if name in current:
+            now[COLUMN_NAMES[name]] = current[name]
+    now["wx"] = weather_code_dict.get(current.get("weather_code"), "Unknown")
+
+    columns = {"date": daily.get("time", [])}
+    for name, values in daily.items():
+        if name == "weather_code":
+            columns["wx"] = [weather_code_dict.get(code, "Unknown") for code in values]
+        elif name in COLUMN_NAMES:
+            columns[COLUMN_NAMES[name]] = values
+
+    final_result = {"loc": location, "now": now, "units": units, "daily": columns}
+    return json.dumps(final_result, ensure_ascii=False, separators=(",", ":"))
+
+
+def _get_weather(location: str, days: int = DEFAULT_FORECAST_DAYS, fields: Optional[List[str]] = None) -> str:
+    """
+    지정한 위치의 현재 날씨와 일별 예보(기본 7일, 최대 16일)를 조회합니다.
     '서울 날씨 알려줘'와 같은 사용자 요청에 응답할 때 사용하세요.
+    '내일 비 와?'처럼 범위가 좁은 질문에는 days와 fields를 지정해 필요한 값만 조회하세요.
     """
-    latitude, longitude = get_location_points(location)
-    
-    weather_url = (
-        f"https://api.open-meteo.com/v1/forecast"
-        f"?latitude={latitude}&longitude={longitude}"
-        f"¤t=temperature_2m,relative_humidity_2m,wind_speed_10m,weather_code"
-        f"&daily=temperature_2m_max,temperature_2m_min,uv_index_max,wind_speed_10m_max,precipitation_probability_max,weather_code"
-        f"&timezone=Asia%2FTokyo"
-    )
+    point = get_location_points(location)
+    if point is None:
+        return json.dumps({"error": f"'{location}'의 위치를 찾을 수 없습니다. 더 구체적인 지명으로 다시 시도해주세요."}, ensure_ascii=False)
+    latitude, longitude = point
+
     try:
-        response = requests.get(weather_url)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_forecast(latitude, longitude, days, resolve_daily_fields(fields))
+        return format_weather(location, data)
 
-        current = data.get("current", {})
-        current_units = data.get("current_units", {})
-        daily = data.get("daily", {})
-        daily_units = data.get("daily_units", {})
+    except (requests.exceptions.RequestException, RateLimitError) as e:
+        error_message = {"error": f"날씨 API 요청 중 오류가 발생했습니다: {e}"}
+        return json.dumps(error_message, ensure_ascii=False, indent=2)
 
-        current_result = {
-            "location": location,
-            "observation_time": current.get("time"),
-            "temperature": f"{current.get('temperature_2m')}{current_units.get('temperature_2m', '')}",
-            "humidity": f"{current.get('relative_humidity_2m')}{current_units.get('relative_humidity_2m', '')}",
-            "wind_speed": f"{current.get('wind_speed_10m')}{current_units.get('wind_speed_10m', '')}",
-            "weather": weather_code_dict.get(current.get("weather_code"), "Unknown"),
-        }
-        
-        daily_result = []
-        if daily and daily.get("time"):
-            days = daily["time"]
-            for i, day in enumerate(days):
-                daily_result.append({
-                    "date": day,
-                    "temp_max": f"{daily.get('temperature_2m_max', [])[i]}{daily_units.get('temperature_2m_max', '')}",
-                    "temp_min": f"{daily.get('temperature_2m_min', [])[i]}{daily_units.get('temperature_2m_min', '')}",
-                    "uv_index_max": f"{daily.get('uv_index_max', [])[i]}",
-                    "wind_speed_max": f"{daily.get('wind_speed_10m_max', [])[i]}{daily_units.get('wind_speed_10m_max', '')}",
-                    "precipitation_probability": f"{daily.get('precipitation_probability_max', [])[i]}{daily_units.get('precipitation_probability_max', '')}",
-                    "weather": weather_code_dict.get(daily.get('weather_code', [])[i], "Unknown"),
-                })
-
-        final_result = {"current_weather": current_result, "daily_forecast": daily_result}
-        return json.dumps(final_result, ensure_ascii=False, indent=2)
-
-    except requests.exceptions.RequestException as e:
+
+async def _aget_weather(location: str, days: int = DEFAULT_FORECAST_DAYS, fields: Optional[List[str]] = None) -> str:
+    """_get_weather의 비동기 구현. 공유 AsyncClient와 single-flight 요청 병합을 사용합니다."""
+    try:
+        point = await alookup_location(location)
+    except Exception as e:
+        print(f"카카오맵 API 오류: {e}")
+        point = None
+    if point is None:
+        return json.dumps({"error": f"'{location}'의 위치를 찾을 수 없습니다. 더 구체적인 지명으로 다시 시도해주세요."}, ensure_ascii=False)
+    latitude, longitude = point
+
+    try:
+        data = await afetch_forecast(latitude, longitude, days, resolve_daily_fields(fields))
+        return format_weather(location, data)
+
+    except (httpx.HTTPError, RateLimitError) as e:
         error_message = {"error": f"날씨 API 요청 중 오류가 발생했습니다: {e}"}
         return json.dumps(error_message, ensure_ascii=False, indent=2)
+
+
+# 동기 실행(invoke)과 비동기 실행(ainvoke) 모두에서 이벤트 루프를 막지 않도록 두 구현을 함께 등록합니다.
+get_weather = StructuredTool.from_function(
+    func=_get_weather,
+    coroutine=_aget_weather,
+    name="get_weather",
+    args_schema=WeatherInput,
+)
+
+
+class WeatherBatchInput(BaseModel):
+    locations: List[str] = Field(description="날씨를 비교할 위치명 목록, 예: ['부산', '강릉']")
+    days: int = Field(default=DEFAULT_FORECAST_DAYS, ge=1, le=MAX_FORECAST_DAYS, description="비교할 예보 일수(1~16)")
+
+
+@tool(args_schema=WeatherBatchInput)
+def get_weather_batch(locations: List[str], days: int = 7) -> str:
+    """
+    여러 위치의 현재 날씨와 일별 예보를 한 번에 조회하여 비교합니다.
+    '이번 주말 부산이랑 강릉 중에 어디가 날씨 좋아?'처럼 두 곳 이상의 날씨를 비교할 때
+    get_weather를 여러 번 호출하는 대신 사용하세요.
+    """
+    # 위치명 지오코딩은 병렬로, 예보 조회는 한 번의 open-meteo 요청으로 처리합니다.
+    with ThreadPoolExecutor(max_workers=min(len(locations), 8) or 1) as executor:
+        points = list(executor.map(get_location_points, locations))
+
+    found = [(location, point) for location, point in zip(locations, points) if point]
+    try:
+        daily = resolve_daily_fields(["temperature", "precipitation", "weather"])
+        forecasts = fetch_forecasts([point for _, point in found], days, daily) if found else []
+    except (requests.exceptions.RequestException, RateLimitError) as e:
+        error_message = {"error": f"날씨 API 요청 중 오류가 발생했습니다: {e}"}
+        return json.dumps(error_message, ensure_ascii=False)
+
+    forecast_by_location = {location: data for (location, _), data in zip(found, forecasts)}
+    results = []
+    for location in locations:
+        data = forecast_by_location.get(location)
+        if data is None:
+            results.append({"location": location, "error": "위치를 찾을 수 없습니다."})
+            continue
+        current = data.get("current", {})
+        daily = data.get("daily", {})
+        rows = zip(
+            daily.get("time", []),
+            daily.get("temperature_2m_max", []),
+            daily.get("temperature_2m_min", []),
+            daily.get("precipitation_probability_max", []),
+            daily.get("weather_code", []),
+        )
+        results.append({
+            "location": location,
+            "current": [current.get("temperature_2m"), weather_code_dict.get(current.get("weather_code"), "Unknown")],
+            "daily": [
+                [day, t_max, t_min, precipitation, weather_code_dict.get(code, "Unknown")]
+                for day, t_max, t_min, precipitation, code in rows
+            ],
+        })
+
+    final_result = {
+        "columns": {"current": ["temp_c", "weather"], "daily": ["date", "temp_max_c", "temp_min_c", "precip_prob_pct", "weather"]},
+        "locations": results,
+    }
+    return json.dumps(final_result, ensure_ascii=False, separators=(",", ":"))
@@ -17,6 +17,7 @@ import sys
 sys.path.append("/app/ica_project2/function-agent/")
 from business_sub_agent import create_business_sub_agent
 from life_sub_agent import create_life_sub_agent
+from function.rate_limit import LANE_BATCH, rate_limit_lane
 from search_sub_agent import create_search_sub_agent
 
 # 각 분야별 sub agent
@@ -117,11 +118,13 @@ if __name__ == "__main__":
         print(f"[사용자 쿼리]: {query}")
         print(f"==================================================")
 
-        result = super_agent.invoke({
-            "input": query,
-            "today": today_str,
-            "chat_history": []
-        })
+        # 평가 실행은 배치 우선순위로 호출하여 사용자 요청 몫의 쿼터를 남겨 둡니다.
+        with rate_limit_lane(LANE_BATCH):
+            result = super_agent.invoke({
+                "input": query,
+                "today": today_str,
+                "chat_history": []
+            })
 
         ai_response = result['output']
         print(f"\n[슈퍼 에이전트 최종 답변]: {ai_response}")
@@ -43,9 +43,15 @@ def create_life_sub_agent(eval_mode=False):
     tools = [
         search_naver_places,
         search_tourist_info,
+        get_tourist_details,
+        search_trip_places,
+        search_tour_and_culture,
         get_naver_search_results,
+        compare_products,
         add_product_to_mycart,
-        get_weather
+        get_cart_price_changes,
+        get_weather,
+        get_weather_batch
     ]
 
     agent = create_openai_functions_agent(llm, tools, prompt)